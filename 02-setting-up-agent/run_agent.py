@@ -5,75 +5,259 @@ This script demonstrates how to run an ADK agent programmatically using:
 - Runner class for agent execution
 - InMemorySessionService for session management
 - Async event processing for streaming responses
+- Batch mode: many prompts from a JSONL file through one shared Runner
+- Streaming metrics: time-to-first-token and inter-chunk latency per turn
 
 Usage:
     python run_agent.py
+    python run_agent.py --sse
+    python run_agent.py --batch prompts.jsonl --output results.jsonl --concurrency 16
+
+Batch input is one JSON object per line with a "prompt" field and an
+optional "id". Each result line has id, prompt, response, latency_ms and
+error (null on success).
 """
 
+import argparse
 import asyncio
+import json
 import os
+import sys
+import time
+from pathlib import Path
 from google.genai import types
 from google.adk.agents import Agent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.streaming_metrics import Histogram, StreamingMetrics
+
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
+APP_NAME = 'demo_app'
+
 
-async def main():
+def build_runner() -> Runner:
+    """Create the agent and a Runner backed by an in-memory session service."""
     # 1. Create session service
     session_service = InMemorySessionService()
-    
-    # 2. Create a session
-    session = await session_service.create_session(
-        state={}, 
-        app_name='demo_app', 
-        user_id='demo_user'
-    )
-    
-    # 3. Create agent
+
+    # 2. Create agent
     agent = Agent(
         model=os.getenv("GEMINI_MODEL", "gemini-2.5-flash"),
         name='root_agent',
         description='A helpful assistant for user questions.',
         instruction='Answer user questions to the best of your knowledge',
     )
-    
-    # 4. Create runner
-    runner = Runner(
-        app_name='demo_app',
+
+    # 3. Create runner
+    return Runner(
+        app_name=APP_NAME,
         agent=agent,
         session_service=session_service,
     )
-    
+
+
+def make_run_config(sse: bool) -> RunConfig:
+    """SSE streaming yields partial text events; NONE yields whole responses."""
+    return RunConfig(streaming_mode=StreamingMode.SSE if sse else StreamingMode.NONE)
+
+
+async def main(sse: bool = False):
+    runner = build_runner()
+    session_service = runner.session_service
+
+    # 4. Create a session
+    session = await session_service.create_session(
+        state={},
+        app_name=APP_NAME,
+        user_id='demo_user'
+    )
+
     # 5. Format user input
     query = "What is the Transformers architecture in AI? Be brief."
     print(f"User: {query}\n")
     print("Agent: ", end="", flush=True)
-    
+
     content = types.Content(
-        role='user', 
+        role='user',
         parts=[types.Part(text=query)]
     )
-    
-    # 6. Run agent and process events
-    events_async = runner.run_async(
+
+    # 6. Run agent through the metrics wrapper (same events as runner.run_async)
+    metrics = StreamingMetrics()
+    events_async = metrics.run_async(
+        runner,
         session_id=session.id,
         user_id=session.user_id,
-        new_message=content
+        new_message=content,
+        run_config=make_run_config(sse),
     )
-    
+
     # 7. Process events and extract response text (streaming)
+    streamed = False
     async for event in events_async:
+        # With SSE the final event repeats the text already streamed as partials
+        if streamed and not event.partial:
+            continue
         if event.content and event.content.parts:
             for part in event.content.parts:
                 if part.text:
                     print(part.text, end="", flush=True)
-    
+                    streamed = streamed or bool(event.partial)
+
     print()  # New line after response
 
+    # 8. Show streaming timings for this turn
+    print()
+    print(metrics.format_summary())
+
+
+# ============================================================
+# BATCH MODE
+# ============================================================
+
+async def run_prompt(
+    runner: Runner, user_id: str, prompt: str, metrics: StreamingMetrics, sse: bool = False
+) -> str:
+    """Run one prompt in its own session and return the response text."""
+    session_service = runner.session_service
+    session = await session_service.create_session(app_name=APP_NAME, user_id=user_id)
+    content = types.Content(role='user', parts=[types.Part(text=prompt)])
+
+    chunks = []
+    try:
+        async for event in metrics.run_async(
+            runner,
+            user_id=user_id,
+            session_id=session.id,
+            new_message=content,
+            run_config=make_run_config(sse),
+        ):
+            if event.partial:
+                continue
+            if event.content and event.content.parts:
+                for part in event.content.parts:
+                    if part.text:
+                        chunks.append(part.text)
+    finally:
+        # Drop finished sessions so memory stays flat over thousands of prompts
+        await session_service.delete_session(
+            app_name=APP_NAME, user_id=user_id, session_id=session.id
+        )
+    return "".join(chunks)
+
+
+async def run_batch(input_path: str, output_path: str, concurrency: int, sse: bool = False) -> dict:
+    """
+    Run every prompt in a JSONL file through one shared Runner.
+
+    Prompts are read lazily and handed to `concurrency` workers through a
+    bounded queue, so the file never has to fit in memory. Results are
+    written in completion order as soon as each prompt finishes.
+
+    Args:
+        input_path (str): JSONL file with one {"prompt": ..., "id": ...} per line.
+        output_path (str): JSONL file to write results to.
+        concurrency (int): Maximum number of prompts in flight at once.
+        sse (bool): Stream partial responses so time-to-first-text is meaningful.
+
+    Returns:
+        dict: Throughput, latency and streaming-metrics summary for the batch.
+    """
+    runner = build_runner()
+    metrics = StreamingMetrics(keep_turns=0)
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    latencies = Histogram()
+    errors = 0
+
+    async def produce():
+        try:
+            with open(input_path, encoding="utf-8") as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                        if not isinstance(record, dict):
+                            raise ValueError(f"expected a JSON object, got {type(record).__name__}")
+                    except ValueError as e:
+                        # Recorded like a failed prompt instead of aborting the batch
+                        record = {"id": line_no, "invalid": f"line {line_no}: {type(e).__name__}: {e}"}
+                    record.setdefault("id", line_no)
+                    await queue.put(record)
+        finally:
+            # Always release the workers, even if reading the file fails
+            for _ in range(concurrency):
+                await queue.put(None)
+
+    async def work(out):
+        nonlocal errors
+        while True:
+            record = await queue.get()
+            if record is None:
+                return
+            user_id = str(record.get("user_id", "batch_user"))
+            started = time.perf_counter()
+            response, error = None, record.get("invalid")
+            if error:
+                errors += 1
+            else:
+                try:
+                    response = await run_prompt(runner, user_id, record["prompt"], metrics, sse)
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                    errors += 1
+            latency = time.perf_counter() - started
+            latencies.observe(latency)
+            out.write(json.dumps({
+                "id": record["id"],
+                "prompt": record.get("prompt"),
+                "response": response,
+                "latency_ms": round(latency * 1000, 1),
+                "error": error,
+            }) + "\n")
+
+    started = time.perf_counter()
+    with open(output_path, "w", encoding="utf-8") as out:
+        await asyncio.gather(produce(), *(work(out) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latency_summary = latencies.summary()
+    return {
+        "prompts": latencies.count,
+        "errors": errors,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 2),
+        "throughput_per_s": round(latencies.count / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": latency_summary.get("p50_ms", 0.0),
+        "p95_ms": latency_summary.get("p95_ms", 0.0),
+        "p99_ms": latency_summary.get("p99_ms", 0.0),
+        "streaming": metrics.summary(),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the demo agent programmatically.")
+    parser.add_argument("--batch", metavar="INPUT", help="JSONL file of prompts to run")
+    parser.add_argument("--output", default="results.jsonl", help="JSONL file for batch results")
+    parser.add_argument("--concurrency", type=int, default=8, help="Max prompts in flight")
+    parser.add_argument("--sse", action="store_true", help="Stream partial responses (SSE)")
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    if args.batch:
+        if args.concurrency < 1:
+            raise SystemExit("--concurrency must be at least 1")
+        summary = asyncio.run(run_batch(args.batch, args.output, args.concurrency, args.sse))
+        print(json.dumps(summary, indent=2))
+    else:
+        asyncio.run(main(sse=args.sse))
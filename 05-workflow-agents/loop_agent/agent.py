@@ -4,24 +4,43 @@
 Repeat agent execution until a condition is met or max iterations reached.
 Best for iterative refinement tasks.
 
+After each refinement a local ConvergenceChecker compares the new draft with
+the previous one (no model call) and ends the loop once they converge, so
+the loop rarely needs all max_iterations LLM round trips.
+
 Blog: https://arjunprabhulal.com/adk-workflow-sequential-loop-parallel/
 """
 
+import os
 from google.adk.agents import Agent, LoopAgent
 
+from .convergence import ConvergenceChecker, reset_state
+
 # Refiner agent - runs repeatedly until satisfied
 refiner = Agent(
     model="gemini-2.5-flash",
     name="refiner",
     instruction="""Review and improve the content.
     If the quality is satisfactory, respond with 'DONE'.
-    Otherwise, provide an improved version.""",
+    Otherwise, provide an improved version.
+
+    Current draft (empty on the first pass): {draft?}""",
+    output_key="draft",
 )
 
-# Loop until done or max iterations reached
+# Local check between iterations: stop when consecutive drafts are this similar
+convergence_check = ConvergenceChecker(
+    name="convergence_check",
+    key="draft",
+    metric=os.getenv("CONVERGENCE_METRIC", "token_set"),
+    threshold=float(os.getenv("CONVERGENCE_THRESHOLD", "0.9")),
+)
+
+# Loop until done, converged, or max iterations reached
 root_agent = LoopAgent(
     name="refinement_loop",
-    sub_agents=[refiner],
+    sub_agents=[refiner, convergence_check],
     max_iterations=5,
+    # Each user turn starts from an empty draft, not the last turn's result
+    before_agent_callback=reset_state("draft"),
 )
-
@@ -0,0 +1,137 @@
+"""
+Convergence Check - Stop a LoopAgent once drafts stop changing
+
+Runs after the refiner on every iteration, without a model call:
+- Compares the new draft (session state under `key`) with the previous one
+- Escalates (ends the loop) when they are closer than `threshold`
+- Optionally escalates when `score_fn(draft)` reaches `min_score`
+- Also stops when the refiner answers only "DONE", keeping the previous draft
+
+The draft and the checker's bookkeeping live in session state, so they would
+carry over to the next user turn. Give the LoopAgent
+`before_agent_callback=reset_state("draft")` to clear them at the start of
+every invocation.
+
+Metrics:
+    "edit"      - 1 - normalized Levenshtein distance (character level)
+    "token_set" - Jaccard similarity of the lowercase word sets
+"""
+
+import re
+from typing import AsyncGenerator, Callable, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+
+def edit_similarity(a: str, b: str) -> float:
+    """1.0 for identical strings, 0.0 for completely different ones."""
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        previous = current
+    return 1.0 - previous[-1] / len(a)
+
+
+def token_set_similarity(a: str, b: str) -> float:
+    """Jaccard similarity of the two drafts' word sets."""
+    ta = set(re.findall(r"\w+", a.lower()))
+    tb = set(re.findall(r"\w+", b.lower()))
+    if not ta and not tb:
+        return 1.0
+    return len(ta & tb) / len(ta | tb)
+
+
+METRICS = {
+    "edit": edit_similarity,
+    "token_set": token_set_similarity,
+}
+
+
+def reset_state(key: str = "draft") -> Callable[[CallbackContext], None]:
+    """
+    before_agent_callback that clears the draft and checker state for `key`.
+
+    Without it, a new user turn starts from the previous turn's draft and is
+    compared against it. (`temp:` keys are not an option: ADK drops them from
+    the session state before later agents can read them.)
+    """
+    keys = (key, f"{key}_previous", f"{key}_similarity", f"{key}_score", f"{key}_stop_reason")
+
+    def reset(callback_context: CallbackContext) -> None:
+        for name in keys:
+            if callback_context.state.get(name) is not None:
+                callback_context.state[name] = None
+
+    return reset
+
+
+class ConvergenceChecker(BaseAgent):
+    """
+    Ends the enclosing LoopAgent when the refiner's drafts converge.
+
+    Attributes:
+        key: State key the refiner writes its draft to (its output_key).
+        metric: "edit" or "token_set".
+        threshold: Similarity at or above which two drafts count as converged.
+        score_fn: Optional callable draft -> float; the loop stops once it
+            returns at least `min_score`.
+        min_score: Score needed to stop when `score_fn` is set.
+        done_word: Reply that means "no more changes".
+    """
+
+    key: str = "draft"
+    metric: str = "token_set"
+    threshold: float = 0.95
+    score_fn: Optional[Callable[[str], float]] = None
+    min_score: float = 1.0
+    done_word: str = "DONE"
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        draft = str(state.get(self.key) or "").strip()
+        previous_key = f"{self.key}_previous"
+        previous = state.get(previous_key)
+
+        delta = {}
+        reason = None
+        if draft.upper().rstrip(".!") == self.done_word:
+            # Keep the last real draft instead of the bare "DONE"
+            reason = "done"
+            if previous is not None:
+                delta[self.key] = previous
+        else:
+            if previous is not None:
+                similarity = METRICS[self.metric](previous, draft)
+                delta[f"{self.key}_similarity"] = round(similarity, 4)
+                if similarity >= self.threshold:
+                    reason = f"converged ({self.metric}={similarity:.3f})"
+            if reason is None and self.score_fn is not None:
+                score = self.score_fn(draft)
+                delta[f"{self.key}_score"] = score
+                if score >= self.min_score:
+                    reason = f"score {score} >= {self.min_score}"
+            delta[previous_key] = draft
+
+        if reason:
+            delta[f"{self.key}_stop_reason"] = reason
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=delta, escalate=bool(reason)),
+        )
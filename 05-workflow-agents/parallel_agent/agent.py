@@ -4,33 +4,48 @@
 Execute agents simultaneously for independent tasks.
 Best for batch processing where tasks don't depend on each other.
 
+The team runs as a BoundedParallelAgent: at most MAX_IN_FLIGHT analysts run
+at once, each gets BRANCH_TIMEOUT seconds, and every analyst's result lands
+in session state under its output_key as soon as that analyst finishes.
+
 Blog: https://arjunprabhulal.com/adk-workflow-sequential-loop-parallel/
 """
 
-from google.adk.agents import Agent, ParallelAgent
+import os
+from google.adk.agents import Agent
+
+from .bounded_parallel import BoundedParallelAgent
+
+# Limits (0 / unset = unlimited, like a plain ParallelAgent)
+MAX_IN_FLIGHT = int(os.getenv("MAX_IN_FLIGHT", "0"))
+BRANCH_TIMEOUT = float(os.getenv("BRANCH_TIMEOUT", "0")) or None
 
 # Parallel analysts - all run at the same time
 market_analyst = Agent(
     model="gemini-2.5-flash",
     name="market_analyst",
     instruction="Analyze market trends and opportunities.",
+    output_key="market_analysis",
 )
 
 tech_analyst = Agent(
     model="gemini-2.5-flash",
     name="tech_analyst",
     instruction="Analyze technology landscape and innovations.",
+    output_key="tech_analysis",
 )
 
 risk_analyst = Agent(
     model="gemini-2.5-flash",
     name="risk_analyst",
     instruction="Identify potential risks and mitigation strategies.",
+    output_key="risk_analysis",
 )
 
-# Parallel Execution: All analysts run simultaneously
-root_agent = ParallelAgent(
+# Parallel Execution: All analysts run simultaneously (within the limits above)
+root_agent = BoundedParallelAgent(
     name="analysis_team",
     sub_agents=[market_analyst, tech_analyst, risk_analyst],
+    max_in_flight=MAX_IN_FLIGHT,
+    branch_timeout=BRANCH_TIMEOUT,
 )
-
@@ -0,0 +1,155 @@
+"""
+Bounded Parallel Agent - Concurrency limit, per-branch deadlines, first-complete merge
+
+A ParallelAgent that:
+- Runs at most `max_in_flight` branches at once (0 = no limit)
+- Gives each branch `branch_timeout` seconds of its own running time; a slow
+  branch is cancelled (its generator closed) and its partial text (or a
+  timeout marker) is used instead of blocking the rest. Time a branch spends
+  waiting for the caller to consume its events does not count
+- Writes each branch's result to session state under its key as soon as that
+  branch finishes, so callers see results in completion order
+
+The state key for a branch is the sub-agent's `output_key` if it has one,
+otherwise its name. A `<key>_status` entry records "ok", "timeout" or "error".
+"""
+
+import asyncio
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents import LlmAgent, ParallelAgent
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.utils.context_utils import Aclosing
+from pydantic import Field
+
+
+def _branch_ctx(agent: BaseAgent, sub_agent: BaseAgent, ctx: InvocationContext) -> InvocationContext:
+    """Isolated branch for a sub-agent (same naming as ParallelAgent)."""
+    branch_ctx = ctx.model_copy()
+    suffix = f"{agent.name}.{sub_agent.name}"
+    branch_ctx.branch = f"{ctx.branch}.{suffix}" if ctx.branch else suffix
+    return branch_ctx
+
+
+def _state_key(sub_agent: BaseAgent) -> str:
+    if isinstance(sub_agent, LlmAgent) and sub_agent.output_key:
+        return sub_agent.output_key
+    return sub_agent.name
+
+
+class BoundedParallelAgent(ParallelAgent):
+    """
+    ParallelAgent with a max-in-flight limit and per-branch deadlines.
+
+    Attributes:
+        max_in_flight: Max branches running at once in one invocation (0 = all).
+        branch_timeout: Seconds each branch may run once started, excluding time
+            waiting on the consumer (None = no limit).
+        timeout_marker: Text stored for a branch that timed out.
+        limiter: Optional semaphore shared across agents/invocations to cap
+            the total number of branches running in the process.
+    """
+
+    max_in_flight: int = 0
+    branch_timeout: Optional[float] = None
+    timeout_marker: str = "[TIMEOUT: no result within deadline]"
+    limiter: Optional[asyncio.Semaphore] = Field(default=None, exclude=True)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        if not self.sub_agents:
+            return
+
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        local_limit = asyncio.Semaphore(self.max_in_flight or len(self.sub_agents))
+
+        async def run_branch(sub_agent: BaseAgent):
+            branch_ctx = _branch_ctx(self, sub_agent, ctx)
+            texts = []
+            # Seconds the branch has run, not counting time spent waiting for
+            # the consumer to process its events (backpressure)
+            clock = {"used": 0.0, "since": None}
+
+            def used() -> float:
+                running = loop.time() - clock["since"] if clock["since"] is not None else 0.0
+                return clock["used"] + running
+
+            async def drive():
+                clock["since"] = loop.time()
+                # Aclosing: a cancelled branch still closes the sub-agent's generator
+                async with Aclosing(sub_agent.run_async(branch_ctx)) as agen:
+                    async for event in agen:
+                        if not event.partial and event.content and event.content.parts:
+                            texts.extend(p.text for p in event.content.parts if p.text)
+                        resume = asyncio.Event()
+                        clock["used"], clock["since"] = used(), None
+                        await queue.put((event, resume))
+                        # Wait until the runner has processed the event
+                        await resume.wait()
+                        clock["since"] = loop.time()
+
+            async def drive_with_deadline():
+                if self.branch_timeout is None:
+                    await drive()
+                    return
+                task = asyncio.create_task(drive())
+                try:
+                    while True:
+                        remaining = self.branch_timeout - used()
+                        if remaining <= 0:
+                            task.cancel()
+                            await asyncio.gather(task, return_exceptions=True)
+                            raise asyncio.TimeoutError()
+                        done, _ = await asyncio.wait({task}, timeout=remaining)
+                        if done:
+                            return task.result()
+                finally:
+                    if not task.done():
+                        task.cancel()
+                        await asyncio.gather(task, return_exceptions=True)
+
+            status = "ok"
+            try:
+                async with local_limit:
+                    if self.limiter is not None:
+                        async with self.limiter:
+                            await drive_with_deadline()
+                    else:
+                        await drive_with_deadline()
+            except asyncio.TimeoutError:
+                status = "timeout"
+            except Exception as e:
+                status = "error"
+                texts.append(f"[ERROR: {type(e).__name__}: {e}]")
+
+            result = "\n".join(texts)
+            if status == "timeout":
+                result = f"{result}\n{self.timeout_marker}" if result else self.timeout_marker
+            key = _state_key(sub_agent)
+            await queue.put((
+                Event(
+                    invocation_id=ctx.invocation_id,
+                    author=self.name,
+                    branch=ctx.branch,
+                    actions=EventActions(state_delta={key: result, f"{key}_status": status}),
+                ),
+                None,
+            ))
+
+        tasks = [asyncio.create_task(run_branch(sub)) for sub in self.sub_agents]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                event, resume = await queue.get()
+                yield event
+                if resume is None:
+                    # Branch-finished event: its result is now in session state
+                    remaining -= 1
+                else:
+                    resume.set()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -4,35 +4,62 @@
 Execute agents one after another, passing output to the next step.
 Best for multi-step pipelines where each step depends on the previous one.
 
+Each step writes its output to session state (output_key) for the next one,
+which also lets pipeline.py run the same stages over many topics at once.
+
+Set PIPELINE_CHECKPOINT_DIR to save each step's output on disk: a rerun with
+the same topic replays finished steps instead of calling the model again, and
+a run that failed at the editor resumes there.
+
 Blog: https://arjunprabhulal.com/adk-workflow-sequential-loop-parallel/
 """
 
-from google.adk.agents import Agent, SequentialAgent
+import os
+import sys
+from pathlib import Path
+
+from google.adk.agents import Agent
+
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.checkpoint import CheckpointStore, CheckpointedSequentialAgent
+
+# Stage checkpoints (unset = off)
+CHECKPOINT_DIR = os.getenv("PIPELINE_CHECKPOINT_DIR")
+CHECKPOINT_MAX_MB = int(os.getenv("PIPELINE_CHECKPOINT_MAX_MB", "100"))
 
 # Step 1: Research
 researcher = Agent(
     model="gemini-2.5-flash",
     name="researcher",
     instruction="Research the given topic and provide key findings.",
+    output_key="research",
 )
 
 # Step 2: Write
 writer = Agent(
     model="gemini-2.5-flash",
     name="writer",
-    instruction="Take the research findings and write a clear summary.",
+    instruction="""Take the research findings and write a clear summary.
+
+    Research findings: {research?}""",
+    output_key="summary",
 )
 
 # Step 3: Edit
 editor = Agent(
     model="gemini-2.5-flash",
     name="editor",
-    instruction="Review and polish the summary for clarity and grammar.",
+    instruction="""Review and polish the summary for clarity and grammar.
+
+    Summary: {summary?}""",
+    output_key="final_summary",
 )
 
 # Sequential Pipeline: Research → Write → Edit
-root_agent = SequentialAgent(
+root_agent = CheckpointedSequentialAgent(
     name="content_pipeline",
     sub_agents=[researcher, writer, editor],
+    store=CheckpointStore(CHECKPOINT_DIR, CHECKPOINT_MAX_MB * 1_000_000) if CHECKPOINT_DIR else None,
 )
 
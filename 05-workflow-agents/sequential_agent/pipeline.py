@@ -0,0 +1,287 @@
+"""
+Pipelined Execution - Push many topics through researcher → writer → editor
+
+Running the SequentialAgent once per topic is strictly serial: every topic
+waits for the previous one to clear all three stages. PipelineExecutor runs
+each stage as its own pool of workers connected by bounded queues, so topic
+N+1 can be in research while topic N is being edited.
+
+- Stages hand off through session state (output_key), carried with each item
+- `workers` sets how many items each stage processes at once
+- `queue_size` bounds the queue in front of each stage (backpressure)
+- `stats()` reports per-stage utilization and queue depths
+- With a CheckpointStore, stages that already ran for a topic are replayed
+  from disk (same keys as CheckpointedSequentialAgent)
+
+Usage (from 05-workflow-agents/):
+    python -m sequential_agent.pipeline "Solar power" "Quantum computing" --workers 2 4 2
+    python -m sequential_agent.pipeline --file topics.txt --fake --latency 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.checkpoint import CheckpointStore, stage_key
+
+_STOP = object()
+
+
+@dataclass
+class PipelineItem:
+    """One topic travelling through the pipeline."""
+
+    index: int
+    topic: str
+    state: dict = field(default_factory=dict)
+    outputs: dict = field(default_factory=dict)
+    error: Optional[str] = None
+    started: float = 0.0
+    latency: float = 0.0
+
+
+@dataclass
+class StageStats:
+    """Busy time and queue depth samples for one stage."""
+
+    name: str
+    workers: int
+    processed: int = 0
+    busy: float = 0.0
+    depth_samples: int = 0
+    depth_total: int = 0
+    depth_max: int = 0
+
+    def sample(self, depth: int) -> None:
+        self.depth_samples += 1
+        self.depth_total += depth
+        self.depth_max = max(self.depth_max, depth)
+
+
+class PipelineExecutor:
+    """
+    Run a list of stage agents as a pipeline over many inputs.
+
+    Args:
+        stages (list[BaseAgent]): Stage agents in order (e.g. researcher, writer, editor).
+        workers (int | list[int]): Workers per stage, one value for all or one per stage.
+        queue_size (int): Max items waiting in front of each stage.
+        app_name (str): App name for the shared session service.
+        store (CheckpointStore): Optional stage checkpoint store.
+    """
+
+    def __init__(
+        self,
+        stages: list[BaseAgent],
+        workers=1,
+        queue_size: int = 4,
+        app_name: str = "content_pipeline",
+        store: Optional[CheckpointStore] = None,
+    ):
+        if isinstance(workers, int):
+            workers = [workers] * len(stages)
+        if len(workers) != len(stages):
+            raise ValueError(f"Expected {len(stages)} worker counts, got {len(workers)}")
+        self.stages = stages
+        self.workers = workers
+        self.queue_size = queue_size
+        self.app_name = app_name
+        self.store = store
+        self.session_service = InMemorySessionService()
+        # One Runner per stage, all sharing the session service
+        self.runners = [
+            Runner(app_name=app_name, agent=stage, session_service=self.session_service)
+            for stage in stages
+        ]
+        self._stats: list[StageStats] = []
+        self._elapsed = 0.0
+
+    async def _run_stage(self, stage: int, item: PipelineItem) -> str:
+        if self.store is None:
+            return await self._call_stage(stage, item)
+
+        agent = self.stages[stage]
+        upstream = [item.topic] + [item.outputs[s.name] for s in self.stages[:stage]]
+        key = stage_key(agent, "\0".join(upstream))
+        entry = await asyncio.to_thread(self.store.get, key)
+        if entry is None:
+            text = await self._call_stage(stage, item)
+            output_key = agent.output_key if isinstance(agent, LlmAgent) else None
+            delta = {output_key: item.state[output_key]} if output_key in item.state else {}
+            entry = {"agent": agent.name, "text": text, "state_delta": delta}
+            await asyncio.to_thread(self.store.put, key, entry)
+        else:
+            item.state.update(entry["state_delta"])
+        return entry["text"]
+
+    async def _call_stage(self, stage: int, item: PipelineItem) -> str:
+        # Fresh session per stage, seeded with the state earlier stages produced
+        session = await self.session_service.create_session(
+            app_name=self.app_name, user_id="pipeline", state=item.state
+        )
+        content = types.Content(role="user", parts=[types.Part(text=item.topic)])
+        texts = []
+        try:
+            async for event in self.runners[stage].run_async(
+                user_id="pipeline",
+                session_id=session.id,
+                new_message=content,
+            ):
+                if event.is_final_response() and event.content and event.content.parts:
+                    texts.extend(p.text for p in event.content.parts if p.text)
+            session = await self.session_service.get_session(
+                app_name=self.app_name, user_id="pipeline", session_id=session.id
+            )
+            item.state = dict(session.state)
+        finally:
+            await self.session_service.delete_session(
+                app_name=self.app_name, user_id="pipeline", session_id=session.id
+            )
+        return "\n".join(texts)
+
+    async def run(self, topics) -> list[PipelineItem]:
+        """
+        Push every topic through all stages.
+
+        Args:
+            topics (Iterable[str]): Topics to process, read lazily.
+
+        Returns:
+            list[PipelineItem]: One item per topic in input order. A failing
+            stage records `error` and the item skips the remaining stages.
+        """
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        done_queue = asyncio.Queue()
+        self._stats = [StageStats(s.name, n) for s, n in zip(self.stages, self.workers)]
+        results: list[PipelineItem] = []
+
+        async def feed():
+            for index, topic in enumerate(topics):
+                item = PipelineItem(index=index, topic=topic)
+                item.started = time.perf_counter()
+                await queues[0].put(item)
+            for _ in range(self.workers[0]):
+                await queues[0].put(_STOP)
+
+        async def worker(stage: int, remaining: list):
+            inbox = queues[stage]
+            outbox = queues[stage + 1] if stage + 1 < len(queues) else done_queue
+            stats = self._stats[stage]
+            while True:
+                stats.sample(inbox.qsize())
+                item = await inbox.get()
+                if item is _STOP:
+                    break
+                if item.error is None:
+                    started = time.perf_counter()
+                    try:
+                        item.outputs[self.stages[stage].name] = await self._run_stage(stage, item)
+                    except Exception as e:
+                        item.error = f"{self.stages[stage].name}: {type(e).__name__}: {e}"
+                    stats.busy += time.perf_counter() - started
+                    stats.processed += 1
+                await outbox.put(item)
+            # Last worker of this stage shuts down the next stage
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                next_workers = self.workers[stage + 1] if stage + 1 < len(queues) else 1
+                for _ in range(next_workers):
+                    await outbox.put(_STOP)
+
+        async def collect():
+            while True:
+                item = await done_queue.get()
+                if item is _STOP:
+                    break
+                item.latency = time.perf_counter() - item.started
+                results.append(item)
+
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(feed()), asyncio.create_task(collect())]
+        for stage, count in enumerate(self.workers):
+            remaining = [count]
+            tasks += [asyncio.create_task(worker(stage, remaining)) for _ in range(count)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        self._elapsed = time.perf_counter() - started
+        return sorted(results, key=lambda item: item.index)
+
+    def stats(self) -> dict:
+        """Throughput, per-stage utilization and queue depths of the last run()."""
+        elapsed = self._elapsed or 1e-9
+        processed = self._stats[-1].processed if self._stats else 0
+        report = {
+            "elapsed_s": round(self._elapsed, 3),
+            "items_per_s": round(processed / elapsed, 2),
+            "stages": [
+                {
+                    "stage": s.name,
+                    "workers": s.workers,
+                    "processed": s.processed,
+                    "busy_s": round(s.busy, 3),
+                    # Share of the run this stage's workers spent on an item
+                    "utilization": round(s.busy / (elapsed * s.workers), 3),
+                    "queue_depth_avg": round(s.depth_total / max(1, s.depth_samples), 2),
+                    "queue_depth_max": s.depth_max,
+                }
+                for s in self._stats
+            ],
+        }
+        if self.store is not None:
+            report["checkpoints"] = self.store.stats()
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipelined content generation.")
+    parser.add_argument("topics", nargs="*", help="Topics to process")
+    parser.add_argument("--file", help="Text file with one topic per line")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1],
+                        help="Workers per stage (one value, or one per stage)")
+    parser.add_argument("--queue-size", type=int, default=4)
+    parser.add_argument("--checkpoint-dir", help="Replay finished stages from this directory")
+    parser.add_argument("--fake", action="store_true", help="Use the offline fake model")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Simulated model latency in seconds (with --fake)")
+    args = parser.parse_args()
+
+    from .agent import root_agent
+    stages = list(root_agent.sub_agents)
+    store = root_agent.store
+    if args.checkpoint_dir:
+        store = CheckpointStore(args.checkpoint_dir)
+    if args.fake:
+        from common.fake_llm import FakeLlm, use_fake_model
+        use_fake_model(root_agent, FakeLlm(first_chunk_latency=args.latency))
+
+    topics = list(args.topics)
+    if args.file:
+        with open(args.file) as f:
+            topics += [line.strip() for line in f if line.strip()]
+    workers = args.workers[0] if len(args.workers) == 1 else args.workers
+
+    executor = PipelineExecutor(stages, workers=workers, queue_size=args.queue_size, store=store)
+    items = asyncio.run(executor.run(topics))
+    for item in items:
+        status = f"ERROR {item.error}" if item.error else "ok"
+        print(f"[{item.index}] {item.topic} ({item.latency:.2f}s) {status}")
+    print(json.dumps(executor.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
+import os
 from google.adk.agents import Agent
 
+from .router import FastPathRouter, NaiveBayesClassifier
+
 # Specialist agents
 researcher = Agent(
     model="gemini-2.5-flash",
@@ -19,8 +22,8 @@ reviewer = Agent(
     instruction="Review content for accuracy and quality.",
 )
 
-# Coordinator agent
-root_agent = Agent(
+# Coordinator agent (LLM delegation for requests the router can't place)
+coordinator = Agent(
     model="gemini-2.5-flash",
     name="coordinator",
     instruction="""You are a project coordinator managing a team of specialists.
@@ -33,3 +36,44 @@ Your team:
 Delegate tasks appropriately and synthesize results.""",
     sub_agents=[researcher, writer, reviewer],
 )
+
+# Fast-path routing rules: obvious requests skip the coordinator's LLM call
+ROUTING_RULES = {
+    "researcher": [
+        r"\bresearch\b", r"\bfind (out|info|sources)\b", r"\blook ?up\b",
+        r"\bwhat (is|are)\b", r"\bhow does\b", r"\bfacts?\b", r"\bstatistics\b",
+    ],
+    "writer": [
+        r"\bwrite\b", r"\bdraft\b", r"\bcompose\b", r"\bblog post\b",
+        r"\bemail\b", r"\bsummar(y|ize)\b",
+    ],
+    "reviewer": [
+        r"\breview\b", r"\bproofread\b", r"\bcheck (this|my|the)\b",
+        r"\bfeedback\b", r"\bfix (the )?grammar\b", r"\baccura(te|cy)\b",
+    ],
+}
+
+# Examples for the optional classifier (enable with ROUTER_CLASSIFIER=1)
+TRAINING_EXAMPLES = [
+    ("gather information about electric cars", "researcher"),
+    ("what are the latest trends in ai", "researcher"),
+    ("investigate market size for solar panels", "researcher"),
+    ("create an article about remote work", "writer"),
+    ("turn these notes into a newsletter", "writer"),
+    ("produce a product description for headphones", "writer"),
+    ("is this paragraph correct", "reviewer"),
+    ("evaluate the quality of my essay", "reviewer"),
+    ("spot mistakes in this text", "reviewer"),
+]
+
+classifier = None
+if os.getenv("ROUTER_CLASSIFIER") == "1":
+    classifier = NaiveBayesClassifier().fit(TRAINING_EXAMPLES)
+
+root_agent = FastPathRouter(
+    name="support_router",
+    sub_agents=[coordinator],
+    rules=ROUTING_RULES,
+    classifier=classifier,
+    threshold=float(os.getenv("ROUTER_THRESHOLD", "0.75")),
+)
@@ -0,0 +1,191 @@
+"""
+Fast-Path Router - Route obvious requests without an LLM call
+
+Without a router, every request costs one coordinator LLM call just to pick a
+specialist. FastPathRouter sits in front of the coordinator:
+
+1. Keyword/regex rules score each specialist
+2. If the rules are not confident, an optional classifier gets a turn
+3. Confident requests (>= threshold) run the specialist directly
+4. Everything else falls back to the coordinator's LLM delegation
+
+The router logs every decision and keeps a running hit rate (share of
+requests that skipped the coordinator).
+"""
+
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from typing import AsyncGenerator, Callable, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from pydantic import Field, PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def _tokens(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
+
+
+def score_rules(text: str, rules: dict[str, list[str]]) -> tuple[Optional[str], float]:
+    """
+    Score specialists by how many of their patterns match.
+
+    Returns:
+        tuple: (best agent name or None, confidence). Confidence is the best
+        agent's share of all matches, so a request that only matches one
+        specialist scores 1.0 and a split request scores lower.
+    """
+    scores = {
+        agent: sum(1 for pattern in patterns if re.search(pattern, text, re.IGNORECASE))
+        for agent, patterns in rules.items()
+    }
+    total = sum(scores.values())
+    if not total:
+        return None, 0.0
+    best = max(scores, key=scores.get)
+    return best, scores[best] / total
+
+
+class NaiveBayesClassifier:
+    """
+    Tiny multinomial Naive Bayes text classifier (no dependencies).
+
+    Usage:
+        clf = NaiveBayesClassifier().fit([("find sources on X", "researcher"), ...])
+        label, confidence = clf.predict("look up the history of Y")
+    """
+
+    def __init__(self, smoothing: float = 1.0):
+        self.smoothing = smoothing
+        self.label_counts: Counter = Counter()
+        self.word_counts: dict[str, Counter] = defaultdict(Counter)
+        self.vocab: set[str] = set()
+
+    def fit(self, examples: list[tuple[str, str]]) -> "NaiveBayesClassifier":
+        for text, label in examples:
+            words = _tokens(text)
+            self.label_counts[label] += 1
+            self.word_counts[label].update(words)
+            self.vocab.update(words)
+        return self
+
+    def predict(self, text: str) -> tuple[Optional[str], float]:
+        """Most likely label and its posterior probability."""
+        if not self.label_counts:
+            return None, 0.0
+        words = [w for w in _tokens(text) if w in self.vocab]
+        total_docs = sum(self.label_counts.values())
+        vocab_size = len(self.vocab)
+        log_probs = {}
+        for label, count in self.label_counts.items():
+            label_words = sum(self.word_counts[label].values())
+            log_p = math.log(count / total_docs)
+            for word in words:
+                log_p += math.log(
+                    (self.word_counts[label][word] + self.smoothing)
+                    / (label_words + self.smoothing * vocab_size)
+                )
+            log_probs[label] = log_p
+        # Normalize to posteriors (log-sum-exp)
+        top = max(log_probs.values())
+        norm = sum(math.exp(v - top) for v in log_probs.values())
+        best = max(log_probs, key=log_probs.get)
+        return best, 1.0 / norm
+
+    __call__ = predict
+
+
+class FastPathRouter(BaseAgent):
+    """
+    Runs a specialist directly when the request is obvious, else the coordinator.
+
+    The only sub-agent is the coordinator; specialists are looked up in its tree.
+
+    Attributes:
+        rules: Specialist name -> regex patterns.
+        classifier: Optional callable text -> (specialist name, confidence),
+            consulted when the rules are not confident.
+        threshold: Minimum confidence to skip the coordinator.
+    """
+
+    rules: dict[str, list[str]] = Field(default_factory=dict)
+    classifier: Optional[Callable[[str], tuple]] = Field(default=None, exclude=True)
+    threshold: float = 0.75
+
+    _stats: Counter = PrivateAttr(default_factory=Counter)
+
+    def route(self, text: str) -> tuple[Optional[str], float, str]:
+        """
+        Decide where a request goes.
+
+        Returns:
+            tuple: (specialist name or None for fallback, confidence, source)
+            where source is "rules", "classifier" or "fallback".
+        """
+        agent, confidence = score_rules(text, self.rules)
+        if agent and confidence >= self.threshold:
+            return agent, confidence, "rules"
+        if self.classifier is not None:
+            label, label_confidence = self.classifier(text)
+            if label and label_confidence >= self.threshold:
+                return label, label_confidence, "classifier"
+            confidence = max(confidence, label_confidence)
+        return None, confidence, "fallback"
+
+    def stats(self) -> dict:
+        total = self._stats["total"]
+        return {
+            "total": total,
+            "fast_path": self._stats["fast_path"],
+            "fallback": self._stats["fallback"],
+            "hit_rate": round(self._stats["fast_path"] / total, 3) if total else 0.0,
+            "by_agent": {k[3:]: v for k, v in self._stats.items() if k.startswith("to:")},
+        }
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        coordinator = self.sub_agents[0]
+        text = ""
+        if ctx.user_content and ctx.user_content.parts:
+            text = " ".join(p.text for p in ctx.user_content.parts if p.text)
+
+        name, confidence, source = self.route(text)
+        target = coordinator.find_agent(name) if name else None
+
+        self._stats["total"] += 1
+        if target is not None:
+            self._stats["fast_path"] += 1
+            self._stats[f"to:{target.name}"] += 1
+        else:
+            self._stats["fallback"] += 1
+            source = "fallback"
+        logger.info(
+            "route=%s source=%s confidence=%.2f hit_rate=%.1f%% (%d/%d)",
+            target.name if target else coordinator.name,
+            source,
+            confidence,
+            100 * self._stats["fast_path"] / self._stats["total"],
+            self._stats["fast_path"],
+            self._stats["total"],
+        )
+
+        # Record the decision in session state for debugging in adk web
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={
+                "route": target.name if target else coordinator.name,
+                "route_source": source,
+                "route_confidence": round(confidence, 3),
+            }),
+        )
+
+        async for event in (target or coordinator).run_async(ctx):
+            yield event
@@ -4,15 +4,24 @@
 Blog: https://arjunprabhulal.com/adk-built-in-tools/
 """
 
+import sys
+from pathlib import Path
+
 from google.adk.agents import Agent
 from google.adk.code_executors import BuiltInCodeExecutor
 
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.process_executor import code_execution_from_env
+
 root_agent = Agent(
     model="gemini-2.5-flash",
     name="code_agent",
     instruction="""You are a Python coding assistant.
     Write and execute Python code to solve problems.
     Show your code and explain the results.""",
-    code_executor=BuiltInCodeExecutor(),
+    # CODE_EXECUTOR=local swaps the built-in executor for an async run_python
+    # tool backed by warm local worker processes
+    **code_execution_from_env(BuiltInCodeExecutor()),
 )
 
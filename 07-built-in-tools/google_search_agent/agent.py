@@ -1,8 +1,16 @@
+import sys
+from pathlib import Path
+
 from google.adk.agents import Agent
 from google.adk.tools import google_search
 
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.search_cache import search_model_from_env
+
 root_agent = Agent(
-    model="gemini-2.5-flash",
+    # Repeated questions are answered from a TTL cache (see common/search_cache.py)
+    model=search_model_from_env("gemini-2.5-flash"),
     name="google_search_agent",
     instruction="You are a helpful google search assistant.",
     tools=[google_search],
@@ -4,11 +4,19 @@
 Blog: https://arjunprabhulal.com/adk-built-in-tools/
 """
 
+import sys
+from pathlib import Path
+
 from google.adk.agents import Agent
 from google.adk.tools import google_search
 
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.search_cache import search_model_from_env
+
 root_agent = Agent(
-    model="gemini-2.5-flash",
+    # Repeated questions are answered from a TTL cache (see common/search_cache.py)
+    model=search_model_from_env("gemini-2.5-flash"),
     name="search_agent",
     instruction="""You are a helpful assistant with web search capabilities.
     Use Google Search to find current information and answer questions accurately.""",
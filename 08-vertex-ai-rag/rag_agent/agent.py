@@ -1,7 +1,11 @@
 import os
+import sys
+from pathlib import Path
 from google.adk.agents import Agent
-from google.adk.tools.retrieval.vertex_ai_rag_retrieval import VertexAiRagRetrieval
-from vertexai.preview import rag
+
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.lazy_agent import lazy_root_agent
 
 # Configure RAG retrieval from environment variable
 # Set RAG_CORPUS in .env or export it:
@@ -11,26 +15,91 @@ RAG_CORPUS = os.environ.get(
     "projects/YOUR_PROJECT/locations/us-central1/ragCorpora/YOUR_CORPUS_ID"
 )
 
-# Validate configuration
-if "YOUR_PROJECT" in RAG_CORPUS:
-    print("WARNING: RAG_CORPUS not configured. Set it in .env or as environment variable.")
-    print("Example: RAG_CORPUS=projects/my-project/locations/us-central1/ragCorpora/123456")
-
-rag_tool = VertexAiRagRetrieval(
-    name='retrieve_documents',
-    description='Retrieve relevant documents from the knowledge base',
-    rag_resources=[
-        rag.RagResource(rag_corpus=RAG_CORPUS)
-    ],
-    similarity_top_k=10,
-    vector_distance_threshold=0.6,
-)
+# RAG_BACKEND=local retrieves from a local index instead (no GCP needed);
+# RAG_BACKEND=hybrid adds BM25 keyword search, rank fusion and MMR on top of it
+# Build one with: python -m common.ingest ./docs ./rag_index
+RAG_BACKEND = os.environ.get("RAG_BACKEND", "vertex")
+RAG_LOCAL_INDEX = os.environ.get("RAG_LOCAL_INDEX", "rag_index")
+
+# Retrieval settings shared by every backend
+SIMILARITY_TOP_K = 10
+VECTOR_DISTANCE_THRESHOLD = float(os.environ.get("RAG_DISTANCE_THRESHOLD", "0.6"))
+
+# Hybrid retrieval sends fewer, deduplicated chunks to the model
+HYBRID_TOP_K = int(os.environ.get("RAG_HYBRID_TOP_K", "4"))
+
+
+def create_retrieval_tool():
+    """Vertex AI RAG retrieval, or the local index when RAG_BACKEND=local/hybrid."""
+    if RAG_BACKEND in ("local", "hybrid"):
+        from common.retrieval_cache import CachedRetriever, retrieval_cache_from_env
+
+        # Repeated questions skip embedding and search (RAG_CACHE=0 disables)
+        cache = retrieval_cache_from_env()
+        cached = CachedRetriever(RAG_LOCAL_INDEX, hybrid=RAG_BACKEND == "hybrid", cache=cache) if cache else None
+
+    if RAG_BACKEND == "hybrid":
+        from common.hybrid_retrieval import HybridRagRetrieval
+
+        return HybridRagRetrieval(
+            name='retrieve_documents',
+            description='Retrieve relevant documents from the knowledge base',
+            index_path=RAG_LOCAL_INDEX,
+            retriever=cached,
+            similarity_top_k=HYBRID_TOP_K,
+            vector_distance_threshold=VECTOR_DISTANCE_THRESHOLD,
+        )
+
+    if RAG_BACKEND == "local":
+        from common.vector_index import LocalRagRetrieval
 
-root_agent = Agent(
-    model="gemini-2.5-flash",
-    name="rag_agent",
-    instruction="""You are a helpful assistant with access to company documents.
+        return LocalRagRetrieval(
+            name='retrieve_documents',
+            description='Retrieve relevant documents from the knowledge base',
+            index_path=RAG_LOCAL_INDEX,
+            index=cached,
+            similarity_top_k=SIMILARITY_TOP_K,
+            vector_distance_threshold=VECTOR_DISTANCE_THRESHOLD,
+        )
+
+    from google.adk.tools.retrieval.vertex_ai_rag_retrieval import VertexAiRagRetrieval
+    from vertexai.preview import rag
+
+    # Validate configuration
+    if "YOUR_PROJECT" in RAG_CORPUS:
+        print("WARNING: RAG_CORPUS not configured. Set it in .env or as environment variable.")
+        print("Example: RAG_CORPUS=projects/my-project/locations/us-central1/ragCorpora/123456")
+
+    return VertexAiRagRetrieval(
+        name='retrieve_documents',
+        description='Retrieve relevant documents from the knowledge base',
+        rag_resources=[
+            rag.RagResource(rag_corpus=RAG_CORPUS)
+        ],
+        similarity_top_k=SIMILARITY_TOP_K,
+        vector_distance_threshold=VECTOR_DISTANCE_THRESHOLD,
+    )
+
+
+def create_agent() -> Agent:
+    """
+    Build the RAG agent.
+
+    The Vertex AI SDK (or NumPy for the local index) is imported inside
+    create_retrieval_tool(), so importing this package stays cheap until
+    root_agent is first used.
+    """
+    rag_tool = create_retrieval_tool()
+
+    return Agent(
+        model="gemini-2.5-flash",
+        name="rag_agent",
+        instruction="""You are a helpful assistant with access to company documents.
 Use the retrieval tool to find relevant information before answering.
 Always cite your sources.""",
-    tools=[rag_tool],
-)
+        tools=[rag_tool],
+    )
+
+
+# root_agent is built on first access (adk web, adk run, imports)
+__getattr__ = lazy_root_agent(create_agent)
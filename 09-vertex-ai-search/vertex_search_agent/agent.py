@@ -11,17 +11,31 @@ DATA_STORE_ID = os.environ.get(
 )
 
 # Validate configuration
-if "YOUR_PROJECT" in DATA_STORE_ID:
+if "YOUR_PROJECT" in DATA_STORE_ID and os.environ.get("VERTEX_SEARCH_BACKEND") != "local":
     print("WARNING: DATA_STORE_ID not configured. Set it in .env or as environment variable.")
     print("Example: DATA_STORE_ID=projects/my-project/locations/global/collections/default_collection/dataStores/my-store_123")
 
-search_tool = VertexAiSearchTool(data_store_id=DATA_STORE_ID)
+# SEARCH_MODE=paged: compact snippets first, full documents fetched on demand
+# (see paged_search.py); the default grounds the model with VertexAiSearchTool
+SEARCH_MODE = os.environ.get("SEARCH_MODE", "grounded")
+
+if SEARCH_MODE == "paged":
+    from .paged_search import paged_search_from_env
+
+    tools = paged_search_from_env(DATA_STORE_ID).tools()
+    instruction = """You are a helpful assistant with access to company documents.
+Use search_documents to find relevant documents; answer from the snippets when they are enough.
+Call fetch_document only for the one or two hits you need in full.
+Provide accurate answers based on the search results and cite the document titles."""
+else:
+    tools = [VertexAiSearchTool(data_store_id=DATA_STORE_ID)]
+    instruction = """You are a helpful assistant with access to company documents.
+Use the search tool to find relevant information.
+Provide accurate answers based on the search results."""
 
 root_agent = LlmAgent(
     model="gemini-2.5-flash",
     name="enterprise_search_agent",
-    instruction="""You are a helpful assistant with access to company documents.
-Use the search tool to find relevant information.
-Provide accurate answers based on the search results.""",
-    tools=[search_tool],
+    instruction=instruction,
+    tools=tools,
 )
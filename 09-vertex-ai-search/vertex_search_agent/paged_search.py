@@ -0,0 +1,360 @@
+"""
+Paged Search - Compact snippets first, full documents only on request
+
+`VertexAiSearchTool` grounds the model on whatever the data store returns, so
+large documents land in the prompt on every search turn. Most answers need
+only one or two of them. This module splits search into two function tools:
+
+- search_documents(query, page): one page of ranked hits, each a title, URL,
+  document id and a short snippet
+- fetch_document(doc_id, start): the body of one chosen hit, in windows of
+  `max_chars`, read from an LRU document cache when possible
+
+Both tools are async: backend calls (gRPC, Cloud Storage, simulated latency)
+run in a worker thread, so a slow search never blocks the event loop.
+
+Backends:
+- DiscoveryEngineBackend: the Vertex AI Search (Discovery Engine) API
+- LocalSearchBackend: in-memory BM25 over a folder of .txt/.md files (or a
+  small built-in sample), with optional latency, for tests and offline runs
+
+Usage:
+    search = PagedSearch(LocalSearchBackend.from_directory("./docs"), page_size=5)
+    agent = LlmAgent(..., tools=search.tools())
+"""
+
+import asyncio
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from google.adk.tools import FunctionTool
+
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.hybrid_retrieval import BM25Index, tokenize
+from common.search_cache import SearchCache
+
+
+@dataclass
+class SearchHit:
+    rank: int
+    doc_id: str
+    title: str
+    url: str
+    snippet: str
+
+
+def make_snippet(text: str, query: str, chars: int = 240) -> str:
+    """`chars` characters of `text` around the first query term found."""
+    text = " ".join(text.split())
+    if len(text) <= chars:
+        return text
+    lowered = text.lower()
+    positions = [lowered.find(term) for term in tokenize(query)]
+    positions = [p for p in positions if p >= 0]
+    start = max(0, min(positions) - chars // 4) if positions else 0
+    end = min(len(text), start + chars)
+    start = max(0, end - chars)
+    return ("…" if start else "") + text[start:end].strip() + ("…" if end < len(text) else "")
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class LocalSearchBackend:
+    """
+    Offline stand-in for a Vertex AI Search data store.
+
+    Args:
+        documents (dict): doc_id -> {"title", "url", "content"}.
+        latency (float): Simulated seconds per search and per fetch.
+    """
+
+    def __init__(self, documents: dict[str, dict], latency: float = 0.0):
+        self.documents = documents
+        self.latency = latency
+        self.fetch_count = 0
+        self._ids = list(documents)
+        self._bm25 = BM25Index().fit(
+            f"{d['title']} {d['content']}" for d in documents.values()
+        )
+
+    @classmethod
+    def from_directory(cls, path: str, latency: float = 0.0) -> "LocalSearchBackend":
+        documents = {}
+        for file in sorted(Path(path).rglob("*")):
+            if file.suffix.lower() in (".txt", ".md") and file.is_file():
+                doc_id = file.relative_to(path).as_posix()
+                documents[doc_id] = {
+                    "title": file.stem.replace("_", " ").replace("-", " ").title(),
+                    "url": file.resolve().as_uri(),
+                    "content": file.read_text(encoding="utf-8", errors="replace"),
+                }
+        return cls(documents, latency)
+
+    @classmethod
+    def sample(cls, latency: float = 0.0) -> "LocalSearchBackend":
+        """A few long policy documents, enough to try the agent offline."""
+        filler = " ".join(["Further details, exceptions and regional variations apply."] * 150)
+        topics = {
+            "travel-policy": ("Travel Policy", "Book flights through the travel portal at least 14 days ahead. Economy class for flights under 6 hours."),
+            "expense-policy": ("Expense Policy", "Submit expense reports within 30 days. Meals are reimbursed up to 75 USD per day."),
+            "remote-work": ("Remote Work Policy", "Employees may work remotely up to 3 days per week with manager approval."),
+            "security-policy": ("Security Policy", "Use the password manager and enable two-factor authentication on every account."),
+            "pto-policy": ("Paid Time Off", "Full-time employees accrue 20 days of PTO per year, carried over up to 5 days."),
+        }
+        documents = {
+            doc_id: {"title": title, "url": f"https://intranet.example.com/{doc_id}", "content": f"{summary}\n\n{filler}"}
+            for doc_id, (title, summary) in topics.items()
+        }
+        return cls(documents, latency)
+
+    def search(self, query: str, offset: int, page_size: int, snippet_chars: int) -> tuple[list[SearchHit], bool]:
+        if self.latency:
+            time.sleep(self.latency)
+        ranked = self._bm25.search(query, top_k=offset + page_size + 1)
+        hits = []
+        for rank, (row, _) in enumerate(ranked[offset:offset + page_size], start=offset + 1):
+            doc_id = self._ids[row]
+            doc = self.documents[doc_id]
+            hits.append(SearchHit(rank, doc_id, doc["title"], doc["url"], make_snippet(doc["content"], query, snippet_chars)))
+        return hits, len(ranked) > offset + page_size
+
+    def fetch(self, doc_id: str) -> Optional[str]:
+        if self.latency:
+            time.sleep(self.latency)
+        self.fetch_count += 1
+        doc = self.documents.get(doc_id)
+        return doc["content"] if doc else None
+
+
+class DiscoveryEngineBackend:
+    """
+    Vertex AI Search through the Discovery Engine API.
+
+    API clients are created on first use, not at import. Searches also ask
+    for extractive segments, which fetch() returns when a document's body is
+    neither inline nor readable text in Cloud Storage (e.g. a PDF in an
+    unstructured data store).
+
+    Args:
+        data_store_id (str): Full data store resource name.
+        max_segments (int): Extractive segments requested per search hit.
+    """
+
+    # Search hits whose extractive segments are remembered for fetch()
+    MAX_REMEMBERED = 1000
+
+    def __init__(self, data_store_id: str, max_segments: int = 5):
+        self.serving_config = f"{data_store_id}/servingConfigs/default_config"
+        self.max_segments = max_segments
+        self._de = None
+        self._search = None
+        self._documents = None
+        self._storage = None
+        self._lock = threading.Lock()
+        self._segments: OrderedDict[str, str] = OrderedDict()
+
+    def _clients(self):
+        with self._lock:
+            if self._search is None:
+                from google.cloud import discoveryengine_v1beta as discoveryengine
+
+                self._de = discoveryengine
+                self._search = discoveryengine.SearchServiceClient()
+                self._documents = discoveryengine.DocumentServiceClient()
+        return self._de, self._search, self._documents
+
+    def search(self, query: str, offset: int, page_size: int, snippet_chars: int) -> tuple[list[SearchHit], bool]:
+        de, search_client, _ = self._clients()
+        spec = de.SearchRequest.ContentSearchSpec
+        response = search_client.search(de.SearchRequest(
+            serving_config=self.serving_config,
+            query=query,
+            offset=offset,
+            page_size=page_size,
+            content_search_spec=spec(
+                snippet_spec=spec.SnippetSpec(return_snippet=True),
+                extractive_content_spec=spec.ExtractiveContentSpec(
+                    max_extractive_segment_count=self.max_segments,
+                ),
+            ),
+        ))
+        hits = []
+        for rank, result in enumerate(response.results, start=offset + 1):
+            doc = result.document
+            data = dict(doc.derived_struct_data or {})
+            snippets = [s.get("snippet", "") for s in data.get("snippets", [])]
+            snippet = re.sub(r"</?b>", "", " ".join(snippets))
+            segments = [s.get("content", "") for s in data.get("extractive_segments", [])]
+            if segments:
+                self._remember(doc.name, "\n\n".join(segments))
+            hits.append(SearchHit(
+                rank=rank,
+                doc_id=doc.name,
+                title=data.get("title", doc.id),
+                url=data.get("link", ""),
+                snippet=make_snippet(snippet, query, snippet_chars),
+            ))
+        return hits, bool(response.next_page_token)
+
+    def _remember(self, doc_id: str, segments: str) -> None:
+        with self._lock:
+            self._segments[doc_id] = segments
+            self._segments.move_to_end(doc_id)
+            while len(self._segments) > self.MAX_REMEMBERED:
+                self._segments.popitem(last=False)
+
+    def _read_gcs(self, uri: str, mime_type: str) -> Optional[str]:
+        """Text of a gs:// object, or None if it is not text (PDF, DOCX, ...)."""
+        if not uri.startswith("gs://") or not (mime_type.startswith("text/") or mime_type in ("application/json", "")):
+            return None
+        with self._lock:
+            if self._storage is None:
+                from google.cloud import storage
+
+                self._storage = storage.Client()
+        bucket, _, name = uri[len("gs://"):].partition("/")
+        data = self._storage.bucket(bucket).blob(name).download_as_bytes()
+        text = data.decode("utf-8", errors="replace")
+        if mime_type == "text/html":
+            text = re.sub(r"<[^>]+>", " ", re.sub(r"(?is)<(script|style).*?</\1>", " ", text))
+        return text
+
+    def fetch(self, doc_id: str) -> Optional[str]:
+        _, _, documents_client = self._clients()
+        doc = documents_client.get_document(name=doc_id)
+        if doc.content.raw_bytes:
+            return doc.content.raw_bytes.decode("utf-8", errors="replace")
+        if doc.json_data:
+            return doc.json_data
+        if doc.struct_data:
+            return str(dict(doc.struct_data))
+        if doc.content.uri:
+            text = self._read_gcs(doc.content.uri, doc.content.mime_type)
+            if text is not None:
+                return text
+            segments = self._segments.get(doc_id)
+            if segments:
+                return f"Extractive segments from {doc.content.uri}:\n\n{segments}"
+            return f"Document content is stored at {doc.content.uri} ({doc.content.mime_type}) and is not available as text."
+        return None
+
+
+# ============================================================================
+# TOOLS
+# ============================================================================
+
+class PagedSearch:
+    """
+    Two-step search tools over a backend, with an LRU cache of document bodies.
+
+    Args:
+        backend: LocalSearchBackend or DiscoveryEngineBackend.
+        page_size (int): Hits per search_documents call.
+        snippet_chars (int): Max characters per snippet.
+        max_chars (int): Max characters per fetch_document call.
+        cache (SearchCache): Document body cache (default: 200 docs / 50 MB, 1 h TTL).
+    """
+
+    def __init__(
+        self,
+        backend,
+        page_size: int = 5,
+        snippet_chars: int = 240,
+        max_chars: int = 6000,
+        cache: Optional[SearchCache] = None,
+    ):
+        self.backend = backend
+        self.page_size = page_size
+        self.snippet_chars = snippet_chars
+        self.max_chars = max_chars
+        self.cache = cache or SearchCache(ttl=3600, max_entries=200, max_bytes=50_000_000)
+
+    async def search_documents(self, query: str, page: int = 1) -> dict:
+        """
+        Search the company documents. Returns one page of ranked hits with short
+        snippets. Call fetch_document with a hit's doc_id when the snippet is
+        not enough to answer.
+
+        Args:
+            query: What to search for.
+            page: Result page, starting at 1. Ask for page 2 only if no hit on
+                page 1 is relevant.
+        """
+        page = max(1, int(page))
+        try:
+            hits, has_more = await asyncio.to_thread(
+                self.backend.search, query, (page - 1) * self.page_size, self.page_size, self.snippet_chars
+            )
+        except Exception as e:
+            return {"status": "error", "error_message": str(e)}
+        if not hits:
+            return {"status": "success", "page": page, "has_more": False, "results": [], "message": f"No results for: {query}"}
+        return {
+            "status": "success",
+            "page": page,
+            "has_more": has_more,
+            "results": [asdict(hit) for hit in hits],
+        }
+
+    async def fetch_document(self, doc_id: str, start: int = 0) -> dict:
+        """
+        Read the full text of one search hit.
+
+        Args:
+            doc_id: The doc_id of a hit returned by search_documents.
+            start: Character offset to continue from, when a previous call
+                returned "next_start".
+        """
+        body = self.cache.get(doc_id)
+        if body is None:
+            self.cache.misses += 1
+            try:
+                body = await asyncio.to_thread(self.backend.fetch, doc_id)
+            except Exception as e:
+                return {"status": "error", "error_message": str(e)}
+            if body is None:
+                return {"status": "error", "error_message": f"Unknown document: {doc_id}"}
+            self.cache.put(doc_id, body, size=len(body))
+        else:
+            self.cache.hits += 1
+        start = max(0, int(start))
+        window = body[start:start + self.max_chars]
+        result = {"status": "success", "doc_id": doc_id, "start": start, "content": window}
+        if start + self.max_chars < len(body):
+            result["next_start"] = start + self.max_chars
+            result["total_chars"] = len(body)
+        return result
+
+    def tools(self) -> list[FunctionTool]:
+        return [FunctionTool(self.search_documents), FunctionTool(self.fetch_document)]
+
+
+def paged_search_from_env(data_store_id: str) -> PagedSearch:
+    """
+    PagedSearch configured from environment variables.
+
+    VERTEX_SEARCH_BACKEND ("vertex" or "local"), LOCAL_SEARCH_DOCS (folder for the
+    local backend; built-in sample if unset), SEARCH_PAGE_SIZE (5),
+    SEARCH_SNIPPET_CHARS (240), SEARCH_FETCH_CHARS (6000).
+    """
+    if os.getenv("VERTEX_SEARCH_BACKEND") == "local":
+        docs = os.getenv("LOCAL_SEARCH_DOCS")
+        backend = LocalSearchBackend.from_directory(docs) if docs else LocalSearchBackend.sample()
+    else:
+        backend = DiscoveryEngineBackend(data_store_id)
+    return PagedSearch(
+        backend,
+        page_size=int(os.getenv("SEARCH_PAGE_SIZE", "5")),
+        snippet_chars=int(os.getenv("SEARCH_SNIPPET_CHARS", "240")),
+        max_chars=int(os.getenv("SEARCH_FETCH_CHARS", "6000")),
+    )
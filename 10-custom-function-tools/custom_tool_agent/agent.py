@@ -1,29 +1,73 @@
+import sys
+from pathlib import Path
+
 from google.adk.agents import Agent
 
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.tool_cache import cached_tool
+
+from .order_store import get_store
+
+# Order status changes rarely within a conversation; repeated lookups hit the cache
+ORDER_CACHE_TTL = 30.0
+
+
+def _order_result(order: dict) -> dict:
+    return {
+        "order_id": order["order_id"],
+        "order_status": order["order_status"],
+        "delivery_date": order["delivery_date"],
+    }
+
 
-def get_order_status(order_id: str) -> dict:
+@cached_tool(ttl=ORDER_CACHE_TTL)
+async def get_order_status(order_id: str) -> dict:
     """
     Retrieves the status of an order by order ID.
-    
+
     Args:
         order_id (str): The unique order identifier.
-    
+
     Returns:
         dict: Order status information including status and delivery date.
     """
-    # In a real scenario, this would query a database or API.
+    store = await get_store()
+    order = await store.get(order_id.strip().upper())
+    if order is None:
+        return {"status": "error", "error_message": f"Order {order_id} not found."}
+    return {"status": "success", **_order_result(order)}
+
+
+@cached_tool(ttl=ORDER_CACHE_TTL)
+async def get_order_statuses(order_ids: list[str]) -> dict:
+    """
+    Retrieves the status of several orders at once. Use this instead of
+    calling get_order_status repeatedly when the user asks about more than
+    one order.
+
+    Args:
+        order_ids (list[str]): The order identifiers to look up.
+
+    Returns:
+        dict: Status and delivery date for each order found, plus the IDs
+        that were not found.
+    """
+    wanted = [order_id.strip().upper() for order_id in order_ids]
+    store = await get_store()
+    found = await store.get_many(wanted)
     return {
         "status": "success",
-        "order_id": order_id,
-        "order_status": "Shipped",
-        "delivery_date": "Nov 24, 2025"
+        "orders": [_order_result(found[order_id]) for order_id in dict.fromkeys(wanted) if order_id in found],
+        "not_found": [order_id for order_id in dict.fromkeys(wanted) if order_id not in found],
     }
 
 
 root_agent = Agent(
     model="gemini-2.5-flash",
     name="support_agent",
-    instruction="You are a helpful customer support assistant. Use the get_order_status tool when users ask about their orders.",
-    tools=[get_order_status],  # ADK automatically wraps functions as FunctionTool
+    instruction="""You are a helpful customer support assistant.
+Use the get_order_status tool when users ask about an order.
+When they ask about several orders, look them all up with one get_order_statuses call.""",
+    tools=[get_order_status, get_order_statuses],  # ADK automatically wraps functions as FunctionTool
 )
-
@@ -0,0 +1,257 @@
+"""
+Order Store - Indexed order lookups with a batch query
+
+Backs the order tools with a real store instead of a hard-coded dict:
+
+- SQLiteOrderStore: `order_id` is the primary key of a WITHOUT ROWID table, so
+  every lookup is a single B-tree search
+- A small pool of connections; queries run in worker threads, so the event
+  loop never blocks on disk
+- get_many() resolves any number of orders with one `IN (...)` query per 500
+  ids instead of one round trip per order
+
+Other backends (Postgres, an HTTP API, ...) only need to implement
+`fetch_many(order_ids) -> dict[order_id, row]` from OrderStore.
+
+Benchmark (from 10-custom-function-tools/):
+    python -m custom_tool_agent.order_store bench --orders 1000000 --batch 10
+    python -m custom_tool_agent.order_store bench --db /tmp/orders.db --rtt-ms 1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import queue
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+
+STATUSES = ("Processing", "Shipped", "Out for delivery", "Delivered", "Cancelled")
+
+# SQLite's default limit on bound parameters is 999 (older builds)
+MAX_IDS_PER_QUERY = 500
+
+
+def order_id_for(n: int) -> str:
+    return f"ORD-{n:07d}"
+
+
+class OrderStore(ABC):
+    """Base class: subclasses implement fetch_many(), callers use get()/get_many()."""
+
+    @abstractmethod
+    def fetch_many(self, order_ids: list[str]) -> dict[str, dict]:
+        """Blocking lookup; returns the rows that exist, keyed by order_id."""
+
+    async def get_many(self, order_ids: list[str]) -> dict[str, dict]:
+        # Deduplicate, keep the caller's order
+        unique = list(dict.fromkeys(order_ids))
+        return await asyncio.to_thread(self.fetch_many, unique)
+
+    async def get(self, order_id: str) -> Optional[dict]:
+        return (await self.get_many([order_id])).get(order_id)
+
+
+class SQLiteOrderStore(OrderStore):
+    """
+    Orders in a SQLite file.
+
+    Args:
+        path (str): Database file (created if missing).
+        pool_size (int): Connections shared by concurrent lookups.
+        simulated_rtt (float): Seconds added to every query, to model a
+            database across the network (benchmarks only).
+    """
+
+    def __init__(self, path: str, pool_size: int = 4, simulated_rtt: float = 0.0):
+        self.path = path
+        self.simulated_rtt = simulated_rtt
+        self._pool: queue.Queue = queue.Queue()
+        with sqlite3.connect(path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS orders (
+                    order_id TEXT PRIMARY KEY,
+                    order_status TEXT NOT NULL,
+                    delivery_date TEXT,
+                    updated_at TEXT
+                ) WITHOUT ROWID
+                """
+            )
+        for _ in range(pool_size):
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._pool.put(conn)
+
+    def _query(self, sql: str, params) -> list[sqlite3.Row]:
+        conn = self._pool.get()
+        try:
+            if self.simulated_rtt:
+                time.sleep(self.simulated_rtt)
+            return conn.execute(sql, params).fetchall()
+        finally:
+            self._pool.put(conn)
+
+    def fetch_one(self, order_id: str) -> Optional[dict]:
+        """One-round-trip-per-order lookup (the benchmark baseline)."""
+        rows = self._query("SELECT * FROM orders WHERE order_id = ?", (order_id,))
+        return dict(rows[0]) if rows else None
+
+    def fetch_many(self, order_ids: list[str]) -> dict[str, dict]:
+        found = {}
+        for start in range(0, len(order_ids), MAX_IDS_PER_QUERY):
+            batch = order_ids[start:start + MAX_IDS_PER_QUERY]
+            placeholders = ",".join("?" * len(batch))
+            for row in self._query(f"SELECT * FROM orders WHERE order_id IN ({placeholders})", batch):
+                found[row["order_id"]] = dict(row)
+        return found
+
+    def count(self) -> int:
+        return self._query("SELECT COUNT(*) FROM orders", ())[0][0]
+
+    def seed(self, count: int, batch_size: int = 50_000, seed: int = 0) -> None:
+        """Insert `count` synthetic orders ORD-0000000 ... (replacing existing ids)."""
+        rng = random.Random(seed)
+        today = date.today()
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("PRAGMA synchronous=OFF")
+            for start in range(0, count, batch_size):
+                rows = [
+                    (
+                        order_id_for(n),
+                        rng.choice(STATUSES),
+                        (today + timedelta(days=rng.randint(-30, 14))).strftime("%b %d, %Y"),
+                        today.isoformat(),
+                    )
+                    for n in range(start, min(count, start + batch_size))
+                ]
+                conn.executemany("INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?)", rows)
+                conn.commit()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+# Default database: next to this module, whatever directory the agent runs from
+DEFAULT_DB = Path(__file__).resolve().parent / "orders.db"
+
+_store: Optional[SQLiteOrderStore] = None
+_store_lock = threading.Lock()
+
+
+def _open_store() -> SQLiteOrderStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            store = SQLiteOrderStore(
+                os.getenv("ORDER_DB", str(DEFAULT_DB)),
+                pool_size=int(os.getenv("ORDER_DB_POOL_SIZE", "4")),
+            )
+            if store.count() == 0:
+                store.seed(int(os.getenv("DEMO_ORDERS", "1000")))
+            _store = store
+    return _store
+
+
+async def get_store() -> SQLiteOrderStore:
+    """
+    Process-wide store, opened on first use in a worker thread.
+
+    ORDER_DB sets the database file (default: orders.db in this package's
+    directory). A new database is seeded with DEMO_ORDERS (default 1000)
+    synthetic orders, ORD-0000000 to ORD-0000999. Opening and seeding happen
+    off the event loop.
+    """
+    if _store is not None:
+        return _store
+    return await asyncio.to_thread(_open_store)
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def _bench(orders: int, batch: int, lookups: int, path: Optional[str], rtt_ms: float) -> dict:
+    tmp = None
+    if path is None:
+        tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp.name, "orders.db")
+    store = SQLiteOrderStore(path)
+    started = time.perf_counter()
+    if store.count() < orders:
+        store.seed(orders)
+    seed_s = time.perf_counter() - started
+    store.simulated_rtt = rtt_ms / 1000
+
+    rng = random.Random(1)
+    requests = [[order_id_for(rng.randrange(orders)) for _ in range(batch)] for _ in range(lookups)]
+
+    started = time.perf_counter()
+    for ids in requests:
+        for order_id in ids:
+            store.fetch_one(order_id)
+    per_order = (time.perf_counter() - started) / lookups
+
+    started = time.perf_counter()
+    for ids in requests:
+        store.fetch_many(ids)
+    batched = (time.perf_counter() - started) / lookups
+
+    async def concurrent():
+        started = time.perf_counter()
+        await asyncio.gather(*(store.get_many(ids) for ids in requests))
+        return lookups / (time.perf_counter() - started)
+
+    concurrent_throughput = asyncio.run(concurrent())
+    store.close()
+    if tmp is not None:
+        tmp.cleanup()
+    return {
+        "orders": orders,
+        "orders_per_request": batch,
+        "requests": lookups,
+        "simulated_rtt_ms": rtt_ms,
+        "seed_s": round(seed_s, 2),
+        "per_order_queries_ms": round(per_order * 1000, 3),
+        "batched_query_ms": round(batched * 1000, 3),
+        "batched_concurrent_requests_per_s": round(concurrent_throughput, 1),
+        "speedup": round(per_order / batched, 1) if batched else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Order store utilities.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    seed = commands.add_parser("seed", help="Seed a database with synthetic orders")
+    seed.add_argument("path")
+    seed.add_argument("--orders", type=int, default=1_000_000)
+    bench = commands.add_parser("bench", help="Per-order vs batched lookups")
+    bench.add_argument("--orders", type=int, default=1_000_000)
+    bench.add_argument("--batch", type=int, default=10, help="Orders per request")
+    bench.add_argument("--requests", type=int, default=1000)
+    bench.add_argument("--db", help="Reuse this database file (default: temporary)")
+    bench.add_argument("--rtt-ms", type=float, default=0.0, help="Simulated network round trip per query")
+    args = parser.parse_args()
+
+    if args.command == "seed":
+        store = SQLiteOrderStore(args.path)
+        store.seed(args.orders)
+        print(f"{store.count()} orders in {args.path}")
+    else:
+        print(json.dumps(_bench(args.orders, args.batch, args.requests, args.db, args.rtt_ms), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
 import os
+import sys
 import json
 import logging
+from pathlib import Path
 from google.adk.agents import Agent
-from google.adk.tools.openapi_tool.openapi_spec_parser.openapi_toolset import OpenAPIToolset
-from google.adk.tools.openapi_tool.auth.auth_helpers import token_to_scheme_credential
+
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.lazy_agent import lazy_root_agent
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
@@ -25,26 +29,36 @@ GITHUB_SPEC = {
     }
 }
 
-# 2. Get GitHub token from environment
-token = os.environ.get("GITHUB_TOKEN", "")
-
-# 3. Create auth credentials
-auth_scheme, auth_credential = token_to_scheme_credential(
-    "apikey", "header", "Authorization", f"token {token}"
-)
-
-# 4. Initialize Toolset
-toolset = OpenAPIToolset(
-    spec_str=json.dumps(GITHUB_SPEC),
-    spec_str_type="json",
-    auth_scheme=auth_scheme,
-    auth_credential=auth_credential
-)
-
-# 5. Create agent with toolset (ADK handles async internally)
-root_agent = Agent(
-    model="gemini-2.5-flash",
-    name="github_agent",
-    instruction="You are a GitHub assistant. Use the available tools to interact with GitHub.",
-    tools=[toolset],  # Pass the toolset directly
-)
+
+def create_agent() -> Agent:
+    """Parse the OpenAPI spec and build the agent (deferred until first use)."""
+    from google.adk.tools.openapi_tool.openapi_spec_parser.openapi_toolset import OpenAPIToolset
+    from google.adk.tools.openapi_tool.auth.auth_helpers import token_to_scheme_credential
+
+    # 2. Get GitHub token from environment
+    token = os.environ.get("GITHUB_TOKEN", "")
+
+    # 3. Create auth credentials
+    auth_scheme, auth_credential = token_to_scheme_credential(
+        "apikey", "header", "Authorization", f"token {token}"
+    )
+
+    # 4. Initialize Toolset
+    toolset = OpenAPIToolset(
+        spec_str=json.dumps(GITHUB_SPEC),
+        spec_str_type="json",
+        auth_scheme=auth_scheme,
+        auth_credential=auth_credential
+    )
+
+    # 5. Create agent with toolset (ADK handles async internally)
+    return Agent(
+        model="gemini-2.5-flash",
+        name="github_agent",
+        instruction="You are a GitHub assistant. Use the available tools to interact with GitHub.",
+        tools=[toolset],  # Pass the toolset directly
+    )
+
+
+# root_agent is built on first access (adk web, adk run, imports)
+__getattr__ = lazy_root_agent(create_agent)
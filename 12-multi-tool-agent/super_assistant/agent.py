@@ -1,32 +1,57 @@
+import os
+import sys
+from pathlib import Path
+
 from google.adk.agents import Agent
 from google.adk.tools import google_search
 from google.adk.tools.agent_tool import AgentTool
 from google.adk.code_executors import BuiltInCodeExecutor
 
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.concurrent_tools import concurrent_tools
+from common.process_executor import code_execution_from_env
+from common.search_cache import search_model_from_env
+from common.tool_selection import tool_selector_from_env
+
+from .world_clock import local_time, world_clock
 
+
+# Zones and city names are resolved once per process (see world_clock.py)
 def get_local_time(timezone: str) -> dict:
     """
     Returns current time for a given timezone.
     
     Args:
-        timezone (str): The timezone name (e.g., 'America/New_York', 'Asia/Tokyo').
+        timezone (str): The timezone name or a city (e.g., 'America/New_York', 'Asia/Tokyo', 'Paris').
     
     Returns:
         dict: Current time in the specified timezone.
     """
-    from datetime import datetime
-    import pytz
-    try:
-        tz = pytz.timezone(timezone)
-        current_time = datetime.now(tz).strftime("%Y-%m-%d %H:%M:%S")
-        return {"status": "success", "timezone": timezone, "current_time": current_time}
-    except Exception as e:
-        return {"status": "error", "message": f"Invalid timezone: {timezone}"}
+    return local_time(timezone)
+
+
+def get_world_clock(locations: list[str], time: str = "", from_location: str = "UTC") -> dict:
+    """
+    Shows one moment in several timezones at once. Use this instead of calling
+    get_local_time repeatedly when the user asks about more than one place.
+    
+    Args:
+        locations (list[str]): Cities or timezone names (e.g., ['Tokyo', 'New York', 'Europe/Berlin']).
+        time (str): Optional moment to convert, in ISO format (e.g., '2025-03-14T15:00').
+            Leave empty for the current time.
+        from_location (str): City or timezone that `time` is given in (default UTC).
+    
+    Returns:
+        dict: The UTC time and, for each location, its timezone, local time, weekday and UTC offset.
+    """
+    return world_clock(locations, at=time, from_location=from_location)
 
 
 # Create separate agents for built-in tools
 search_agent = Agent(
-    model='gemini-2.5-flash',
+    # Repeated questions are answered from a TTL cache (see common/search_cache.py)
+    model=search_model_from_env('gemini-2.5-flash'),
     name='SearchAgent',
     instruction="You are a specialist in web search. Use Google Search to find information.",
     tools=[google_search],
@@ -36,9 +61,17 @@ code_agent = Agent(
     model='gemini-2.5-flash',
     name='CodeAgent',
     instruction="You are a specialist in code execution. Write and run Python code for calculations.",
-    code_executor=BuiltInCodeExecutor(),
+    # CODE_EXECUTOR=local swaps the built-in executor for an async run_python
+    # tool backed by warm local worker processes
+    **code_execution_from_env(BuiltInCodeExecutor()),
 )
 
+# Seconds before a single tool call (including a sub-agent run) gives up
+TOOL_TIMEOUT = float(os.environ.get("TOOL_TIMEOUT", "60"))
+
+# Three tools are cheap to send every time; set TOOL_TOP_K when adding many more
+tool_selector = tool_selector_from_env(default_top_k=0)
+
 # Create the Multi-Tool Agent using AgentTool
 root_agent = Agent(
     model='gemini-2.5-flash',
@@ -46,9 +79,15 @@ root_agent = Agent(
     instruction="""You are a versatile assistant with access to multiple capabilities:
 - Use SearchAgent for real-time web information (news, weather, facts).
 - Use CodeAgent for complex math, data analysis, or code execution.
-- Use get_local_time for timezone queries.
+- Use get_local_time for the time in one place, and get_world_clock for several places
+  or to convert a meeting time between timezones.
 
-Analyze the user's request and choose the appropriate tool(s).""",
-    tools=[AgentTool(agent=search_agent), AgentTool(agent=code_agent), get_local_time],
+Analyze the user's request and choose the appropriate tool(s).
+When a request has independent parts, call all the tools you need in the same response.""",
+    # Calls from one response run concurrently, each with a timeout
+    tools=concurrent_tools(
+        [AgentTool(agent=search_agent), AgentTool(agent=code_agent), get_local_time, get_world_clock],
+        timeout=TOOL_TIMEOUT,
+    ),
+    before_model_callback=tool_selector,
 )
-
@@ -0,0 +1,190 @@
+"""
+World Clock - Cached timezone resolution and batch time conversion
+
+The original get_local_time imported pytz, resolved the zone and formatted
+one time per call, and the model needed an exact IANA name. A scheduling
+question ("what time is the 3pm London call in Tokyo, NYC, Berlin and
+Sydney?") became one model->tool round trip per city. This module:
+
+- Resolves zone objects once and caches them (zoneinfo, falling back to
+  pytz when the system has no tz database)
+- Maps city names, common abbreviations and near-misses to IANA zones with
+  an index built once per process: exact lookup first, then difflib
+- Converts one instant across any number of zones in a single tool call
+
+The benchmark lives in ../world_clock_bench.py so it can run without
+importing the agent package.
+"""
+
+import difflib
+import functools
+from datetime import datetime, timezone as dt_timezone
+from typing import Optional
+
+try:
+    import zoneinfo
+    _ZONE_NAMES = sorted(zoneinfo.available_timezones())
+except ImportError:  # pragma: no cover - Python < 3.9
+    zoneinfo = None
+    _ZONE_NAMES = []
+
+if not _ZONE_NAMES:
+    # No system tz database (e.g. Windows without tzdata): use pytz's copy
+    import pytz
+    _ZONE_NAMES = list(pytz.all_timezones)
+    zoneinfo = None
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Names people use that are not the last part of an IANA zone
+ALIASES = {
+    "utc": "UTC", "gmt": "UTC", "z": "UTC",
+    "nyc": "America/New_York", "new york city": "America/New_York",
+    "sf": "America/Los_Angeles", "san francisco": "America/Los_Angeles",
+    "la": "America/Los_Angeles", "seattle": "America/Los_Angeles",
+    "silicon valley": "America/Los_Angeles",
+    "boston": "America/New_York", "washington": "America/New_York",
+    "miami": "America/New_York", "atlanta": "America/New_York",
+    "dallas": "America/Chicago", "houston": "America/Chicago", "austin": "America/Chicago",
+    "san diego": "America/Los_Angeles", "washington dc": "America/New_York",
+    "montreal": "America/Toronto",
+    "beijing": "Asia/Shanghai", "shenzhen": "Asia/Shanghai",
+    "mumbai": "Asia/Kolkata", "bombay": "Asia/Kolkata", "delhi": "Asia/Kolkata",
+    "new delhi": "Asia/Kolkata", "bangalore": "Asia/Kolkata", "bengaluru": "Asia/Kolkata",
+    "chennai": "Asia/Kolkata", "hyderabad": "Asia/Kolkata", "india": "Asia/Kolkata",
+    "osaka": "Asia/Tokyo", "japan": "Asia/Tokyo", "kyoto": "Asia/Tokyo",
+    "saigon": "Asia/Ho_Chi_Minh", "ho chi minh city": "Asia/Ho_Chi_Minh",
+    "hcmc": "Asia/Ho_Chi_Minh", "hanoi": "Asia/Bangkok",
+    "guangzhou": "Asia/Shanghai", "calcutta": "Asia/Kolkata", "pune": "Asia/Kolkata",
+    "islamabad": "Asia/Karachi", "lahore": "Asia/Karachi",
+    "cape town": "Africa/Johannesburg", "durban": "Africa/Johannesburg",
+    "pretoria": "Africa/Johannesburg", "abuja": "Africa/Lagos",
+    "marrakech": "Africa/Casablanca", "rabat": "Africa/Casablanca",
+    "ottawa": "America/Toronto", "quebec city": "America/Toronto", "calgary": "America/Edmonton",
+    "las vegas": "America/Los_Angeles", "portland": "America/Los_Angeles",
+    "philadelphia": "America/New_York", "st louis": "America/Chicago",
+    "minneapolis": "America/Chicago", "hawaii": "Pacific/Honolulu", "alaska": "America/Anchorage",
+    "brasilia": "America/Sao_Paulo",
+    "abu dhabi": "Asia/Dubai", "tel aviv": "Asia/Jerusalem",
+    "munich": "Europe/Berlin", "frankfurt": "Europe/Berlin", "hamburg": "Europe/Berlin",
+    "milan": "Europe/Rome", "barcelona": "Europe/Madrid", "geneva": "Europe/Zurich",
+    "edinburgh": "Europe/London", "manchester": "Europe/London", "uk": "Europe/London",
+    "st petersburg": "Europe/Moscow",
+    "melbourne": "Australia/Melbourne", "canberra": "Australia/Sydney",
+    "wellington": "Pacific/Auckland", "rio": "America/Sao_Paulo",
+    "rio de janeiro": "America/Sao_Paulo",
+    # Abbreviations map to the zone that observes them (DST applied by the zone)
+    "est": "America/New_York", "edt": "America/New_York", "et": "America/New_York",
+    "cst": "America/Chicago", "cdt": "America/Chicago", "ct": "America/Chicago",
+    "mst": "America/Denver", "mdt": "America/Denver", "mt": "America/Denver",
+    "pst": "America/Los_Angeles", "pdt": "America/Los_Angeles", "pt": "America/Los_Angeles",
+    "bst": "Europe/London", "cet": "Europe/Paris", "cest": "Europe/Paris",
+    "ist": "Asia/Kolkata", "jst": "Asia/Tokyo", "aest": "Australia/Sydney",
+}
+
+
+def _normalize(name: str) -> str:
+    # "St. Louis" -> "st louis", "Washington, D.C." -> "washington dc"
+    return " ".join(name.lower().replace(".", "").replace("_", " ").replace(",", " ").split())
+
+
+@functools.lru_cache(maxsize=None)
+def _city_index() -> dict[str, str]:
+    """Lowercased lookup keys -> IANA zone, built on first use."""
+    index: dict[str, str] = {}
+    for zone in _ZONE_NAMES:
+        if zone.startswith(("Etc/", "SystemV/")) or "/" not in zone:
+            continue
+        index.setdefault(_normalize(zone), zone)
+        # "America/Argentina/Buenos_Aires" -> "buenos aires"
+        index.setdefault(_normalize(zone.rsplit("/", 1)[1]), zone)
+    for zone in _ZONE_NAMES:
+        index.setdefault(_normalize(zone), zone)
+    index.update(ALIASES)
+    return index
+
+
+@functools.lru_cache(maxsize=1024)
+def get_zone(name: str):
+    """tzinfo for an exact IANA zone name, resolved once (zoneinfo, else pytz)."""
+    if zoneinfo is not None:
+        return zoneinfo.ZoneInfo(name)
+    import pytz
+    return pytz.timezone(name)
+
+
+@functools.lru_cache(maxsize=4096)
+def resolve_zone(location: str) -> Optional[str]:
+    """
+    IANA zone for a zone name, city or abbreviation ("Asia/Tokyo", "tokyo",
+    "New York", "PST", "Sao Paolo"), or None if nothing is close enough.
+    """
+    index = _city_index()
+    key = _normalize(location)
+    if key in index:
+        return index[key]
+    # "Paris, France" -> "paris"
+    for part in (p.strip() for p in location.split(",")):
+        if _normalize(part) in index:
+            return index[_normalize(part)]
+    match = difflib.get_close_matches(key, _sorted_keys(), n=1, cutoff=0.88)
+    return index[match[0]] if match else None
+
+
+@functools.lru_cache(maxsize=1)
+def _sorted_keys() -> list[str]:
+    return sorted(_city_index())
+
+
+def _localize(moment: datetime, zone) -> datetime:
+    """Attach `zone` to a naive datetime (pytz zones need localize())."""
+    if hasattr(zone, "localize"):
+        return zone.localize(moment)
+    return moment.replace(tzinfo=zone)
+
+
+def _clock_entry(location: str, moment: datetime) -> dict:
+    zone_name = resolve_zone(location)
+    if zone_name is None:
+        return {"location": location, "status": "error", "message": f"Unknown location or timezone: {location}"}
+    local = moment.astimezone(get_zone(zone_name))
+    offset = int(local.utcoffset().total_seconds()) // 60
+    hours, minutes = divmod(abs(offset), 60)
+    return {
+        "location": location,
+        "status": "success",
+        "timezone": zone_name,
+        "time": local.strftime(TIME_FORMAT),
+        "weekday": local.strftime("%A"),
+        "utc_offset": f"{'+' if offset >= 0 else '-'}{hours:02d}:{minutes:02d}",
+    }
+
+
+def local_time(timezone: str) -> dict:
+    """Current time in one zone, city or abbreviation."""
+    zone_name = resolve_zone(timezone)
+    if zone_name is None:
+        return {"status": "error", "message": f"Invalid timezone: {timezone}"}
+    current_time = datetime.now(get_zone(zone_name)).strftime(TIME_FORMAT)
+    return {"status": "success", "timezone": zone_name, "current_time": current_time}
+
+
+def world_clock(locations: list[str], at: str = "", from_location: str = "UTC") -> dict:
+    """One instant (now, or `at` in `from_location`) shown in every location."""
+    if at:
+        try:
+            moment = datetime.fromisoformat(at.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return {"status": "error", "message": f"Invalid time {at!r}; use ISO format like 2025-03-14T15:00"}
+        if moment.tzinfo is None:
+            source = resolve_zone(from_location)
+            if source is None:
+                return {"status": "error", "message": f"Unknown location or timezone: {from_location}"}
+            moment = _localize(moment, get_zone(source))
+    else:
+        moment = datetime.now(dt_timezone.utc)
+    return {
+        "status": "success",
+        "utc": moment.astimezone(dt_timezone.utc).strftime(TIME_FORMAT),
+        "clocks": [_clock_entry(location, moment) for location in locations],
+    }
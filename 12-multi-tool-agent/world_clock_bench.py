@@ -0,0 +1,92 @@
+"""
+World Clock Benchmark - Per-zone tool calls vs one batch call
+
+Loads super_assistant/world_clock.py as a plain module, so the agent package
+(and google.adk) is not imported just to time the clock functions.
+
+Usage (from 12-multi-tool-agent/):
+    python world_clock_bench.py bench --zones 8 --rounds 2000
+    python world_clock_bench.py resolve Tokyo "New York" PST "Sao Paolo"
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Import world_clock directly instead of through super_assistant/__init__.py
+sys.path.insert(0, str(Path(__file__).resolve().parent / "super_assistant"))
+import world_clock
+
+
+def _uncached_local_time(timezone: str) -> dict:
+    """The original tool body: import, resolve and format on every call."""
+    from datetime import datetime
+    import pytz
+    try:
+        tz = pytz.timezone(timezone)
+        current_time = datetime.now(tz).strftime(world_clock.TIME_FORMAT)
+        return {"status": "success", "timezone": timezone, "current_time": current_time}
+    except Exception:
+        return {"status": "error", "message": f"Invalid timezone: {timezone}"}
+
+
+def _bench(zones: int, rounds: int, model_rtt_ms: float) -> dict:
+    names = ["America/New_York", "Europe/London", "Asia/Tokyo", "Australia/Sydney", "Europe/Berlin",
+             "Asia/Kolkata", "America/Los_Angeles", "America/Sao_Paulo", "Africa/Johannesburg", "Asia/Dubai"]
+    cities = ["New York", "London", "Tokyo", "Sydney", "Berlin", "Mumbai", "San Francisco", "Sao Paulo",
+              "Johannesburg", "Dubai"]
+    names = (names * (zones // len(names) + 1))[:zones]
+    cities = (cities * (zones // len(cities) + 1))[:zones]
+
+    started = time.perf_counter()
+    world_clock._city_index()
+    index_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for name in names:
+            _uncached_local_time(name)
+    per_zone_calls = (time.perf_counter() - started) / rounds
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        world_clock.world_clock(cities)
+    batch_call = (time.perf_counter() - started) / rounds
+
+    # Each tool call costs a model round trip before the answer can continue
+    rtt = model_rtt_ms / 1000
+    return {
+        "zones_per_message": zones,
+        "city_index_build_ms": round(index_ms, 2),
+        "city_index_keys": len(world_clock._city_index()),
+        "per_zone_tool_calls_ms": round(per_zone_calls * 1000, 3),
+        "batch_tool_call_ms": round(batch_call * 1000, 3),
+        "model_rtt_ms": model_rtt_ms,
+        "per_zone_end_to_end_ms": round((per_zone_calls + zones * rtt) * 1000, 1),
+        "batch_end_to_end_ms": round((batch_call + rtt) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="World clock utilities.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    bench = commands.add_parser("bench", help="Per-zone tool calls vs one batch call")
+    bench.add_argument("--zones", type=int, default=8, help="Zones asked about per message")
+    bench.add_argument("--rounds", type=int, default=2000)
+    bench.add_argument("--model-rtt-ms", type=float, default=600.0,
+                       help="Model round trip per sequential tool call, for the end-to-end estimate")
+    resolve = commands.add_parser("resolve", help="Show the zone chosen for each location")
+    resolve.add_argument("locations", nargs="+")
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        print(json.dumps(_bench(args.zones, args.rounds, args.model_rtt_ms), indent=2))
+    else:
+        for location in args.locations:
+            print(f"{location!r:30} -> {world_clock.resolve_zone(location)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -47,18 +47,28 @@ Connection Types:
 
 import asyncio
 import os
+import sys
+from pathlib import Path
 from google.adk.agents import Agent
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPServerParams
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
-from google.genai import types
 from dotenv import load_dotenv
 
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.chat_client import ChatClient
+from common.mcp_pool import PooledMCPToolset
+from common.tool_selection import tool_selector_from_env
+
 load_dotenv()
 
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN", "")
 
+# "X-MCP-Toolsets: all" exposes dozens of tools; each model call only gets the
+# TOOL_TOP_K (default 8) most relevant to the user's message (TOOL_TOP_K=0: all)
+tool_selector = tool_selector_from_env(default_top_k=8)
+
 
 # ============================================================
 # AGENT WITH GITHUB MCP
@@ -76,8 +86,10 @@ You can:
 - View repository information
 
 When asked about a repo, use your GitHub tools to fetch real data.""",
+    # Sessions are shared process-wide and discovered tools are cached on disk
+    # (MCP_TOOL_CACHE_DIR), so new workers skip the discovery round trip
     tools=[
-        MCPToolset(
+        PooledMCPToolset(
             connection_params=StreamableHTTPServerParams(
                 url="https://api.githubcopilot.com/mcp/",
                 headers={
@@ -88,31 +100,10 @@ When asked about a repo, use your GitHub tools to fetch real data.""",
             ),
         )
     ],
+    before_model_callback=tool_selector,
 )
 
 
-# ============================================================
-# CHAT HELPER
-# ============================================================
-
-async def chat(runner: Runner, user_id: str, session_id: str, message: str) -> str:
-    """Send a message and collect the response."""
-    content = types.Content(role="user", parts=[types.Part(text=message)])
-    
-    response_text = ""
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=content
-    ):
-        if hasattr(event, 'content') and event.content and event.content.parts:
-            for part in event.content.parts:
-                if hasattr(part, 'text') and part.text:
-                    response_text += part.text
-    
-    return response_text
-
-
 # ============================================================
 # DEMO
 # ============================================================
@@ -150,6 +141,7 @@ To run this demo:
         app_name="github_app",
         session_service=session_service,
     )
+    client = ChatClient(runner)
     
     print("=" * 60)
     print("GITHUB MCP DEMO")
@@ -172,8 +164,13 @@ To run this demo:
     for i, query in enumerate(queries, 1):
         print(f"[Query {i}]")
         print(f"User: {query}")
-        response = await chat(runner, user_id, session.id, query)
+        response = await client.chat(user_id, session.id, query)
         print(f"Agent: {response}\n")
+
+    if tool_selector is not None:
+        stats = tool_selector.stats()
+        print(f"Tool declarations sent: {stats['declarations_sent']}/{stats['declarations_available']} "
+              f"(~{stats['declaration_tokens_saved']} prompt tokens saved)\n")
     
     print("=" * 60)
     print("MCP CONCEPTS")
@@ -9,34 +9,49 @@ Prerequisites:
 1. Start MCP Toolbox server: toolbox --tools-file ../tools.yaml --port 5050
 2. Ensure PostgreSQL is running with sample data
 3. Set GOOGLE_API_KEY in .env
+
+The Toolbox connection is opened when root_agent is first used, not at
+import time, so loading this package never waits on the network.
 """
 
 import os
+import sys
+from pathlib import Path
 from google.adk.agents import Agent
-from toolbox_core import ToolboxSyncClient
 from dotenv import load_dotenv
 
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.lazy_agent import lazy_root_agent
+
 load_dotenv()
 
 # Connect to the MCP Toolbox server
 TOOLBOX_URL = os.getenv("TOOLBOX_URL", "http://localhost:5050")
 
-try:
-    toolbox_client = ToolboxSyncClient(TOOLBOX_URL)
-    db_tools = toolbox_client.load_toolset("ecommerce")
-    print(f"Loaded {len(db_tools)} tools from MCP Toolbox")
-except Exception as e:
-    print(f"WARNING: Could not connect to MCP Toolbox at {TOOLBOX_URL}")
-    print(f"Error: {e}")
-    print("Make sure the Toolbox server is running: toolbox --tools-file ../tools.yaml")
-    db_tools = []
 
+def load_db_tools() -> list:
+    """Load the "ecommerce" toolset from the MCP Toolbox server (empty list on failure)."""
+    try:
+        from toolbox_core import ToolboxSyncClient
+
+        toolbox_client = ToolboxSyncClient(TOOLBOX_URL)
+        db_tools = toolbox_client.load_toolset("ecommerce")
+        print(f"Loaded {len(db_tools)} tools from MCP Toolbox")
+        return db_tools
+    except Exception as e:
+        print(f"WARNING: Could not connect to MCP Toolbox at {TOOLBOX_URL}")
+        print(f"Error: {e}")
+        print("Make sure the Toolbox server is running: toolbox --tools-file ../tools.yaml")
+        return []
 
-root_agent = Agent(
-    model="gemini-2.5-flash",
-    name="postgres_data_agent",
-    description="A data analysis agent for PostgreSQL e-commerce database",
-    instruction="""You are a database analyst assistant with access to an e-commerce PostgreSQL database.
+
+def create_agent() -> Agent:
+    return Agent(
+        model="gemini-2.5-flash",
+        name="postgres_data_agent",
+        description="A data analysis agent for PostgreSQL e-commerce database",
+        instruction="""You are a database analyst assistant with access to an e-commerce PostgreSQL database.
 
 You can help users:
 - Query product information and inventory
@@ -45,5 +60,9 @@ You can help users:
 - Search products by category
 
 Use the database tools to fetch real data. Present results clearly.""",
-    tools=db_tools,
-)
+        tools=load_db_tools(),
+    )
+
+
+# root_agent is built on first access (adk web, adk run, imports)
+__getattr__ = lazy_root_agent(create_agent)
@@ -60,17 +60,31 @@ Connection Types Comparison:
 
 import asyncio
 import os
+import sys
+from pathlib import Path
 from google.adk.agents import Agent
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPServerParams
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
-from google.genai import types
 from dotenv import load_dotenv
 
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.chat_client import ChatClient
+from common.mcp_multi import MultiServerMCP, ServerSpec
+from common.mcp_pool import PooledMCPToolset
+from common.tool_selection import tool_selector_from_env
+
 load_dotenv()
 
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN", "")
+FIRECRAWL_API_KEY = os.environ.get("FIRECRAWL_API_KEY", "")
+# Seconds each MCP server gets to connect and list its tools (multi-MCP agent)
+MCP_SERVER_TIMEOUT = float(os.environ.get("MCP_SERVER_TIMEOUT", "15"))
+
+# "X-MCP-Toolsets: all" exposes dozens of tools; each model call only gets the
+# TOOL_TOP_K (default 8) most relevant to the user's message (TOOL_TOP_K=0: all)
+tool_selector = tool_selector_from_env(default_top_k=8)
 
 
 # ============================================================
@@ -89,8 +103,10 @@ When analyzing repositories:
 4. Provide insights and recommendations
 
 Be thorough and cite specific files when relevant.""",
+    # Sessions are shared process-wide and discovered tools are cached on disk
+    # (MCP_TOOL_CACHE_DIR), so new workers skip the discovery round trip
     tools=[
-        MCPToolset(
+        PooledMCPToolset(
             connection_params=StreamableHTTPServerParams(
                 url="https://api.githubcopilot.com/mcp/",
                 headers={
@@ -101,56 +117,99 @@ Be thorough and cite specific files when relevant.""",
             ),
         )
     ],
+    before_model_callback=tool_selector,
 )
 
 
 # ============================================================
-# CHAT HELPER
+# MULTI MCP AGENT (GitHub + Firecrawl)
 # ============================================================
 
-async def chat(runner: Runner, user_id: str, session_id: str, message: str) -> str:
-    """Send a message and collect the response."""
-    content = types.Content(role="user", parts=[types.Part(text=message)])
-    
-    response_text = ""
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=content
-    ):
-        if hasattr(event, 'content') and event.content and event.content.parts:
-            for part in event.content.parts:
-                if hasattr(part, 'text') and part.text:
-                    response_text += part.text
-    
-    return response_text
+def default_servers() -> list[ServerSpec]:
+    """GitHub (HTTP) and Firecrawl (stdio), for whichever credentials are set."""
+    from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams
+    from mcp import StdioServerParameters
+
+    servers = []
+    if GITHUB_TOKEN:
+        servers.append(ServerSpec(
+            "github",
+            StreamableHTTPServerParams(
+                url="https://api.githubcopilot.com/mcp/",
+                headers={
+                    "Authorization": f"Bearer {GITHUB_TOKEN}",
+                    "X-MCP-Toolsets": "all",
+                    "X-MCP-Readonly": "true"
+                },
+            ),
+            timeout=MCP_SERVER_TIMEOUT,
+        ))
+    if FIRECRAWL_API_KEY:
+        servers.append(ServerSpec(
+            "firecrawl",
+            StdioConnectionParams(
+                server_params=StdioServerParameters(
+                    command="npx",
+                    args=["-y", "firecrawl-mcp"],
+                    env={"FIRECRAWL_API_KEY": FIRECRAWL_API_KEY},
+                ),
+                timeout=MCP_SERVER_TIMEOUT,
+            ),
+            timeout=MCP_SERVER_TIMEOUT,
+        ))
+    return servers
+
+
+async def create_multi_mcp_agent(servers: list[ServerSpec] = None):
+    """
+    Research agent over several MCP servers, started concurrently.
+
+    Every server connects and lists its tools at the same time, each with its
+    own timeout (MCP_SERVER_TIMEOUT). A server that fails or times out is left
+    out and reported in manager.metrics(); the agent starts with the rest.
+    The manager has its own session pool and the agent its own tool selector,
+    so neither shares sessions or stats with root_agent.
+
+    Returns:
+        tuple: (Agent, MultiServerMCP). Call `await manager.close()` when done.
+    """
+    manager = MultiServerMCP(servers if servers is not None else default_servers())
+    await manager.start()
+    selector = tool_selector_from_env(default_top_k=8)
+    agent = Agent(
+        model="gemini-2.5-flash",
+        name="multi_mcp_agent",
+        instruction="""You are a research assistant with GitHub and web access.
+
+Use GitHub tools for repository contents, issues and pull requests, and web
+tools (Firecrawl) for documentation, blog posts and tutorials. Combine both
+into one answer and cite the files and pages you used.""",
+        tools=manager.toolsets(),
+        before_model_callback=selector,
+    )
+    return agent, manager
 
 
 # ============================================================
 # DEMO
 # ============================================================
 
+def print_selector_stats(selector) -> None:
+    """One line of ToolSelector savings (nothing when selection is off)."""
+    if selector is None:
+        return
+    stats = selector.stats()
+    print(f"\nTool declarations sent: {stats['declarations_sent']}/{stats['declarations_available']} "
+          f"(~{stats['declaration_tokens_saved']} prompt tokens saved)")
+
+
 async def main():
     """
     Demo: Advanced MCP usage with GitHub.
-    
-    For multi-MCP (GitHub + Firecrawl), you would add:
-    
-    from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams
-    from mcp import StdioServerParameters
-    
-    firecrawl_mcp = MCPToolset(
-        connection_params=StdioConnectionParams(
-            server_params=StdioServerParameters(
-                command="npx",
-                args=["-y", "firecrawl-mcp"],
-                env={"FIRECRAWL_API_KEY": os.environ.get("FIRECRAWL_API_KEY")}
-            ),
-        ),
-    )
-    
-    Then pass both to the agent:
-    tools=[github_mcp, firecrawl_mcp]
+
+    For multi-MCP (GitHub + Firecrawl), set FIRECRAWL_API_KEY as well; the
+    demo then also starts both servers concurrently with
+    create_multi_mcp_agent() and prints per-server startup metrics.
     """
     
     if not GITHUB_TOKEN:
@@ -173,6 +232,7 @@ To run this demo:
         app_name="mcp_app",
         session_service=session_service,
     )
+    client = ChatClient(runner)
     
     print("=" * 60)
     print("MCP DEEP DIVE DEMO")
@@ -192,8 +252,30 @@ To run this demo:
     print(f"\nUser: {query}")
     print("\n(Fetching from GitHub via MCP...)\n")
     
-    response = await chat(runner, user_id, session.id, query)
+    response = await client.chat(user_id, session.id, query)
     print(f"Agent: {response}")
+    print_selector_stats(tool_selector)
+    
+    if FIRECRAWL_API_KEY:
+        print("\n" + "=" * 60)
+        print("MULTI-MCP AGENT (GitHub + Firecrawl)")
+        print("=" * 60)
+        multi_agent, manager = await create_multi_mcp_agent()
+        try:
+            metrics = manager.metrics()
+            print(f"\nStarted {metrics['servers_ok']}/{len(metrics['servers'])} servers in {metrics['startup_s']:.2f}s")
+            for name, server in metrics["servers"].items():
+                detail = f"{server.get('tools', 0)} tools" if server["status"] == "ok" else server.get("error", "")
+                print(f"  {name:10} {server['status']:8} {server.get('startup_s', 0):6.2f}s  {detail}")
+            
+            multi_runner = Runner(agent=multi_agent, app_name="mcp_app", session_service=session_service)
+            query = "Find the google/adk-python README on GitHub and a tutorial about ADK on the web. Compare them."
+            print(f"\nUser: {query}")
+            response = await ChatClient(multi_runner).chat(user_id, session.id, query)
+            print(f"Agent: {response}")
+            print_selector_stats(multi_agent.before_model_callback)
+        finally:
+            await manager.close()
     
     print("\n" + "=" * 60)
     print("ADVANCED MCP PATTERNS")
@@ -208,6 +290,9 @@ To run this demo:
        MCPToolset(slack_params),     # Notifications
    ]
 
+   MultiServerMCP connects to them concurrently, each
+   with its own timeout, and leaves out any that fail.
+
 2. DYNAMIC TOOL DISCOVERY
    MCP tools are discovered at runtime. The agent
    automatically learns what's available.
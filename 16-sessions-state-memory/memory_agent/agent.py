@@ -10,11 +10,16 @@ Blog: https://arjunprabhulal.com/adk-sessions-state/
 """
 
 import asyncio
+import sys
+from pathlib import Path
 from google.adk.agents import Agent
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.adk.tools import ToolContext
-from google.genai import types
+
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.chat_client import ChatClient
 
 
 # ============================================================
@@ -144,24 +149,6 @@ When they ask about their cart, show the contents clearly.""",
 # DEMO: Multi-turn conversation showing Session & State
 # ============================================================
 
-async def chat(runner: Runner, user_id: str, session_id: str, message: str) -> str:
-    """Send a message and get a response."""
-    content = types.Content(role="user", parts=[types.Part(text=message)])
-    
-    response_text = ""
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=content
-    ):
-        if hasattr(event, 'content') and event.content and event.content.parts:
-            for part in event.content.parts:
-                if hasattr(part, 'text') and part.text:
-                    response_text += part.text
-    
-    return response_text
-
-
 async def main():
     """
     Demonstrates Session, State & Memory concepts:
@@ -178,6 +165,7 @@ async def main():
         app_name="shopping_app",
         session_service=session_service,
     )
+    client = ChatClient(runner)
     
     # ========================================
     # DEMO 1: Session - Conversation Memory
@@ -205,7 +193,7 @@ async def main():
     
     for msg in conversations:
         print(f"\nUser: {msg}")
-        response = await chat(runner, user_id, session_id, msg)
+        response = await client.chat(user_id, session_id, msg)
         print(f"Agent: {response}")
     
     # ========================================
@@ -223,7 +211,7 @@ async def main():
     
     for msg in cart_conversations:
         print(f"\nUser: {msg}")
-        response = await chat(runner, user_id, session_id, msg)
+        response = await client.chat(user_id, session_id, msg)
         print(f"Agent: {response}")
     
     # ========================================
@@ -245,7 +233,7 @@ async def main():
     print("-" * 40)
     
     print("\nUser: What's in my cart?")
-    response = await chat(runner, user_id, new_session_id, "What's in my cart?")
+    response = await client.chat(user_id, new_session_id, "What's in my cart?")
     print(f"Agent: {response}")
     print("\n(Cart is empty because it's a new session!)")
     
@@ -267,8 +255,8 @@ async def main():
     print("-" * 40)
     
     print("\nUser: Hi, I'm Bob. Add 5 headphones to my cart.")
-    response = await chat(runner, bob_user_id, bob_session.id, 
-                         "Hi, I'm Bob. Add 5 headphones to my cart.")
+    response = await client.chat(bob_user_id, bob_session.id,
+                                 "Hi, I'm Bob. Add 5 headphones to my cart.")
     print(f"Agent: {response}")
     
     print("\n" + "=" * 60)
@@ -35,11 +35,16 @@ How Context Flows Through ADK:
 """
 
 import asyncio
+import sys
 from datetime import datetime
+from pathlib import Path
 from google.adk.agents import Agent
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
-from google.genai import types
+
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.chat_client import ChatClient
 
 
 # ============================================================
@@ -55,28 +60,6 @@ When asked to recall information, be specific and accurate.""",
 )
 
 
-# ============================================================
-# CHAT HELPER
-# ============================================================
-
-async def chat(runner: Runner, user_id: str, session_id: str, message: str) -> str:
-    """Send a message and collect the response."""
-    content = types.Content(role="user", parts=[types.Part(text=message)])
-    
-    response_text = ""
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=content
-    ):
-        if hasattr(event, 'content') and event.content and event.content.parts:
-            for part in event.content.parts:
-                if hasattr(part, 'text') and part.text:
-                    response_text += part.text
-    
-    return response_text
-
-
 # ============================================================
 # DEMO
 # ============================================================
@@ -96,6 +79,7 @@ async def main():
         app_name="context_app",
         session_service=session_service,
     )
+    client = ChatClient(runner)
     
     print("=" * 60)
     print("CONTEXT MANAGEMENT DEMO")
@@ -129,7 +113,7 @@ async def main():
     for label, msg in turns:
         print(f"\n[{label}]")
         print(f"User: {msg}")
-        response = await chat(runner, user_id, session.id, msg)
+        response = await client.chat(user_id, session.id, msg)
         print(f"Agent: {response}")
     
     # Summary
@@ -78,12 +78,17 @@ Return Value Rule:
 
 import asyncio
 import logging
+import sys
 from datetime import datetime
+from pathlib import Path
 from google.adk.agents import Agent
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
-from google.genai import types
+
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.chat_client import ChatClient
 
 # Setup logging to see callbacks in action
 logging.basicConfig(
@@ -159,28 +164,6 @@ Be concise.""",
 )
 
 
-# ============================================================
-# CHAT HELPER
-# ============================================================
-
-async def chat(runner: Runner, user_id: str, session_id: str, message: str) -> str:
-    """Send a message and collect the response."""
-    content = types.Content(role="user", parts=[types.Part(text=message)])
-    
-    response_text = ""
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=content
-    ):
-        if hasattr(event, 'content') and event.content and event.content.parts:
-            for part in event.content.parts:
-                if hasattr(part, 'text') and part.text:
-                    response_text += part.text
-    
-    return response_text
-
-
 # ============================================================
 # DEMO
 # ============================================================
@@ -196,6 +179,7 @@ async def main():
         app_name="callback_app",
         session_service=session_service,
     )
+    client = ChatClient(runner)
     
     print("=" * 60)
     print("CALLBACKS DEMO")
@@ -221,7 +205,7 @@ async def main():
         print(f"\n[{label}]")
         print(f"User: {msg}")
         print("--- Callbacks firing ---")
-        response = await chat(runner, user_id, session.id, msg)
+        response = await client.chat(user_id, session.id, msg)
         print(f"Agent: {response}")
     
     # Summary
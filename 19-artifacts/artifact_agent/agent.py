@@ -52,6 +52,8 @@ How Artifacts Work:
 
 import asyncio
 import json
+import sys
+from pathlib import Path
 from google.adk.agents import Agent
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
@@ -59,6 +61,10 @@ from google.adk.artifacts import InMemoryArtifactService, GcsArtifactService
 from google.adk.tools import ToolContext
 from google.genai import types
 
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.chat_client import ChatClient
+
 
 # ============================================================
 # ARTIFACT TOOLS
@@ -175,24 +181,6 @@ When saving, confirm the filename so users can retrieve it later.""",
 # DEMO
 # ============================================================
 
-async def chat(runner: Runner, user_id: str, session_id: str, message: str) -> str:
-    """Send a message and get a response."""
-    content = types.Content(role="user", parts=[types.Part(text=message)])
-    
-    response_text = ""
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=content
-    ):
-        if hasattr(event, 'content') and event.content and event.content.parts:
-            for part in event.content.parts:
-                if hasattr(part, 'text') and part.text:
-                    response_text += part.text
-    
-    return response_text
-
-
 async def main():
     """
     Demonstrates Artifact operations:
@@ -211,6 +199,7 @@ async def main():
         session_service=session_service,
         artifact_service=artifact_service,  # Enable artifact storage
     )
+    client = ChatClient(runner)
     
     print("=" * 60)
     print("ARTIFACTS DEMO")
@@ -233,7 +222,7 @@ async def main():
     
     msg1 = "Save a report titled 'Q4 Summary' with content: 'Revenue grew 15% this quarter. Key wins include new enterprise clients.'"
     print(f"\nUser: {msg1}")
-    response1 = await chat(runner, user_id, session.id, msg1)
+    response1 = await client.chat(user_id, session.id, msg1)
     print(f"Agent: {response1}")
     
     # --- DEMO 2: LIST ---
@@ -243,7 +232,7 @@ async def main():
     
     msg2 = "What files have I saved?"
     print(f"\nUser: {msg2}")
-    response2 = await chat(runner, user_id, session.id, msg2)
+    response2 = await client.chat(user_id, session.id, msg2)
     print(f"Agent: {response2}")
     
     # --- DEMO 3: LOAD ---
@@ -253,7 +242,7 @@ async def main():
     
     msg3 = "Get the report from report.json"
     print(f"\nUser: {msg3}")
-    response3 = await chat(runner, user_id, session.id, msg3)
+    response3 = await client.chat(user_id, session.id, msg3)
     print(f"Agent: {response3}")
     
     # --- DEMO 4: SAVE ANOTHER (shows versioning) ---
@@ -263,7 +252,7 @@ async def main():
     
     msg4 = "Save a report titled 'Q4 Summary Updated' with content: 'Revenue grew 15%. Added: Customer retention at 95%.'"
     print(f"\nUser: {msg4}")
-    response4 = await chat(runner, user_id, session.id, msg4)
+    response4 = await client.chat(user_id, session.id, msg4)
     print(f"Agent: {response4}")
     print("\n(Notice: Same filename, new version!)")
     
@@ -356,6 +345,7 @@ Example setup:
         session_service=session_service,
         artifact_service=artifact_service,
     )
+    client = ChatClient(runner)
     
     user_id = "user_gcs_demo"
     session = await session_service.create_session(
@@ -371,21 +361,21 @@ Example setup:
     print("\n[SAVE TO GCS]")
     msg = "Save a report titled 'Cloud Report' with content: 'This report is stored in Google Cloud Storage!'"
     print(f"User: {msg}")
-    response = await chat(runner, user_id, session.id, msg)
+    response = await client.chat(user_id, session.id, msg)
     print(f"Agent: {response}")
     
     # List from GCS
     print("\n[LIST FROM GCS]")
     msg2 = "What files are saved?"
     print(f"User: {msg2}")
-    response2 = await chat(runner, user_id, session.id, msg2)
+    response2 = await client.chat(user_id, session.id, msg2)
     print(f"Agent: {response2}")
     
     # Load from GCS
     print("\n[LOAD FROM GCS]")
     msg3 = "Get the report from report.json"
     print(f"User: {msg3}")
-    response3 = await chat(runner, user_id, session.id, msg3)
+    response3 = await client.chat(user_id, session.id, msg3)
     print(f"Agent: {response3}")
     
     print("\n" + "=" * 60)
@@ -401,8 +391,6 @@ Example setup:
 
 
 if __name__ == "__main__":
-    import sys
-    
     if "--gcs" in sys.argv:
         asyncio.run(demo_gcs())
     else:
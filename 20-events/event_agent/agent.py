@@ -37,18 +37,26 @@ Event Flow:
 """
 
 import asyncio
+import sys
 from datetime import datetime
+from pathlib import Path
 from google.adk.agents import Agent
 from google.adk.events import Event, EventActions
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.tool_cache import cached_tool
+
 
 # ============================================================
 # TOOLS (to trigger tool events)
 # ============================================================
 
+# Pure function: identical expressions always give the same result
+@cached_tool(ttl=3600)
 def calculate(expression: str) -> dict:
     """
     Evaluate a math expression safely.
@@ -94,6 +102,8 @@ def calculate(expression: str) -> dict:
         return {"error": str(e)}
 
 
+# Weather (and the HH:MM timestamp) changes slowly; reuse answers for a minute
+@cached_tool(ttl=60)
 def get_weather(city: str) -> dict:
     """
     Get weather for a city (mock data).
@@ -0,0 +1,6 @@
+"""
+Shared helpers used across the masterclass modules.
+
+Module folders are not importable packages (their names start with digits),
+so scripts that use these helpers add the repository root to sys.path first.
+"""
@@ -0,0 +1,197 @@
+"""
+Chat Client - Shared async helper for talking to a Runner
+
+Replaces the per-module `chat()` helpers:
+- Text is collected into a list and joined once (no quadratic `+=`)
+- Every call can have a deadline; cancelling the caller closes the run cleanly
+- `stream()` yields text deltas as they arrive (works with and without SSE)
+- `fan_out()` sends one message to many (user_id, session_id) pairs concurrently
+
+The default per-call deadline is CHAT_TIMEOUT seconds (env, default 120;
+0 disables it), so a hung model call fails instead of stalling a demo.
+
+Usage:
+    client = ChatClient(runner, timeout=60)
+    reply = await client.chat(user_id, session_id, "Hello!")
+
+    async for delta in client.stream(user_id, session_id, "Tell me a story"):
+        print(delta, end="", flush=True)
+
+    results = await client.fan_out("Hi!", [(user_a, s1), (user_b, s2)], concurrency=8)
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents.run_config import RunConfig
+from google.adk.runners import Runner
+from google.genai import types
+
+_DONE = object()
+_FROM_ENV = object()
+
+# Per-call deadline (seconds) so a hung model call fails instead of stalling the demo
+DEFAULT_TIMEOUT = 120.0
+
+
+def default_timeout() -> Optional[float]:
+    """CHAT_TIMEOUT from the environment (default DEFAULT_TIMEOUT; 0 = no deadline)."""
+    return float(os.environ.get("CHAT_TIMEOUT", DEFAULT_TIMEOUT)) or None
+
+
+@dataclass
+class ChatResult:
+    """Outcome of one conversation in a fan-out."""
+
+    user_id: str
+    session_id: str
+    text: Optional[str] = None
+    error: Optional[BaseException] = None
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ChatClient:
+    """
+    Send messages through a Runner and collect the replies.
+
+    Args:
+        runner (Runner): The runner to drive.
+        timeout (float): Default per-call deadline in seconds (default:
+            CHAT_TIMEOUT env, else DEFAULT_TIMEOUT; None = no deadline).
+        run_config (RunConfig): Default run config, e.g. with StreamingMode.SSE.
+    """
+
+    def __init__(
+        self,
+        runner: Runner,
+        timeout: Optional[float] = _FROM_ENV,
+        run_config: Optional[RunConfig] = None,
+    ):
+        self.runner = runner
+        # Read when the client is built, after the demo has loaded its .env
+        self.timeout = default_timeout() if timeout is _FROM_ENV else timeout
+        self.run_config = run_config
+
+    async def stream(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str,
+        timeout: Optional[float] = None,
+        run_config: Optional[RunConfig] = None,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Yield the reply's text deltas as they arrive.
+
+        With SSE streaming, partial events carry the deltas and the final
+        aggregated event repeats them, so that repeat is skipped.
+
+        Raises:
+            asyncio.TimeoutError: If the whole reply takes longer than `timeout`.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        content = types.Content(role="user", parts=[types.Part(text=message)])
+        deltas = asyncio.Queue()
+
+        async def pump():
+            # Drive the runner in its own task so a deadline or cancellation can
+            # stop it without splitting the generator across tasks
+            streamed = False
+            try:
+                async for event in self.runner.run_async(
+                    user_id=user_id,
+                    session_id=session_id,
+                    new_message=content,
+                    run_config=run_config or self.run_config,
+                ):
+                    if event.partial:
+                        streamed = True
+                    elif streamed:
+                        # Aggregated copy of the partials we already yielded
+                        streamed = False
+                        continue
+                    if event.content and event.content.parts:
+                        for part in event.content.parts:
+                            if part.text:
+                                deltas.put_nowait(part.text)
+                deltas.put_nowait(_DONE)
+            except Exception as e:
+                deltas.put_nowait(e)
+
+        task = asyncio.create_task(pump())
+        try:
+            while True:
+                if deadline is None:
+                    item = await deltas.get()
+                else:
+                    item = await asyncio.wait_for(deltas.get(), max(0.0, deadline - loop.time()))
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Runs on completion, timeout, cancellation and early exit alike
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def chat(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str,
+        timeout: Optional[float] = None,
+        run_config: Optional[RunConfig] = None,
+    ) -> str:
+        """Send a message and return the full reply text."""
+        chunks = []
+        async for delta in self.stream(user_id, session_id, message, timeout, run_config):
+            chunks.append(delta)
+        return "".join(chunks)
+
+    async def fan_out(
+        self,
+        message: str,
+        targets: list,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> list[ChatResult]:
+        """
+        Send one message to many conversations at once.
+
+        Args:
+            message (str): The user message.
+            targets (list): (user_id, session_id) pairs.
+            concurrency (int): Max conversations in flight (None = all at once).
+            timeout (float): Per-conversation deadline in seconds.
+
+        Returns:
+            list[ChatResult]: One result per target, in the same order. Errors
+            and timeouts are captured per target instead of failing the batch.
+        """
+        semaphore = asyncio.Semaphore(concurrency or max(1, len(targets)))
+
+        async def one(user_id: str, session_id: str) -> ChatResult:
+            async with semaphore:
+                started = time.perf_counter()
+                result = ChatResult(user_id=user_id, session_id=session_id)
+                try:
+                    result.text = await self.chat(user_id, session_id, message, timeout)
+                except Exception as e:
+                    result.error = e
+                result.latency = time.perf_counter() - started
+                return result
+
+        return await asyncio.gather(*(one(u, s) for u, s in targets))
@@ -0,0 +1,229 @@
+"""
+Stage Checkpoints - Skip pipeline stages that already ran
+
+A content-addressed store for stage outputs. The key is a hash of
+(agent name, instruction hash, input hash), where the input is the user
+message plus the outputs of the stages before it, plus the session's earlier
+turns for stages that see them (LlmAgent's default include_contents). Rerunning a pipeline with
+the same input replays finished stages from disk instead of calling the model,
+and a run that failed at stage 3 resumes there: stages 1 and 2 are hits.
+
+- CheckpointStore: one JSON file per entry, written atomically, with
+  least-recently-used eviction once the directory exceeds `max_bytes`
+- CheckpointedSequentialAgent: a SequentialAgent that consults the store
+  before each sub-agent and saves each sub-agent's output after it finishes;
+  store reads and writes run in a worker thread, off the event loop
+
+Usage:
+    store = CheckpointStore(".checkpoints", max_bytes=50_000_000)
+    root_agent = CheckpointedSequentialAgent(
+        name="content_pipeline",
+        sub_agents=[researcher, writer, editor],
+        store=store,
+    )
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+from pydantic import Field
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _instruction_text(agent: BaseAgent) -> str:
+    instruction = getattr(agent, "instruction", "")
+    if callable(instruction):
+        # Instruction providers are hashed by identity, not by what they return
+        return f"{instruction.__module__}.{instruction.__qualname__}"
+    return str(instruction)
+
+
+def stage_key(agent: BaseAgent, input_text: str, history: str = "") -> str:
+    """
+    Content address for one stage: hash of (name, instruction hash, input hash).
+
+    `history` is the conversation the stage sees besides its input (see
+    history_text()); it is left out of the hash when empty, so a first turn
+    keys the same as a standalone run of the pipeline.
+    """
+    model = getattr(agent, "model", "")
+    parts = [
+        agent.name,
+        _sha256(_instruction_text(agent) + f"|{model if isinstance(model, str) else model.model}"),
+        _sha256(input_text),
+    ]
+    if history:
+        parts.append(_sha256(history))
+    return _sha256("\0".join(parts))
+
+
+def sees_history(agent: BaseAgent) -> bool:
+    """Whether the stage's model calls include the session's earlier turns."""
+    if isinstance(agent, LlmAgent):
+        return agent.include_contents != "none"
+    # Custom and workflow agents may contain LlmAgents that do
+    return True
+
+
+def history_text(ctx: InvocationContext) -> str:
+    """Serialized contents of the session's events from earlier invocations."""
+    lines = []
+    for event in ctx.session.events:
+        if event.invocation_id == ctx.invocation_id or not event.content:
+            continue
+        lines.append(f"{event.author}\0{event.content.model_dump_json(exclude_none=True)}")
+    return "\n".join(lines)
+
+
+class CheckpointStore:
+    """
+    Local disk backend for stage checkpoints.
+
+    Args:
+        path (str): Directory for the checkpoint files (created if missing).
+        max_bytes (int): Size bound; least recently used entries are evicted
+            once the directory grows past it (0 = unbounded).
+    """
+
+    def __init__(self, path: str = ".checkpoints", max_bytes: int = 100_000_000):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._size = sum(f.stat().st_size for f in self.path.glob("*.json"))
+
+    def _file(self, key: str) -> Path:
+        return self.path / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the saved entry, or None. A hit counts as a use for eviction."""
+        file = self._file(key)
+        try:
+            with open(file, encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        data = json.dumps(entry).encode("utf-8")
+        file = self._file(key)
+        tmp = file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        with self._lock:
+            old_size = file.stat().st_size if file.exists() else 0
+            # Atomic swap: readers see the old entry or the new one, never half a file
+            os.replace(tmp, file)
+            self._size += len(data) - old_size
+            self._evict()
+
+    def _evict(self) -> None:
+        if not self.max_bytes or self._size <= self.max_bytes:
+            return
+        files = sorted(self.path.glob("*.json"), key=lambda f: f.stat().st_mtime)
+        for file in files:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                size = file.stat().st_size
+                file.unlink()
+            except FileNotFoundError:
+                continue
+            self._size -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for file in self.path.glob("*.json"):
+                file.unlink(missing_ok=True)
+            self._size = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(list(self.path.glob("*.json"))),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class CheckpointedSequentialAgent(SequentialAgent):
+    """
+    SequentialAgent that replays finished stages from a CheckpointStore.
+
+    A stage's input is the user message plus the outputs of the stages before
+    it, so changing the message, an earlier stage's output, or the stage's own
+    instruction or model all produce a new key. Stages that see the
+    conversation (include_contents="default") also key on the session's
+    earlier turns, so a message repeated later in a conversation, or in
+    another conversation, is only replayed under the same context. Without a store it behaves
+    like a plain SequentialAgent.
+
+    Attributes:
+        store: Where stage outputs are saved (None = no checkpointing).
+    """
+
+    store: Optional[CheckpointStore] = Field(default=None, exclude=True)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        if self.store is None:
+            async for event in super()._run_async_impl(ctx):
+                yield event
+            return
+
+        user_text = ""
+        if ctx.user_content and ctx.user_content.parts:
+            user_text = "".join(p.text or "" for p in ctx.user_content.parts)
+        upstream = [user_text]
+        history = history_text(ctx)
+
+        for sub_agent in self.sub_agents:
+            key = stage_key(sub_agent, "\0".join(upstream), history if sees_history(sub_agent) else "")
+            entry = await asyncio.to_thread(self.store.get, key)
+
+            if entry is None:
+                texts = []
+                async for event in sub_agent.run_async(ctx):
+                    if event.is_final_response() and event.content and event.content.parts:
+                        texts.extend(p.text for p in event.content.parts if p.text)
+                    yield event
+                entry = {"agent": sub_agent.name, "text": "\n".join(texts), "state_delta": {}}
+                output_key = sub_agent.output_key if isinstance(sub_agent, LlmAgent) else None
+                if output_key and output_key in ctx.session.state:
+                    entry["state_delta"] = {output_key: ctx.session.state[output_key]}
+                # Only reached when the stage finished; a failure propagates and
+                # leaves the earlier stages' checkpoints for the next run
+                await asyncio.to_thread(self.store.put, key, entry)
+            else:
+                yield Event(
+                    invocation_id=ctx.invocation_id,
+                    author=sub_agent.name,
+                    branch=ctx.branch,
+                    content=types.Content(role="model", parts=[types.Part(text=entry["text"])]),
+                    actions=EventActions(state_delta=entry["state_delta"]),
+                    custom_metadata={"checkpoint": key},
+                )
+
+            upstream.append(entry["text"])
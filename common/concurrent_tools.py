@@ -0,0 +1,128 @@
+"""
+Concurrent Tools - Independent tool calls in one model response run side by side
+
+When a model asks for several tools in one response, ADK starts one asyncio
+task per call and merges the responses in call order. That only overlaps
+work that actually awaits:
+
+- A plain `def` tool runs on the event loop thread and blocks every other
+  call (and every other session) until it returns
+- Nothing bounds how long one call may take, so a slow sub-agent holds up
+  the whole turn
+
+`concurrent_tools()` converts an agent's tool list so that:
+
+- Sync function tools run in a shared thread pool
+- AgentTool sub-agent runs (already async) and async tools run as tasks
+- Every call gets a timeout; a call that times out returns an error result
+  instead of failing the turn
+- Responses keep the order of the function calls in the model response
+
+Usage:
+    root_agent = Agent(
+        ...,
+        tools=concurrent_tools([AgentTool(agent=search_agent), get_local_time], timeout=30),
+    )
+
+A sync tool that times out keeps running in its worker thread until it
+returns; only its result is discarded.
+"""
+
+import asyncio
+import functools
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from google.adk.tools import BaseTool, FunctionTool
+from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools.tool_context import ToolContext
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def tool_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by every sync tool (TOOL_THREADS workers, default 8)."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("TOOL_THREADS", "8")), thread_name_prefix="adk-tool"
+        )
+    return _executor
+
+
+def _timeout_result(name: str, timeout: float) -> dict:
+    return {"status": "error", "error_message": f"{name} timed out after {timeout:g}s"}
+
+
+class ThreadedFunctionTool(FunctionTool):
+    """
+    FunctionTool that runs sync functions in the shared thread pool.
+
+    Args:
+        func: The tool function (sync or async).
+        timeout (float): Seconds before the call returns a timeout error (None = no limit).
+    """
+
+    def __init__(self, func, *, timeout: Optional[float] = None, **kwargs):
+        super().__init__(func, **kwargs)
+        self.timeout = timeout
+
+    async def _invoke_callable(self, target, args_to_call: dict[str, Any]) -> Any:
+        if inspect.iscoroutinefunction(target) or inspect.iscoroutinefunction(getattr(target, "__call__", None)):
+            return await target(**args_to_call)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(tool_executor(), functools.partial(target, **args_to_call))
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        if self.timeout is None:
+            return await super().run_async(args=args, tool_context=tool_context)
+        try:
+            return await asyncio.wait_for(
+                super().run_async(args=args, tool_context=tool_context), self.timeout
+            )
+        except asyncio.TimeoutError:
+            return _timeout_result(self.name, self.timeout)
+
+
+class TimeoutAgentTool(AgentTool):
+    """AgentTool whose sub-agent run is cancelled after `timeout` seconds."""
+
+    def __init__(self, agent, *, timeout: Optional[float] = None, **kwargs):
+        super().__init__(agent=agent, **kwargs)
+        self.timeout = timeout
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        if self.timeout is None:
+            return await super().run_async(args=args, tool_context=tool_context)
+        try:
+            return await asyncio.wait_for(
+                super().run_async(args=args, tool_context=tool_context), self.timeout
+            )
+        except asyncio.TimeoutError:
+            return _timeout_result(self.name, self.timeout)
+
+
+def concurrent_tools(tools: list, timeout: Optional[float] = None) -> list:
+    """
+    Convert a tools list for concurrent execution with per-call timeouts.
+
+    Plain functions and FunctionTools become ThreadedFunctionTools, AgentTools
+    become TimeoutAgentTools; any other tool (built-ins, toolsets) is kept.
+    """
+    converted = []
+    for tool in tools:
+        if isinstance(tool, (ThreadedFunctionTool, TimeoutAgentTool)):
+            converted.append(tool)
+        elif isinstance(tool, AgentTool):
+            converted.append(TimeoutAgentTool(
+                tool.agent, skip_summarization=tool.skip_summarization, timeout=timeout
+            ))
+        elif type(tool) is FunctionTool:
+            converted.append(ThreadedFunctionTool(tool.func, timeout=timeout))
+        elif callable(tool) and not isinstance(tool, BaseTool):
+            converted.append(ThreadedFunctionTool(tool, timeout=timeout))
+        else:
+            converted.append(tool)
+    return converted
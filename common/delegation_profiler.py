@@ -0,0 +1,350 @@
+"""
+Delegation Profiler - Where a multi-agent turn spends its time
+
+Instruments every agent in a tree (including agents wrapped in AgentTool) with
+agent, model and tool callbacks, then builds one span tree per turn:
+
+- Agent spans: wall time, self time (minus children), model calls, model
+  time, and the prompt size sent at each model call
+- Hops: `transfer_to_agent` calls and AgentTool calls, with their duration
+- Events: every event in the Runner.run_async stream is attributed to its
+  author, with the time since the previous event
+
+The summary splits wall time into coordination (self time of agents that
+handed work to another agent) and specialist work (everyone else).
+
+Usage:
+    profiler = DelegationProfiler()
+    profiler.instrument(root_agent)
+    async for event in profiler.run_async(runner, user_id=..., session_id=..., new_message=...):
+        ...
+    print(profiler.format_tree())
+    report = profiler.to_json()
+
+CLI (from the repository root):
+    python -m common.delegation_profiler 06-multi-agent-systems/customer_support \\
+        --prompt "Research AI trends and write a summary" --fake --json
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.tools.agent_tool import AgentTool
+
+# Span the currently running code belongs to (per asyncio task)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("delegation_span", default=None)
+
+
+@dataclass
+class Span:
+    """One agent run or tool call inside a turn."""
+
+    name: str
+    kind: str  # "turn", "agent", "tool", "transfer" or "agent_tool"
+    start: float
+    end: Optional[float] = None
+    children: list = field(default_factory=list)
+    model_calls: int = 0
+    model_time: float = 0.0
+    prompt_tokens: list = field(default_factory=list)
+    parent: Optional["Span"] = field(default=None, repr=False)
+    model_started: Optional[float] = field(default=None, repr=False)
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    @property
+    def self_time(self) -> float:
+        return max(0.0, self.duration - sum(c.duration for c in self.children))
+
+    def to_dict(self) -> dict:
+        data = {
+            "name": self.name,
+            "kind": self.kind,
+            "duration_ms": round(self.duration * 1000, 1),
+        }
+        if self.kind in ("turn", "agent"):
+            data["self_ms"] = round(self.self_time * 1000, 1)
+        if self.model_calls:
+            data["model_calls"] = self.model_calls
+            data["model_ms"] = round(self.model_time * 1000, 1)
+            data["prompt_tokens"] = self.prompt_tokens
+        if self.children:
+            data["children"] = [c.to_dict() for c in self.children]
+        return data
+
+
+@dataclass
+class TurnProfile:
+    root: Span
+    events: dict = field(default_factory=dict)
+
+    def walk(self, span: Optional[Span] = None):
+        span = span or self.root
+        yield span
+        for child in span.children:
+            yield from self.walk(child)
+
+    def summary(self) -> dict:
+        spans = list(self.walk())
+        hops = [s for s in spans if s.kind in ("transfer", "agent_tool")]
+        coordination = specialist = 0.0
+        for span in spans:
+            if span.kind != "agent":
+                continue
+            delegates = any(c.kind in ("transfer", "agent_tool", "agent") for c in span.children)
+            if delegates:
+                coordination += span.self_time
+            else:
+                specialist += span.self_time
+        return {
+            "total_ms": round(self.root.duration * 1000, 1),
+            "hops": len(hops),
+            "transfers": sum(1 for s in hops if s.kind == "transfer"),
+            "agent_tool_calls": sum(1 for s in hops if s.kind == "agent_tool"),
+            "model_calls": sum(s.model_calls for s in spans),
+            "coordination_ms": round(coordination * 1000, 1),
+            "specialist_ms": round(specialist * 1000, 1),
+        }
+
+    def to_dict(self) -> dict:
+        return {"summary": self.summary(), "events": self.events, "tree": self.root.to_dict()}
+
+
+def _request_chars(llm_request) -> int:
+    """Rough prompt size: system instruction plus every part of every content."""
+    chars = 0
+    config = getattr(llm_request, "config", None)
+    if config is not None and config.system_instruction:
+        chars += len(str(config.system_instruction))
+    for content in llm_request.contents or []:
+        for part in content.parts or []:
+            if part.text:
+                chars += len(part.text)
+            elif part.function_call:
+                chars += len(json.dumps(part.function_call.args or {}, default=str))
+            elif part.function_response:
+                chars += len(json.dumps(part.function_response.response or {}, default=str))
+    return chars
+
+
+def _prepend(existing, callback):
+    """Run `callback` before any callbacks the agent already has."""
+    if existing is None:
+        return callback
+    if isinstance(existing, list):
+        return [callback] + existing
+    return [callback, existing]
+
+
+class DelegationProfiler:
+    """
+    Per-turn span trees for multi-agent runs.
+
+    Args:
+        keep_turns (int): Number of recent turns kept for reports.
+    """
+
+    def __init__(self, keep_turns: int = 100):
+        self.keep_turns = keep_turns
+        self.turns: list[TurnProfile] = []
+        self._instrumented: set[int] = set()
+
+    # ------------------------------------------------------------------
+    # Callbacks
+    # ------------------------------------------------------------------
+
+    def _start(self, name: str, kind: str) -> Span:
+        parent = _current_span.get()
+        span = Span(name=name, kind=kind, start=time.perf_counter(), parent=parent)
+        if parent is not None:
+            parent.children.append(span)
+        _current_span.set(span)
+        return span
+
+    def _finish(self, name: str, kinds: tuple) -> None:
+        span = _current_span.get()
+        # Unwind to the matching span in case an inner callback never fired
+        while span is not None and not (span.name == name and span.kind in kinds):
+            span = span.parent
+        if span is None:
+            return
+        span.end = time.perf_counter()
+        _current_span.set(span.parent)
+
+    def _before_agent(self, callback_context):
+        self._start(callback_context.agent_name, "agent")
+        return None
+
+    def _after_agent(self, callback_context):
+        self._finish(callback_context.agent_name, ("agent",))
+        return None
+
+    def _before_model(self, callback_context, llm_request):
+        span = _current_span.get()
+        if span is not None:
+            span.model_calls += 1
+            span.prompt_tokens.append(_request_chars(llm_request) // 4)
+            span.model_started = time.perf_counter()
+        return None
+
+    def _after_model(self, callback_context, llm_response):
+        span = _current_span.get()
+        if span is None or llm_response.partial or span.model_started is None:
+            return None
+        span.model_time += time.perf_counter() - span.model_started
+        span.model_started = None
+        usage = llm_response.usage_metadata
+        if usage is not None and usage.prompt_token_count and span.prompt_tokens:
+            # Prefer the model's own count over the estimate
+            span.prompt_tokens[-1] = usage.prompt_token_count
+        return None
+
+    def _before_tool(self, tool, args, tool_context):
+        if tool.name == "transfer_to_agent":
+            self._start(f"transfer -> {args.get('agent_name')}", "transfer")
+        elif isinstance(tool, AgentTool):
+            self._start(tool.name, "agent_tool")
+        else:
+            self._start(tool.name, "tool")
+        return None
+
+    def _after_tool(self, tool, args, tool_context, tool_response):
+        if tool.name == "transfer_to_agent":
+            self._finish(f"transfer -> {args.get('agent_name')}", ("transfer",))
+        else:
+            self._finish(tool.name, ("agent_tool", "tool"))
+        return None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def instrument(self, agent: BaseAgent) -> None:
+        """Add profiling callbacks to `agent`, its sub-agents and AgentTool agents."""
+        if id(agent) in self._instrumented:
+            return
+        self._instrumented.add(id(agent))
+        agent.before_agent_callback = _prepend(agent.before_agent_callback, self._before_agent)
+        agent.after_agent_callback = _prepend(agent.after_agent_callback, self._after_agent)
+        if isinstance(agent, LlmAgent):
+            agent.before_model_callback = _prepend(agent.before_model_callback, self._before_model)
+            agent.after_model_callback = _prepend(agent.after_model_callback, self._after_model)
+            agent.before_tool_callback = _prepend(agent.before_tool_callback, self._before_tool)
+            agent.after_tool_callback = _prepend(agent.after_tool_callback, self._after_tool)
+            for tool in agent.tools:
+                if isinstance(tool, AgentTool):
+                    self.instrument(tool.agent)
+        for sub_agent in agent.sub_agents:
+            self.instrument(sub_agent)
+
+    async def run_async(self, runner, **run_kwargs):
+        """Drive `runner.run_async(**run_kwargs)`, yielding events unchanged."""
+        root = Span(name="turn", kind="turn", start=time.perf_counter())
+        turn = TurnProfile(root=root)
+        token = _current_span.set(root)
+        last = root.start
+        try:
+            async for event in runner.run_async(**run_kwargs):
+                now = time.perf_counter()
+                stats = turn.events.setdefault(event.author, {"events": 0, "gap_ms": 0.0})
+                stats["events"] += 1
+                stats["gap_ms"] = round(stats["gap_ms"] + (now - last) * 1000, 1)
+                last = now
+                yield event
+        finally:
+            _current_span.reset(token)
+            root.end = time.perf_counter()
+            for span in turn.walk():
+                if span.end is None:
+                    span.end = root.end
+            self.turns.append(turn)
+            del self.turns[:-self.keep_turns]
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps([t.to_dict() for t in self.turns], indent=indent)
+
+    def format_tree(self, turn: Optional[TurnProfile] = None) -> str:
+        """Text tree of one turn (default: the latest)."""
+        turn = turn or self.turns[-1]
+        s = turn.summary()
+        lines = [
+            f"turn {s['total_ms']} ms | hops {s['hops']} (transfers {s['transfers']}, "
+            f"agent tools {s['agent_tool_calls']}) | model calls {s['model_calls']} | "
+            f"coordination {s['coordination_ms']} ms, specialists {s['specialist_ms']} ms"
+        ]
+
+        def render(span: Span, prefix: str, last: bool):
+            branch = "└─ " if last else "├─ "
+            detail = f"{span.duration * 1000:.1f} ms"
+            if span.kind == "agent":
+                detail += f" (self {span.self_time * 1000:.1f} ms)"
+            if span.model_calls:
+                detail += (
+                    f" | model x{span.model_calls} {span.model_time * 1000:.1f} ms"
+                    f" | prompt tokens {span.prompt_tokens}"
+                )
+            label = span.name if span.kind in ("agent", "transfer") else f"{span.kind}:{span.name}"
+            lines.append(f"{prefix}{branch}{label}  {detail}")
+            for i, child in enumerate(span.children):
+                render(child, prefix + ("   " if last else "│  "), i == len(span.children) - 1)
+
+        for i, child in enumerate(turn.root.children):
+            render(child, "", i == len(turn.root.children) - 1)
+        events = ", ".join(f"{a} {v['events']}" for a, v in turn.events.items())
+        lines.append(f"events: {events}")
+        return "\n".join(lines)
+
+
+async def _profile(package: str, prompts: list[str], fake: bool, latency: float):
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types
+
+    from common.load_test import load_root_agent
+
+    agent = load_root_agent(package)
+    if fake:
+        from common.fake_llm import FakeLlm, use_fake_model
+        use_fake_model(agent, FakeLlm(first_chunk_latency=latency))
+
+    profiler = DelegationProfiler()
+    profiler.instrument(agent)
+    runner = Runner(app_name="profiler", agent=agent, session_service=InMemorySessionService())
+    session = await runner.session_service.create_session(app_name="profiler", user_id="user")
+    for prompt in prompts:
+        async for _ in profiler.run_async(
+            runner,
+            user_id="user",
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text=prompt)]),
+        ):
+            pass
+    return profiler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-turn delegation profile for an agent package.")
+    parser.add_argument("package", help="Agent package path, e.g. 12-multi-tool-agent/super_assistant")
+    parser.add_argument("--prompt", action="append", required=True, help="User message (repeatable)")
+    parser.add_argument("--fake", action="store_true", help="Use the offline fake model")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake model latency in seconds")
+    parser.add_argument("--json", action="store_true", help="Print the JSON report")
+    args = parser.parse_args()
+
+    profiler = asyncio.run(_profile(args.package, args.prompt, args.fake, args.latency))
+    if args.json:
+        print(profiler.to_json())
+    else:
+        print("\n\n".join(profiler.format_tree(t) for t in profiler.turns))
+
+
+if __name__ == "__main__":
+    main()
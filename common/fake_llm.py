@@ -0,0 +1,260 @@
+"""
+Fake LLM - Deterministic Offline Model for Load Testing
+
+A scriptable BaseLlm that never touches the network. It replays canned
+text, function calls and streamed partial chunks with configurable
+artificial latency, so you can benchmark Runner, tool and callback
+overhead of any module's root_agent on a machine with no network.
+
+How a response is chosen:
+1. If the last message is a tool result, reply with `after_tool_text`.
+2. Otherwise the latest user text is matched against `rules` in order.
+   A rule fires only if every tool it calls is available to the agent.
+3. If nothing matches, reply with `default_text`.
+
+Usage:
+    from common.fake_llm import FakeLlm, use_fake_model
+
+    use_fake_model(root_agent, FakeLlm(first_chunk_latency=0.2, chunk_latency=0.02))
+
+    # Or register the "fake-*" model names and use them as a string:
+    register_fake_llm()
+    Agent(model="fake-llm", ...)
+"""
+
+import asyncio
+import json
+import re
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, Callable, Optional, Union
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.models import BaseLlm, LLMRegistry
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from pydantic import Field
+
+
+@dataclass
+class FakeCall:
+    """
+    A function call the fake model emits.
+
+    `args` is either a dict whose string values are formatted with the rule's
+    named regex groups (e.g. {"order_id": "{order_id}"}), or a callable that
+    receives the regex match and returns the args dict.
+    """
+
+    name: str
+    args: Union[dict, Callable[[re.Match], dict]] = field(default_factory=dict)
+
+    def build_args(self, match: re.Match) -> dict:
+        if callable(self.args):
+            return self.args(match)
+        groups = {k: v for k, v in match.groupdict().items() if v is not None}
+        return {
+            key: value.format(**groups) if isinstance(value, str) else value
+            for key, value in self.args.items()
+        }
+
+
+@dataclass
+class FakeRule:
+    """Reply with `text` and/or `calls` when `pattern` matches the user message."""
+
+    pattern: str
+    text: Optional[str] = None
+    calls: list = field(default_factory=list)
+
+    def __post_init__(self):
+        self.regex = re.compile(self.pattern, re.IGNORECASE)
+
+
+# Rules covering the tools used across the modules. A rule is skipped when
+# the agent doesn't have the tool, so one list works for every root_agent.
+DEFAULT_RULES = [
+    FakeRule(r"order\s+#?(?P<order_id>[\w-]+)",
+             calls=[FakeCall("get_order_status", {"order_id": "{order_id}"})]),
+    FakeRule(r"add\s+(?P<quantity>\d+)\s+(?P<item>\w+)",
+             calls=[FakeCall("add_to_cart", lambda m: {
+                 "item": m["item"], "quantity": int(m["quantity"])})]),
+    FakeRule(r"what'?s in my cart|show (?:me )?my cart", calls=[FakeCall("get_cart")]),
+    FakeRule(r"(?P<expression>\d+(?:\s*[-+*/^]\s*\d+)+)",
+             calls=[FakeCall("calculate", lambda m: {
+                 "expression": m["expression"].replace("^", "**")})]),
+    FakeRule(r"weather in (?P<city>[A-Za-z ]+?)\??$",
+             calls=[FakeCall("get_weather", {"city": "{city}"})]),
+    FakeRule(r"time in (?P<timezone>\w+/\w+)",
+             calls=[FakeCall("get_local_time", {"timezone": "{timezone}"})]),
+    FakeRule(r"what time is it", calls=[FakeCall("get_time")]),
+]
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token estimate (about 4 characters per token)."""
+    return max(1, len(text) // 4) if text else 0
+
+
+class FakeLlm(BaseLlm):
+    """
+    Deterministic local model for offline load tests.
+
+    Attributes:
+        rules: Ordered FakeRules matched against the latest user message.
+        default_text: Reply when no rule matches.
+        after_tool_text: Reply after tool results; {results} is replaced with
+            the JSON of the tool responses.
+        first_chunk_latency: Seconds before the first chunk (simulated TTFT).
+        chunk_latency: Seconds between streamed chunks.
+        chunk_words: Words per streamed partial chunk.
+    """
+
+    model: str = "fake-llm"
+    rules: list = Field(default_factory=lambda: list(DEFAULT_RULES))
+    default_text: str = "This is a canned response from the fake model."
+    after_tool_text: str = "Here is what I found: {results}"
+    first_chunk_latency: float = 0.0
+    chunk_latency: float = 0.0
+    chunk_words: int = 4
+    call_count: int = 0
+
+    @classmethod
+    def supported_models(cls) -> list[str]:
+        return [r"fake-.*"]
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.call_count += 1
+        text, calls = self._plan(llm_request)
+        usage = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=_estimate_tokens(_request_text(llm_request)),
+            candidates_token_count=_estimate_tokens(text or ""),
+        )
+
+        if self.first_chunk_latency:
+            await asyncio.sleep(self.first_chunk_latency)
+
+        if calls:
+            parts = [types.Part(text=text)] if text else []
+            parts += [types.Part(function_call=call) for call in calls]
+            yield LlmResponse(
+                content=types.Content(role="model", parts=parts),
+                usage_metadata=usage,
+                turn_complete=True,
+            )
+            return
+
+        if stream:
+            words = text.split(" ")
+            for i in range(0, len(words), self.chunk_words):
+                if i and self.chunk_latency:
+                    await asyncio.sleep(self.chunk_latency)
+                chunk = " ".join(words[i:i + self.chunk_words])
+                if i + self.chunk_words < len(words):
+                    chunk += " "
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text=chunk)]),
+                    partial=True,
+                )
+        elif self.chunk_latency:
+            # Non-streaming calls still pay for generating every chunk
+            chunks = -(-len(text.split(" ")) // self.chunk_words)
+            await asyncio.sleep(self.chunk_latency * max(0, chunks - 1))
+
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            usage_metadata=usage,
+            turn_complete=True,
+        )
+
+    def _plan(self, llm_request: LlmRequest) -> tuple:
+        """Decide the (text, function_calls) for this request."""
+        last = llm_request.contents[-1] if llm_request.contents else None
+        if last and last.parts and any(p.function_response for p in last.parts):
+            results = {
+                p.function_response.name: p.function_response.response
+                for p in last.parts if p.function_response
+            }
+            return self.after_tool_text.replace(
+                "{results}", json.dumps(results, default=str)), []
+
+        user_text = _latest_user_text(llm_request)
+        available = set(llm_request.tools_dict)
+        for rule in self.rules:
+            match = rule.regex.search(user_text)
+            if not match or any(call.name not in available for call in rule.calls):
+                continue
+            calls = [
+                types.FunctionCall(name=call.name, args=call.build_args(match))
+                for call in rule.calls
+            ]
+            return rule.text, calls
+        return self.default_text, []
+
+
+def _latest_user_text(llm_request: LlmRequest) -> str:
+    for content in reversed(llm_request.contents):
+        if content.role == "user" and content.parts:
+            text = "".join(p.text for p in content.parts if p.text)
+            if text:
+                return text
+    return ""
+
+
+def _request_text(llm_request: LlmRequest) -> str:
+    """All text the model would see: instruction, history and tool declarations."""
+    pieces = []
+    config = llm_request.config
+    if config and config.system_instruction:
+        pieces.append(str(config.system_instruction))
+    for content in llm_request.contents:
+        for part in content.parts or []:
+            if part.text:
+                pieces.append(part.text)
+            elif part.function_call:
+                pieces.append(json.dumps(part.function_call.args or {}, default=str))
+            elif part.function_response:
+                pieces.append(json.dumps(part.function_response.response or {}, default=str))
+    for tool in (config.tools if config and config.tools else []):
+        for decl in getattr(tool, "function_declarations", None) or []:
+            pieces.append(decl.model_dump_json(exclude_none=True))
+    return "\n".join(pieces)
+
+
+def register_fake_llm() -> None:
+    """Make `model="fake-..."` strings resolve to FakeLlm."""
+    LLMRegistry.register(FakeLlm)
+
+
+def use_fake_model(agent: BaseAgent, llm: Optional[FakeLlm] = None) -> FakeLlm:
+    """
+    Swap the model of every LlmAgent in an agent tree for a FakeLlm.
+
+    Agents wrapped in AgentTool are included, since they run their own model calls.
+
+    Args:
+        agent (BaseAgent): The root agent (e.g. a module's root_agent).
+        llm (FakeLlm): The fake model to use. A default one is created if omitted.
+
+    Returns:
+        FakeLlm: The model now used by every LlmAgent in the tree.
+    """
+    llm = llm or FakeLlm()
+    seen = set()
+
+    def visit(node: BaseAgent):
+        if id(node) in seen:
+            return
+        seen.add(id(node))
+        if isinstance(node, LlmAgent):
+            node.model = llm
+            for tool in node.tools:
+                if hasattr(tool, "agent") and isinstance(tool.agent, BaseAgent):
+                    visit(tool.agent)
+        for sub_agent in node.sub_agents:
+            visit(sub_agent)
+
+    visit(agent)
+    return llm
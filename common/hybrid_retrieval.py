@@ -0,0 +1,332 @@
+"""
+Hybrid Retrieval - BM25 + vector search with rank fusion and MMR
+
+Vector search alone misses exact identifiers (error codes, SKUs, ticket
+numbers), since embeddings blur them, and it happily returns several
+near-identical chunks. This module runs a keyword search next to the vector
+search on a LocalVectorIndex and sends fewer, better chunks to the model:
+
+1. BM25 over an in-process inverted index of the same chunks; identifiers
+   like "ERR-4021" are indexed whole as well as split into parts
+2. Vector top-N from the LocalVectorIndex (within the distance threshold)
+3. Reciprocal rank fusion (RRF) of the two rankings, which needs no score
+   calibration between BM25 and cosine
+4. MMR (maximal marginal relevance) over the fused candidates, dropping
+   near-duplicates, down to `similarity_top_k` chunks
+
+The BM25 index is built from `chunks.jsonl` when the tool is created, in one
+streaming pass; postings are NumPy arrays.
+
+Usage:
+    tool = HybridRagRetrieval(
+        name="retrieve_documents",
+        description="Retrieve relevant documents from the knowledge base",
+        index_path="rag_index",
+        similarity_top_k=4,
+    )
+
+    retriever = HybridRetriever(LocalVectorIndex("rag_index"))
+    for hit in retriever.search("What does ERR-4021 mean?", top_k=4):
+        print(hit["rrf"], hit.get("distance"), hit.get("bm25"), hit["text"][:80])
+"""
+
+import asyncio
+import json
+import math
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Optional
+
+import numpy as np
+from google.adk.tools.retrieval.base_retrieval_tool import BaseRetrievalTool
+from google.adk.tools.tool_context import ToolContext
+
+from .vector_index import CHUNKS_FILE, IndexSnapshot, LocalVectorIndex
+
+# Words and identifiers: "err-4021", "sku_88.1", "v2"
+_TERM = re.compile(r"[a-z0-9]+(?:[-_./:#][a-z0-9]+)*")
+_SPLIT = re.compile(r"[-_./:#]")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase terms; compound identifiers also contribute their parts."""
+    terms = []
+    for term in _TERM.findall(text.lower()):
+        terms.append(term)
+        parts = _SPLIT.split(term)
+        if len(parts) > 1:
+            terms.extend(p for p in parts if p)
+    return terms
+
+
+# ============================================================================
+# BM25
+# ============================================================================
+
+class BM25Index:
+    """
+    Okapi BM25 over a fixed list of documents (rows).
+
+    Args:
+        k1 (float): Term-frequency saturation.
+        b (float): Length normalization (0 = none, 1 = full).
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.count = 0
+        self.doc_lengths = np.zeros(0, dtype=np.float32)
+        self.avg_length = 0.0
+        self._postings: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    def fit(self, texts) -> "BM25Index":
+        """Index an iterable of texts; row numbers follow iteration order."""
+        rows: dict[str, list[int]] = defaultdict(list)
+        freqs: dict[str, list[int]] = defaultdict(list)
+        lengths = []
+        for row, text in enumerate(texts):
+            terms = tokenize(text)
+            lengths.append(len(terms))
+            counts: dict[str, int] = defaultdict(int)
+            for term in terms:
+                counts[term] += 1
+            for term, tf in counts.items():
+                rows[term].append(row)
+                freqs[term].append(tf)
+        self.count = len(lengths)
+        self.doc_lengths = np.asarray(lengths, dtype=np.float32)
+        self.avg_length = float(self.doc_lengths.mean()) if self.count else 0.0
+        self._postings = {
+            term: (np.asarray(rows[term], dtype=np.int32), np.asarray(freqs[term], dtype=np.float32))
+            for term in rows
+        }
+        return self
+
+    @classmethod
+    def from_index(cls, index, **kwargs) -> "BM25Index":
+        """BM25 over a LocalVectorIndex's (or IndexSnapshot's) chunks, streamed from its sidecar."""
+        def texts():
+            with open(index.path / CHUNKS_FILE, "rb") as f:
+                for line in f:
+                    yield json.loads(line)["text"]
+        return cls(**kwargs).fit(texts())
+
+    def rows_with(self, term: str) -> np.ndarray:
+        """Rows containing `term` (already tokenized/normalized like the documents)."""
+        posting = self._postings.get(term)
+        return posting[0] if posting is not None else np.zeros(0, dtype=np.int32)
+
+    def search(self, query: str, top_k: int = 50) -> list[tuple[int, float]]:
+        """(row, score) pairs, best first; only rows sharing a term with the query."""
+        matched_rows, matched_scores = [], []
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            rows, tf = posting
+            idf = math.log(1 + (self.count - len(rows) + 0.5) / (len(rows) + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[rows] / self.avg_length)
+            matched_rows.append(rows)
+            matched_scores.append(idf * tf * (self.k1 + 1) / (tf + norm))
+        if not matched_rows:
+            return []
+        # Sum per row over only the matched postings (no corpus-sized array)
+        unique, inverse = np.unique(np.concatenate(matched_rows), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(matched_scores))
+        top = np.argsort(-scores)[:top_k]
+        return [(int(unique[i]), float(scores[i])) for i in top]
+
+
+# ============================================================================
+# FUSION AND DIVERSITY
+# ============================================================================
+
+def reciprocal_rank_fusion(rankings: list[list[int]], k: int = 60) -> dict[int, float]:
+    """RRF score per row: sum over rankings of 1 / (k + rank), rank from 1."""
+    scores: dict[int, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, row in enumerate(ranking, start=1):
+            scores[row] += 1.0 / (k + rank)
+    return dict(scores)
+
+
+def mmr_select(
+    candidates: list[int],
+    relevance: dict[int, float],
+    vectors: np.ndarray,
+    top_k: int,
+    diversity: float = 0.3,
+    duplicate_similarity: float = 0.95,
+) -> list[int]:
+    """
+    Maximal marginal relevance over `candidates`.
+
+    Args:
+        candidates (list[int]): Rows, best first.
+        relevance (dict): Row -> relevance score (any scale).
+        vectors (np.ndarray): Unit vectors, one per candidate, in the same order.
+        top_k (int): Rows to select.
+        diversity (float): 0 = pure relevance, 1 = pure novelty.
+        duplicate_similarity (float): Candidates at least this cosine-similar
+            to an already selected row are dropped outright.
+    """
+    if not candidates:
+        return []
+    top = max(relevance[row] for row in candidates) or 1.0
+    rel = np.asarray([relevance[row] / top for row in candidates], dtype=np.float32)
+    sims = vectors @ vectors.T
+    selected: list[int] = []
+    max_sim = np.full(len(candidates), -1.0, dtype=np.float32)
+    available = np.ones(len(candidates), dtype=bool)
+    while len(selected) < top_k and available.any():
+        scores = (1 - diversity) * rel - diversity * np.maximum(max_sim, 0.0)
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        max_sim = np.maximum(max_sim, sims[best])
+        available &= max_sim < duplicate_similarity
+    return [candidates[i] for i in selected]
+
+
+# ============================================================================
+# RETRIEVER AND TOOL
+# ============================================================================
+
+class HybridRetriever:
+    """
+    BM25 + vector retrieval over one LocalVectorIndex.
+
+    Args:
+        index (LocalVectorIndex): Vector index (also the source of chunk texts).
+        bm25 (BM25Index): Keyword index over the same rows (built if omitted,
+            and rebuilt whenever the index picks up a new version).
+        candidates (int): Rows taken from each ranking before fusion.
+        rrf_k (int): RRF constant; higher flattens the rank weighting.
+        diversity (float): MMR trade-off, see mmr_select().
+        duplicate_similarity (float): Near-duplicate cutoff, see mmr_select().
+    """
+
+    def __init__(
+        self,
+        index: LocalVectorIndex,
+        bm25: Optional[BM25Index] = None,
+        candidates: int = 30,
+        rrf_k: int = 60,
+        diversity: float = 0.3,
+        duplicate_similarity: float = 0.95,
+    ):
+        self.index = index
+        self.bm25 = bm25 or BM25Index.from_index(index)
+        # Keyword index per version; the previous one serves searches still on the old snapshot
+        self._bm25_by_version = OrderedDict([(index.version, self.bm25)])
+        self._bm25_lock = threading.Lock()
+        self.candidates = candidates
+        self.rrf_k = rrf_k
+        self.diversity = diversity
+        self.duplicate_similarity = duplicate_similarity
+
+    def _bm25_for(self, index: IndexSnapshot) -> BM25Index:
+        """The keyword index for `index`'s version, rebuilt once after a new publish."""
+        with self._bm25_lock:
+            bm25 = self._bm25_by_version.get(index.version)
+            if bm25 is None:
+                bm25 = self.bm25 = BM25Index.from_index(index)
+                self._bm25_by_version[index.version] = bm25
+                while len(self._bm25_by_version) > 2:
+                    self._bm25_by_version.popitem(last=False)
+            return bm25
+
+    def search(
+        self,
+        text: str,
+        top_k: int = 4,
+        max_distance: Optional[float] = None,
+        nprobe: int = 8,
+        query_vector: Optional[np.ndarray] = None,
+    ) -> list[dict]:
+        """
+        Chunks for `text`, best first.
+
+        `max_distance` filters only the vector ranking: a chunk that matches
+        the query's exact terms is kept even if its embedding is far away.
+        Each hit has "rrf", plus "distance" and/or "bm25" from the rankings
+        that found it.
+        """
+        # One snapshot for every step, so rows from both rankings refer to the same version
+        index = self.index.snapshot()
+        bm25 = self._bm25_for(index)
+        query = index.embedder.embed([text])[0] if query_vector is None else query_vector
+        vector_hits = index.search_vector(query, self.candidates, max_distance, nprobe)
+        keyword_hits = bm25.search(text, self.candidates)
+        fused = reciprocal_rank_fusion(
+            [[row for row, _ in vector_hits], [row for row, _ in keyword_hits]], self.rrf_k
+        )
+        candidates = sorted(fused, key=fused.get, reverse=True)
+        vectors = np.asarray(index.vectors[np.asarray(candidates, dtype=np.int64)]) if candidates else None
+        chosen = mmr_select(
+            candidates, fused, vectors, top_k, self.diversity, self.duplicate_similarity
+        )
+
+        distances = dict(vector_hits)
+        bm25_scores = dict(keyword_hits)
+        hits = []
+        for row in chosen:
+            hit = {**index.chunk(row), "rrf": round(fused[row], 5)}
+            if row in distances:
+                hit["distance"] = round(distances[row], 4)
+            if row in bm25_scores:
+                hit["bm25"] = round(bm25_scores[row], 3)
+            hits.append(hit)
+        return hits
+
+
+class HybridRagRetrieval(BaseRetrievalTool):
+    """
+    Drop-in for VertexAiRagRetrieval / LocalRagRetrieval with hybrid ranking.
+
+    Args:
+        name (str): Tool name shown to the model.
+        description (str): Tool description shown to the model.
+        index_path (str): Index directory (or pass `retriever`).
+        retriever (HybridRetriever): An already built retriever.
+        similarity_top_k (int): Max chunks returned after MMR (default 4).
+        vector_distance_threshold (float): Max cosine distance for the vector
+            ranking (None = no threshold).
+        nprobe (int): IVF clusters scanned per query (IVF indexes only).
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        description: str,
+        index_path: Optional[str] = None,
+        retriever: Optional[HybridRetriever] = None,
+        similarity_top_k: Optional[int] = None,
+        vector_distance_threshold: Optional[float] = None,
+        nprobe: int = 8,
+    ):
+        super().__init__(name=name, description=description)
+        self.retriever = retriever or HybridRetriever(LocalVectorIndex(index_path))
+        self.similarity_top_k = similarity_top_k or 4
+        self.vector_distance_threshold = vector_distance_threshold
+        self.nprobe = nprobe
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        results = await asyncio.to_thread(
+            self.retriever.search,
+            args["query"],
+            self.similarity_top_k,
+            self.vector_distance_threshold,
+            self.nprobe,
+        )
+        if not results:
+            return (
+                "No matching result found with the config: "
+                f"similarity_top_k={self.similarity_top_k} "
+                f"vector_distance_threshold={self.vector_distance_threshold}"
+            )
+        return [r["text"] for r in results]
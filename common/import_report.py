@@ -0,0 +1,162 @@
+"""
+Import-Time Report - Per-package `-X importtime` breakdown
+
+Imports every agent package in a fresh interpreter with `python -X importtime`,
+then reports how long the import took, which top-level packages dominated it,
+and (with --build) how long building root_agent took on first access.
+
+Usage (from the repository root):
+    python -m common.import_report
+    python -m common.import_report 08-vertex-ai-rag/rag_agent --build --top 15
+    python -m common.import_report --budget-ms 800 --json
+
+Exits with status 1 when any package fails to import or exceeds --budget-ms.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BUILD_MARKER = "--- build root_agent ---"
+
+# Runs inside the child interpreter: import the package, then optionally build root_agent
+CHILD_SCRIPT = """
+import importlib, json, sys, time
+started = time.perf_counter()
+module = importlib.import_module({module!r})
+import_s = time.perf_counter() - started
+build_s = None
+if {build}:
+    sys.stderr.write({marker!r} + "\\n")
+    started = time.perf_counter()
+    module.root_agent
+    build_s = time.perf_counter() - started
+print(json.dumps([import_s, build_s]))
+"""
+
+
+def discover_packages(root: Path = REPO_ROOT) -> list[Path]:
+    """Every `<NN-module>/<package>/agent.py` in the repository."""
+    return sorted(p.parent for p in root.glob("[0-9][0-9]-*/*/agent.py"))
+
+
+def parse_importtime(lines: list[str]) -> list[tuple]:
+    """
+    Parse `-X importtime` stderr lines.
+
+    Returns:
+        list: (module, self_us, cumulative_us, depth) for each imported module.
+    """
+    rows = []
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        indent = len(name) - len(name.lstrip())
+        rows.append((name.strip(), int(self_us), int(cumulative_us), max(0, (indent - 1) // 2)))
+    return rows
+
+
+def summarize(rows: list[tuple], top: int) -> dict:
+    """Total import time plus the heaviest top-level packages and modules."""
+    by_package = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    heaviest_packages = sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    heaviest_modules = sorted(rows, key=lambda r: r[2], reverse=True)[:top]
+    return {
+        "modules_imported": len(rows),
+        "total_ms": round(sum(r[1] for r in rows) / 1000, 1),
+        "top_packages_self_ms": {name: round(us / 1000, 1) for name, us in heaviest_packages},
+        "top_modules_cumulative_ms": {r[0]: round(r[2] / 1000, 1) for r in heaviest_modules},
+    }
+
+
+def profile_package(package_dir: Path, build: bool = False, top: int = 10) -> dict:
+    """Import one agent package in a fresh interpreter and summarize the timings."""
+    module = f"{package_dir.name}.agent"
+    script = CHILD_SCRIPT.format(module=module, build=build, marker=BUILD_MARKER)
+    env_path = [str(package_dir.parent), str(REPO_ROOT)]
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         f"import sys; sys.path[:0] = {env_path!r}\n{script}"],
+        capture_output=True,
+        text=True,
+        cwd=package_dir.parent,
+    )
+    wall_s = time.perf_counter() - started
+
+    stderr = proc.stderr.splitlines()
+    if BUILD_MARKER in stderr:
+        split = stderr.index(BUILD_MARKER)
+        import_lines, build_lines = stderr[:split], stderr[split + 1:]
+    else:
+        import_lines, build_lines = stderr, []
+
+    report = {
+        "package": str(package_dir.relative_to(REPO_ROOT)),
+        "ok": proc.returncode == 0,
+        "wall_ms": round(wall_s * 1000, 1),
+        "import": summarize(parse_importtime(import_lines), top),
+    }
+    if proc.returncode == 0:
+        import_s, build_s = json.loads(proc.stdout.strip().splitlines()[-1])
+        report["import_ms"] = round(import_s * 1000, 1)
+        if build:
+            report["build_ms"] = round(build_s * 1000, 1)
+            report["build"] = summarize(parse_importtime(build_lines), top)
+    else:
+        errors = [line for line in stderr if line and not line.startswith("import time:")]
+        report["error"] = errors[-1] if errors else f"exit code {proc.returncode}"
+    return report
+
+
+def format_report(reports: list[dict], budget_ms: float = None) -> str:
+    lines = [f"{'package':<45}{'import ms':>11}{'build ms':>10}{'modules':>9}  status"]
+    for r in reports:
+        import_ms = r.get("import_ms", r["import"]["total_ms"])
+        status = "ok" if r["ok"] else f"FAILED: {r['error']}"
+        if r["ok"] and budget_ms is not None and import_ms > budget_ms:
+            status = f"OVER BUDGET ({budget_ms:.0f} ms)"
+        lines.append(
+            f"{r['package']:<45}{import_ms:>11}{r.get('build_ms', '-'):>10}"
+            f"{r['import']['modules_imported']:>9}  {status}"
+        )
+        heaviest = ", ".join(f"{k} {v}" for k, v in list(r["import"]["top_packages_self_ms"].items())[:5])
+        lines.append(f"    heaviest: {heaviest}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time report for agent packages.")
+    parser.add_argument("packages", nargs="*", help="Agent package paths (default: all)")
+    parser.add_argument("--build", action="store_true", help="Also time building root_agent")
+    parser.add_argument("--top", type=int, default=10, help="Entries per breakdown")
+    parser.add_argument("--budget-ms", type=float, help="Fail packages whose import exceeds this")
+    parser.add_argument("--json", action="store_true", help="Print the full JSON report")
+    args = parser.parse_args()
+
+    packages = [Path(p).resolve() for p in args.packages] or discover_packages()
+    reports = [profile_package(p, build=args.build, top=args.top) for p in packages]
+
+    print(json.dumps(reports, indent=2) if args.json else format_report(reports, args.budget_ms))
+
+    failed = [r for r in reports if not r["ok"]]
+    over = [
+        r for r in reports
+        if r["ok"] and args.budget_ms is not None and r["import_ms"] > args.budget_ms
+    ]
+    sys.exit(1 if failed or over else 0)
+
+
+if __name__ == "__main__":
+    main()
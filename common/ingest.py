@@ -0,0 +1,424 @@
+"""
+Incremental Ingestion - Keep a local RAG index in sync with a document folder
+
+Rebuilding the whole index re-embeds every document, even when almost nothing
+changed. The Ingestor only embeds what is new or changed:
+
+- Files are read as a stream (1 MB text blocks) and chunked as they are read,
+  so memory does not grow with the size of a file
+- Change detection: size + mtime as a quick check, then a streaming SHA-256 of
+  the content; unchanged files are never re-read or re-embedded
+- Chunks are embedded in batches of `batch_size` through any embedder with
+  `spec` and `embed(texts)` (HashingEmbedder for offline runs, GeminiEmbedder)
+- Each file's vectors go to their own segment on disk, and the manifest
+  (SQLite) is committed after every file: an interrupted run resumes where it
+  stopped instead of starting over
+- The searchable index is republished from the segments with build_index(),
+  block by block from memory-mapped files, into a new version directory;
+  one os.replace of the CURRENT pointer file makes it live, so a reader
+  opening the index sees either the old version or the new one, never a mix
+- Paragraphs are split exactly like chunk_text() (split_paragraphs), so an
+  ingested document chunks the same as one indexed with build_from_directory
+
+State lives in `<index_dir>/.ingest/`. Changing the embedder (or its
+dimensions) invalidates every segment, since old and new vectors can't be
+mixed.
+
+Usage (from the repository root):
+    python -m common.ingest ./docs ./08-vertex-ai-rag/rag_index --batch-size 64
+
+    ingestor = Ingestor("./docs", "./rag_index", embedder=HashingEmbedder())
+    report = ingestor.run()
+    print(report.docs_per_second)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from .vector_index import (
+    CENTROIDS_FILE,
+    CHUNKS_FILE,
+    CURRENT_FILE,
+    INDEX_FILE,
+    OFFSETS_FILE,
+    VECTORS_FILE,
+    GeminiEmbedder,
+    HashingEmbedder,
+    JsonlRows,
+    build_index,
+    chunk_paragraphs,
+    resolve_index_dir,
+    split_paragraphs,
+)
+
+STATE_DIR = ".ingest"
+# Published versions live in <index_dir>/<VERSION_PREFIX><n>/; CURRENT names the live one
+VERSION_PREFIX = "v"
+# Versions kept on disk (live + previous) for readers that still have one open
+KEEP_VERSIONS = 2
+DOC_SUFFIXES = (".txt", ".md")
+
+# Characters read per block when streaming a file
+READ_BLOCK_CHARS = 1 << 20
+
+
+def file_sha256(path: Path, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def iter_paragraphs(path: Path, block_chars: int = READ_BLOCK_CHARS) -> Iterator[str]:
+    """
+    Paragraphs of a text file, read in blocks and split like chunk_text().
+
+    A paragraph longer than `block_chars` is yielded in pieces, so memory stays
+    bounded even for files without blank lines.
+    """
+    pending = ""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for block in iter(lambda: f.read(block_chars), ""):
+            pending += block
+            parts = split_paragraphs(pending)
+            pending = parts.pop()
+            yield from parts
+            if len(pending) > block_chars:
+                yield pending
+                pending = ""
+    if pending:
+        yield pending
+
+
+@dataclass
+class IngestReport:
+    files_new: int = 0
+    files_changed: int = 0
+    files_unchanged: int = 0
+    files_deleted: int = 0
+    chunks_embedded: int = 0
+    chunks_total: int = 0
+    published: bool = False
+    elapsed_s: float = 0.0
+    embed_s: float = 0.0
+
+    @property
+    def files_processed(self) -> int:
+        return self.files_new + self.files_changed
+
+    @property
+    def docs_per_second(self) -> float:
+        """Documents scanned per second (unchanged ones included)."""
+        scanned = self.files_processed + self.files_unchanged
+        return scanned / self.elapsed_s if self.elapsed_s else 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["elapsed_s"] = round(self.elapsed_s, 3)
+        data["embed_s"] = round(self.embed_s, 3)
+        data["docs_per_second"] = round(self.docs_per_second, 1)
+        data["chunks_per_second"] = round(self.chunks_embedded / self.embed_s, 1) if self.embed_s else 0.0
+        return data
+
+
+class Ingestor:
+    """
+    Incremental, resumable ingestion of a document folder into a local index.
+
+    Args:
+        docs_dir (str): Folder scanned recursively for .txt/.md files.
+        index_dir (str): Index directory read by LocalVectorIndex.
+        embedder: Object with `spec` (dict) and `embed(texts) -> (n, dim) array`.
+        chunk_size (int): Max characters per chunk.
+        overlap (int): Characters repeated between consecutive chunks.
+        batch_size (int): Chunks per embed() call.
+        ivf_lists (int): IVF clusters for the published index (0 = exact).
+    """
+
+    def __init__(
+        self,
+        docs_dir: str,
+        index_dir: str,
+        embedder=None,
+        chunk_size: int = 800,
+        overlap: int = 100,
+        batch_size: int = 64,
+        ivf_lists: int = 0,
+    ):
+        self.docs_dir = Path(docs_dir)
+        self.index_dir = Path(index_dir)
+        self.embedder = embedder or HashingEmbedder()
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.batch_size = batch_size
+        self.ivf_lists = ivf_lists
+        self.state_dir = self.index_dir / STATE_DIR
+        self.segments_dir = self.state_dir / "segments"
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.state_dir / "state.sqlite")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, sha256 TEXT, size INTEGER, mtime REAL, segment TEXT, chunks INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """
+        )
+        self._check_settings()
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def _check_settings(self) -> None:
+        """Drop every segment if the embedder or chunking settings changed."""
+        settings = json.dumps(
+            {"embedder": self.embedder.spec, "chunk_size": self.chunk_size, "overlap": self.overlap},
+            sort_keys=True,
+        )
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'settings'").fetchone()
+        if row and row[0] == settings:
+            return
+        with self._db:
+            self._db.execute("DELETE FROM files")
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('settings', ?)", (settings,))
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('dirty', '1')")
+        for file in self.segments_dir.iterdir():
+            file.unlink()
+
+    def _mark_dirty(self) -> None:
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES ('dirty', '1')")
+
+    def _is_dirty(self) -> bool:
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'dirty'").fetchone()
+        return bool(row and row[0] == "1") or not (resolve_index_dir(self.index_dir) / INDEX_FILE).exists()
+
+    # ------------------------------------------------------------------
+    # Per-file work
+    # ------------------------------------------------------------------
+
+    def _segment_name(self, rel_path: str, sha: str) -> str:
+        # Path is part of the name: chunk metadata records where it came from
+        return hashlib.sha256(f"{rel_path}\0{sha}".encode("utf-8")).hexdigest()[:32]
+
+    def _embed_file(self, file: Path, rel_path: str, segment: str, report: IngestReport) -> int:
+        """Chunk and embed one file into segment files; returns the chunk count."""
+        vectors_tmp = self.segments_dir / f"{segment}.f32.tmp"
+        chunks_tmp = self.segments_dir / f"{segment}.jsonl.tmp"
+        count = 0
+        with open(vectors_tmp, "wb") as vf, open(chunks_tmp, "w", encoding="utf-8") as cf:
+            batch: list[str] = []
+
+            def flush():
+                started = time.perf_counter()
+                vectors = np.asarray(self.embedder.embed(batch), dtype=np.float32)
+                report.embed_s += time.perf_counter() - started
+                vf.write(vectors.tobytes())
+                batch.clear()
+
+            for chunk in chunk_paragraphs(iter_paragraphs(file), self.chunk_size, self.overlap):
+                cf.write(json.dumps(
+                    {"id": f"{rel_path}#{count}", "source": rel_path, "text": chunk}, ensure_ascii=False
+                ) + "\n")
+                batch.append(chunk)
+                count += 1
+                if len(batch) >= self.batch_size:
+                    flush()
+            if batch:
+                flush()
+        os.replace(vectors_tmp, self.segments_dir / f"{segment}.f32")
+        os.replace(chunks_tmp, self.segments_dir / f"{segment}.jsonl")
+        report.chunks_embedded += count
+        return count
+
+    def _remove_segment(self, segment: str) -> None:
+        for suffix in (".f32", ".jsonl"):
+            (self.segments_dir / f"{segment}{suffix}").unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def sync(self, report: IngestReport) -> None:
+        """Embed new and changed files and forget deleted ones."""
+        known = {
+            row[0]: row[1:]
+            for row in self._db.execute("SELECT path, sha256, size, mtime, segment FROM files")
+        }
+        seen = set()
+        for file in sorted(self.docs_dir.rglob("*")):
+            if file.suffix.lower() not in DOC_SUFFIXES or not file.is_file():
+                continue
+            rel_path = file.relative_to(self.docs_dir).as_posix()
+            seen.add(rel_path)
+            stat = file.stat()
+            previous = known.get(rel_path)
+            if previous and previous[1] == stat.st_size and previous[2] == stat.st_mtime:
+                report.files_unchanged += 1
+                continue
+            sha = file_sha256(file)
+            if previous and previous[0] == sha:
+                # Touched but identical: just refresh the quick-check fields
+                with self._db:
+                    self._db.execute(
+                        "UPDATE files SET size = ?, mtime = ? WHERE path = ?",
+                        (stat.st_size, stat.st_mtime, rel_path),
+                    )
+                report.files_unchanged += 1
+                continue
+
+            segment = self._segment_name(rel_path, sha)
+            chunks = self._embed_file(file, rel_path, segment, report)
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                    (rel_path, sha, stat.st_size, stat.st_mtime, segment, chunks),
+                )
+                self._mark_dirty()
+            if previous:
+                report.files_changed += 1
+                if previous[3] != segment:
+                    self._remove_segment(previous[3])
+            else:
+                report.files_new += 1
+
+        for rel_path in known.keys() - seen:
+            with self._db:
+                self._db.execute("DELETE FROM files WHERE path = ?", (rel_path,))
+                self._mark_dirty()
+            self._remove_segment(known[rel_path][3])
+            report.files_deleted += 1
+
+    def publish(self) -> int:
+        """Merge the segments into a fresh index and swap it in; returns the row count."""
+        rows = self._db.execute("SELECT segment, chunks FROM files ORDER BY path").fetchall()
+        total = sum(chunks for _, chunks in rows)
+        dim = int(self.embedder.spec.get("dim", 0))
+        merged_vectors = self.state_dir / "merged.f32"
+        merged_chunks = self.state_dir / "merged.jsonl"
+        offsets = np.zeros(total, dtype=np.uint64)
+        row = 0
+        with open(merged_vectors, "wb") as vf, open(merged_chunks, "wb") as cf:
+            for segment, chunks in rows:
+                with open(self.segments_dir / f"{segment}.f32", "rb") as f:
+                    for block in iter(lambda: f.read(1 << 22), b""):
+                        vf.write(block)
+                with open(self.segments_dir / f"{segment}.jsonl", "rb") as f:
+                    for line in f:
+                        offsets[row] = cf.tell()
+                        cf.write(line)
+                        row += 1
+        if total and not dim:
+            # Embedders without a fixed dim in their spec (e.g. Gemini)
+            dim = os.path.getsize(merged_vectors) // 4 // total
+
+        vectors = (
+            np.memmap(merged_vectors, dtype=np.float32, mode="r", shape=(total, dim))
+            if total else np.zeros((0, dim), dtype=np.float32)
+        )
+        chunks = JsonlRows(merged_chunks, offsets)
+        version = self._next_version()
+        try:
+            build_index(str(self.index_dir / version), vectors, chunks, self.embedder.spec, self.ivf_lists)
+        finally:
+            chunks.close()
+            del vectors
+        # One atomic swap: readers resolve CURRENT to the old version or the
+        # new one, and each version directory is complete before it is named
+        pointer_tmp = self.index_dir / f"{CURRENT_FILE}.tmp"
+        pointer_tmp.write_text(version, encoding="utf-8")
+        os.replace(pointer_tmp, self.index_dir / CURRENT_FILE)
+        self._remove_old_versions()
+        merged_vectors.unlink()
+        merged_chunks.unlink()
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('dirty', '0')")
+        return total
+
+    def _versions(self) -> list[str]:
+        """Published version directories, oldest first."""
+        names = [
+            p.name for p in self.index_dir.iterdir()
+            if p.is_dir() and p.name.startswith(VERSION_PREFIX) and p.name[len(VERSION_PREFIX):].isdigit()
+        ]
+        return sorted(names, key=lambda name: int(name[len(VERSION_PREFIX):]))
+
+    def _next_version(self) -> str:
+        versions = self._versions()
+        latest = int(versions[-1][len(VERSION_PREFIX):]) if versions else 0
+        return f"{VERSION_PREFIX}{latest + 1}"
+
+    def _remove_old_versions(self) -> None:
+        for name in self._versions()[:-KEEP_VERSIONS]:
+            shutil.rmtree(self.index_dir / name, ignore_errors=True)
+        # Files of a flat (pre-versioning) index in the root are no longer read
+        for name in (VECTORS_FILE, CHUNKS_FILE, OFFSETS_FILE, CENTROIDS_FILE, INDEX_FILE):
+            (self.index_dir / name).unlink(missing_ok=True)
+
+    def run(self, full: bool = False) -> IngestReport:
+        """Sync, then republish the index if anything changed."""
+        started = time.perf_counter()
+        if full:
+            with self._db:
+                self._db.execute("DELETE FROM files")
+                self._mark_dirty()
+            for file in self.segments_dir.iterdir():
+                file.unlink()
+        report = IngestReport()
+        self.sync(report)
+        if self._is_dirty():
+            report.chunks_total = self.publish()
+            report.published = True
+        else:
+            report.chunks_total = self._db.execute("SELECT COALESCE(SUM(chunks), 0) FROM files").fetchone()[0]
+        report.elapsed_s = time.perf_counter() - started
+        return report
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally ingest a document folder into a local index.")
+    parser.add_argument("docs_dir")
+    parser.add_argument("index_dir")
+    parser.add_argument("--embedder", choices=["hashing", "gemini"], default="hashing")
+    parser.add_argument("--dim", type=int, default=384, help="Hashing embedder dimensions")
+    parser.add_argument("--chunk-size", type=int, default=800)
+    parser.add_argument("--overlap", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=64, help="Chunks per embedding call")
+    parser.add_argument("--ivf-lists", type=int, default=0)
+    parser.add_argument("--full", action="store_true", help="Ignore the manifest and re-embed everything")
+    args = parser.parse_args()
+
+    embedder = GeminiEmbedder(batch_size=args.batch_size) if args.embedder == "gemini" else HashingEmbedder(args.dim)
+    ingestor = Ingestor(
+        args.docs_dir,
+        args.index_dir,
+        embedder,
+        chunk_size=args.chunk_size,
+        overlap=args.overlap,
+        batch_size=args.batch_size,
+        ivf_lists=args.ivf_lists,
+    )
+    try:
+        report = ingestor.run(full=args.full)
+    finally:
+        ingestor.close()
+    print(json.dumps(report.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
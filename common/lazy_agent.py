@@ -0,0 +1,132 @@
+"""
+Lazy Agents - Build root_agent on first use
+
+Agent packages that import heavy SDKs or talk to the network while building
+their tools slow down every process that imports them, and a broken
+dependency stops unrelated agents from loading. Building root_agent inside a
+factory keeps the import cheap and confines failures to the agent that
+needs the dependency.
+
+Usage in an agent.py:
+    def create_agent() -> Agent:
+        from vertexai.preview import rag   # heavy import deferred to first use
+        ...
+        return Agent(...)
+
+    __getattr__ = lazy_root_agent(create_agent)
+
+`adk web`, `adk run` and `from .agent import root_agent` all go through the
+module's `__getattr__`, so they get the agent built on first access.
+"""
+
+import importlib
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from google.adk.agents import BaseAgent
+
+# Seconds spent in each factory, keyed by the factory's module name
+BUILD_TIMES: dict[str, float] = {}
+
+
+def lazy_root_agent(factory: Callable[[], BaseAgent], attr: str = "root_agent"):
+    """
+    Create a module-level `__getattr__` that builds `attr` once, on first access.
+
+    Args:
+        factory (Callable): Zero-argument function returning the agent.
+        attr (str): Attribute name to serve (default "root_agent").
+
+    Returns:
+        Callable: A function to assign to the module's `__getattr__`.
+    """
+    lock = threading.Lock()
+    built = {}
+
+    def __getattr__(name: str):
+        if name != attr:
+            raise AttributeError(f"module {factory.__module__!r} has no attribute {name!r}")
+        if attr not in built:
+            with lock:
+                if attr not in built:
+                    started = time.perf_counter()
+                    agent = factory()
+                    BUILD_TIMES[factory.__module__] = time.perf_counter() - started
+                    # Cache on the module too so later lookups skip __getattr__
+                    setattr(sys.modules[factory.__module__], attr, agent)
+                    built[attr] = agent
+        return built[attr]
+
+    return __getattr__
+
+
+class AgentRegistry:
+    """
+    Named agent factories for processes that serve several agents.
+
+    Each agent is built on its first `get()`. A factory that raises only
+    affects its own agent: the error is cached and re-raised for that name,
+    while every other agent keeps loading normally.
+    """
+
+    def __init__(self):
+        self._factories: dict[str, Callable[[], BaseAgent]] = {}
+        self._agents: dict[str, BaseAgent] = {}
+        self._errors: dict[str, Exception] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self.build_times: dict[str, float] = {}
+
+    def register(self, name: str, factory: Callable[[], BaseAgent]) -> None:
+        self._factories[name] = factory
+        self._locks[name] = threading.Lock()
+
+    def register_package(self, name: str, package_path: str) -> None:
+        """Register an agent package folder, e.g. "08-vertex-ai-rag/rag_agent"."""
+        package_dir = Path(package_path).resolve()
+
+        def factory() -> BaseAgent:
+            if str(package_dir.parent) not in sys.path:
+                sys.path.insert(0, str(package_dir.parent))
+            return importlib.import_module(f"{package_dir.name}.agent").root_agent
+
+        self.register(name, factory)
+
+    def names(self) -> list[str]:
+        return list(self._factories)
+
+    def get(self, name: str) -> BaseAgent:
+        if name in self._agents:
+            return self._agents[name]
+        if name in self._errors:
+            raise self._errors[name]
+        if name not in self._factories:
+            raise KeyError(f"No agent registered as {name!r}")
+        # One lock per agent so a slow build never delays the others
+        with self._locks[name]:
+            if name not in self._agents and name not in self._errors:
+                started = time.perf_counter()
+                try:
+                    self._agents[name] = self._factories[name]()
+                except Exception as e:
+                    self._errors[name] = e
+                    raise
+                finally:
+                    self.build_times[name] = time.perf_counter() - started
+        if name in self._errors:
+            raise self._errors[name]
+        return self._agents[name]
+
+    def status(self) -> dict:
+        """Build state of every registered agent: pending, ready or the error."""
+        result = {}
+        for name in self._factories:
+            if name in self._agents:
+                result[name] = "ready"
+            elif name in self._errors:
+                result[name] = f"error: {self._errors[name]}"
+            else:
+                result[name] = "pending"
+        return result
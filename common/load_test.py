@@ -0,0 +1,134 @@
+"""
+Offline Load Test - Benchmark any module's root_agent with the fake model
+
+Loads an agent package from a module folder, swaps every model in its agent
+tree for a FakeLlm, and drives it with concurrent Runner.run_async turns.
+What's left in the timings is Runner, tool and callback overhead plus the
+artificial latency you configure.
+
+Usage (from the repository root):
+    python -m common.load_test 10-custom-function-tools/custom_tool_agent \\
+        --prompt "Where is order ORD-42?" --turns 500 --concurrency 50
+
+    python -m common.load_test 20-events/event_agent --prompt "What is 25 * 4?" \\
+        --first-chunk-latency 0.2 --chunk-latency 0.02 --sse
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from common.fake_llm import FakeLlm, use_fake_model
+from common.streaming_metrics import StreamingMetrics
+
+
+def load_root_agent(package_path: str):
+    """
+    Import `<module folder>/<agent package>` the same way `adk web` does.
+
+    Args:
+        package_path (str): Path to the agent package, e.g. "05-workflow-agents/loop_agent".
+
+    Returns:
+        BaseAgent: The package's root_agent.
+    """
+    package_dir = Path(package_path).resolve()
+    sys.path.insert(0, str(package_dir.parent))
+    module = importlib.import_module(f"{package_dir.name}.agent")
+    return module.root_agent
+
+
+async def run_load_test(
+    agent,
+    prompt: str,
+    turns: int,
+    concurrency: int,
+    sse: bool = False,
+) -> dict:
+    """
+    Run `turns` single-turn conversations against `agent` with bounded concurrency.
+
+    Returns:
+        dict: Throughput plus the StreamingMetrics histogram summary.
+    """
+    runner = Runner(
+        app_name="load_test",
+        agent=agent,
+        session_service=InMemorySessionService(),
+    )
+    metrics = StreamingMetrics(keep_turns=0)
+    run_config = RunConfig(streaming_mode=StreamingMode.SSE if sse else StreamingMode.NONE)
+    semaphore = asyncio.Semaphore(concurrency)
+    content = types.Content(role="user", parts=[types.Part(text=prompt)])
+
+    async def one_turn(i: int):
+        async with semaphore:
+            user_id = f"user_{i}"
+            session = await runner.session_service.create_session(
+                app_name="load_test", user_id=user_id
+            )
+            try:
+                async for _ in metrics.run_async(
+                    runner,
+                    user_id=user_id,
+                    session_id=session.id,
+                    new_message=content,
+                    run_config=run_config,
+                ):
+                    pass
+            finally:
+                await runner.session_service.delete_session(
+                    app_name="load_test", user_id=user_id, session_id=session.id
+                )
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one_turn(i) for i in range(turns)), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+
+    failures = [r for r in results if isinstance(r, BaseException)]
+    return {
+        "agent": agent.name,
+        "turns": turns,
+        "failures": len(failures),
+        "first_failure": repr(failures[0]) if failures else None,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "turns_per_s": round(turns / elapsed, 1) if elapsed else 0.0,
+        "metrics": metrics.summary(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test with the fake model.")
+    parser.add_argument("package", help="Agent package path, e.g. 20-events/event_agent")
+    parser.add_argument("--prompt", default="Hello!", help="User message for every turn")
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--first-chunk-latency", type=float, default=0.0,
+                        help="Simulated seconds to first chunk")
+    parser.add_argument("--chunk-latency", type=float, default=0.0,
+                        help="Simulated seconds between chunks")
+    parser.add_argument("--sse", action="store_true", help="Stream partial chunks")
+    args = parser.parse_args()
+
+    agent = load_root_agent(args.package)
+    llm = use_fake_model(agent, FakeLlm(
+        first_chunk_latency=args.first_chunk_latency,
+        chunk_latency=args.chunk_latency,
+    ))
+    report = asyncio.run(run_load_test(agent, args.prompt, args.turns, args.concurrency, args.sse))
+    report["model_calls"] = llm.call_count
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+MCP Multi - Connect to and discover every MCP server concurrently
+
+Starting an agent with `tools=[github_mcp, firecrawl_mcp, ...]` connects to
+and discovers one server after another, so startup takes the sum of all
+handshakes, and one dead or slow server holds up (or breaks) the whole
+agent. MultiServerMCP starts them side by side:
+
+- Every server connects and lists its tools concurrently; startup takes as
+  long as the slowest server, not the sum
+- Each server has its own timeout; a server that fails or times out is
+  reported and left out, and the agent starts with the others
+- Per-server metrics: status, connect and discovery seconds, tool count,
+  where the tools came from (server or disk cache), error
+- Each server's session lives in its own task, which opens and later closes
+  it (MCP stdio sessions must be closed by the task that opened them)
+
+Sessions go through a private MCPSessionPool by default, so closing the
+manager never touches sessions other PooledMCPToolsets opened. With a shared
+pool passed in, each task closes only the session it opened itself. Tool
+schemas go through the same disk cache as every other PooledMCPToolset.
+
+Usage:
+    manager = MultiServerMCP([
+        ServerSpec("github", github_params, timeout=10),
+        ServerSpec("firecrawl", firecrawl_params, timeout=20),
+    ])
+    await manager.start()
+    agent = Agent(..., tools=manager.toolsets())
+    print(manager.metrics())
+    ...
+    await manager.close()
+
+Benchmark with local stdio stub servers (from the repository root):
+    python -m common.mcp_multi bench --delays 0.5,1.0,1.5 --dead 1 --hung 1 --timeout 8
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from .mcp_pool import MCPSessionPool, PooledMCPToolset, ToolSchemaCache, default_pool, stub_server_params
+
+
+@dataclass
+class ServerSpec:
+    """
+    One MCP server.
+
+    Args:
+        name (str): Label used in metrics and logs.
+        connection_params: StdioConnectionParams / StreamableHTTPServerParams / ...
+        timeout (float): Seconds allowed to connect and discover tools.
+        toolset_kwargs (dict): Extra McpToolset arguments (tool_filter, tool_name_prefix, ...).
+    """
+
+    name: str
+    connection_params: Any
+    timeout: float = 15.0
+    toolset_kwargs: dict = field(default_factory=dict)
+
+
+class MultiServerMCP:
+    """
+    Concurrent startup, failure isolation and metrics for several MCP servers.
+
+    Args:
+        servers (list[ServerSpec]): Servers to start.
+        pool (MCPSessionPool): Session pool (default: a private pool with the
+            process-wide keepalive). A shared pool's sessions opened elsewhere
+            are used but never closed here.
+        schema_cache (ToolSchemaCache): Discovery cache (default: from env).
+    """
+
+    def __init__(
+        self,
+        servers: list[ServerSpec],
+        pool: Optional[MCPSessionPool] = None,
+        schema_cache: Optional[ToolSchemaCache] = None,
+    ):
+        names = [spec.name for spec in servers]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Server names must be unique: {names}")
+        self.servers = servers
+        self._pool = pool or MCPSessionPool(keepalive=default_pool().keepalive)
+        self._schema_cache = schema_cache
+        self._toolsets: dict[str, PooledMCPToolset] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._stop: Optional[asyncio.Event] = None
+        self._metrics: dict[str, dict] = {}
+        self.startup_seconds = 0.0
+
+    async def _serve(self, spec: ServerSpec, toolset: PooledMCPToolset, ready: asyncio.Future) -> None:
+        """Open, discover, then hold the server's session until close()."""
+        metrics = self._metrics[spec.name]
+        manager = toolset._mcp_session_manager
+        opened = False
+        started = time.perf_counter()
+        try:
+            # No deadline in here: a cancel scope around the session would have
+            # to close before the session does. start() enforces the timeout.
+            try:
+                session = await manager.create_session()
+                opened = manager.opened_by_current_task(session)
+                metrics["connect_s"] = round(time.perf_counter() - started, 4)
+                tools = await toolset.get_tools()
+            except Exception as e:
+                metrics.update(status="error", error=f"{type(e).__name__}: {e}")
+            else:
+                metrics.update(status="ok", tools=len(tools), discovery_source=toolset.discovery["source"])
+            if ready.done():
+                # start() gave up on this server; note how it ended
+                metrics["late"] = {"status": metrics.pop("status"), "after_s": round(time.perf_counter() - started, 4)}
+                metrics["status"] = "timeout"
+            else:
+                metrics["startup_s"] = round(time.perf_counter() - started, 4)
+                ready.set_result(metrics["status"])
+                if metrics["status"] == "ok":
+                    await self._stop.wait()
+        finally:
+            # A session reused from a shared pool belongs to whoever opened it
+            try:
+                if opened:
+                    await manager.close()
+            except Exception:
+                pass
+
+    async def _start_one(self, spec: ServerSpec) -> None:
+        metrics = self._metrics[spec.name] = {"status": "starting"}
+        toolset = PooledMCPToolset(
+            connection_params=spec.connection_params,
+            pool=self._pool,
+            schema_cache=self._schema_cache,
+            **spec.toolset_kwargs,
+        )
+        ready = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(self._serve(spec, toolset, ready), name=f"mcp:{spec.name}")
+        self._tasks[spec.name] = task
+        try:
+            await asyncio.wait_for(asyncio.shield(ready), spec.timeout)
+        except asyncio.TimeoutError:
+            # Leave the attempt running in the background (it ends at the
+            # transport's own read timeout and closes its session cleanly);
+            # the agent starts without this server
+            ready.set_result("timeout")
+            metrics.update(status="timeout", error=f"no response within {spec.timeout:g}s", startup_s=spec.timeout)
+            return
+        if metrics["status"] == "ok":
+            self._toolsets[spec.name] = toolset
+
+    async def start(self, concurrent: bool = True) -> dict:
+        """
+        Start every server; returns metrics (see metrics()).
+
+        With concurrent=False servers start one after another (the baseline
+        the benchmark compares against).
+        """
+        self._stop = asyncio.Event()
+        started = time.perf_counter()
+        if concurrent:
+            await asyncio.gather(*(self._start_one(spec) for spec in self.servers))
+        else:
+            for spec in self.servers:
+                await self._start_one(spec)
+        self.startup_seconds = time.perf_counter() - started
+        return self.metrics()
+
+    def toolsets(self) -> list[PooledMCPToolset]:
+        """Toolsets of the servers that started, in configuration order."""
+        return [self._toolsets[spec.name] for spec in self.servers if spec.name in self._toolsets]
+
+    def metrics(self) -> dict:
+        return {
+            "startup_s": round(self.startup_seconds, 4),
+            "servers_ok": len(self._toolsets),
+            "servers_failed": len(self._metrics) - len(self._toolsets),
+            "servers": {name: dict(metrics) for name, metrics in self._metrics.items()},
+        }
+
+    async def close(self, grace: float = 5.0) -> None:
+        """
+        Close every session, each from the task that opened it. Attempts
+        still stuck after `grace` seconds (timed-out servers) are cancelled.
+        """
+        if self._stop is not None:
+            self._stop.set()
+        tasks = list(self._tasks.values())
+        if tasks:
+            _, stuck = await asyncio.wait(tasks, timeout=grace)
+            for task in stuck:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._toolsets.clear()
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def _stub_specs(delays: list[float], dead: int, hung: int, timeout: float) -> list[ServerSpec]:
+    specs = [
+        ServerSpec(f"stub-{i}", stub_server_params(name=f"stub-{i}", tools=10, startup_delay=delay), timeout=timeout)
+        for i, delay in enumerate(delays)
+    ]
+    specs += [
+        ServerSpec(f"dead-{i}", stub_server_params(name=f"dead-{i}", fail=True), timeout=timeout)
+        for i in range(dead)
+    ]
+    # Accepts the connection, then never finishes starting
+    specs += [
+        ServerSpec(
+            f"hung-{i}",
+            stub_server_params(name=f"hung-{i}", startup_delay=timeout * 3, timeout=timeout + 1),
+            timeout=timeout,
+        )
+        for i in range(hung)
+    ]
+    return specs
+
+
+async def _bench(delays: list[float], dead: int, hung: int, timeout: float) -> dict:
+    report = {}
+    for mode, concurrent in (("serial", False), ("concurrent", True)):
+        # Fresh pool and empty discovery cache: every run connects and discovers
+        with tempfile.TemporaryDirectory() as directory:
+            manager = MultiServerMCP(
+                _stub_specs(delays, dead, hung, timeout),
+                pool=MCPSessionPool(keepalive=0),
+                schema_cache=ToolSchemaCache(directory),
+            )
+            await manager.start(concurrent=concurrent)
+            report[mode] = manager.metrics()
+            await manager.close()
+    report["speedup"] = round(report["serial"]["startup_s"] / report["concurrent"]["startup_s"], 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-server MCP startup benchmark.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    bench = commands.add_parser("bench", help="Serial vs concurrent startup against stdio stub servers")
+    bench.add_argument("--delays", default="0.5,1.0,1.5", help="Startup delay of each healthy stub server")
+    bench.add_argument("--dead", type=int, default=1, help="Stub servers that exit immediately")
+    bench.add_argument("--hung", type=int, default=0, help="Stub servers that never finish starting")
+    bench.add_argument("--timeout", type=float, default=8.0, help="Per-server startup timeout")
+    args = parser.parse_args()
+    delays = [float(d) for d in args.delays.split(",") if d]
+    print(json.dumps(asyncio.run(_bench(delays, args.dead, args.hung, args.timeout)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
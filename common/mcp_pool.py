@@ -0,0 +1,466 @@
+"""
+MCP Pool - Shared MCP sessions and an on-disk tool-discovery cache
+
+Every MCPToolset owns its own session manager. Each toolset, and each
+process, pays for the connection handshake and a `tools/list` discovery
+round trip before the first model call, and closing a Runner closes the
+sessions with it. For the GitHub MCP server, with dozens of tools, that
+discovery dominates worker cold start and the first request after a
+scale-up. This module adds:
+
+- MCPSessionPool: one session manager per server (connection params +
+  headers) per process, shared by every PooledMCPToolset, agent and Runner.
+  A keepalive task pings open sessions and drops dead ones, so the next call
+  reconnects instead of failing.
+- ToolSchemaCache: discovered tool schemas written to disk as versioned
+  JSON, one file per server fingerprint (a hash, so tokens in headers never
+  appear in file names).
+- PooledMCPToolset: an McpToolset that answers get_tools() from memory, then
+  from the disk cache (no connection at all), and only then from the server.
+  Stale schemas are refreshed in the background.
+
+Usage:
+    toolset = PooledMCPToolset(
+        connection_params=StreamableHTTPServerParams(url=..., headers=...),
+    )
+    root_agent = Agent(..., tools=[toolset])
+
+Benchmark against the local stub server (from the repository root):
+    python -m common.mcp_pool bench --tools 40 --startup-delay 0.3 --list-delay 0.5
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from google.adk.tools.mcp_tool.mcp_session_manager import (
+    MCPSessionManager,
+    StdioConnectionParams,
+)
+from google.adk.tools.mcp_tool.mcp_tool import McpTool
+from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
+from mcp import StdioServerParameters
+from mcp.types import Tool as McpToolSchema
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cache file layout changes; older files are ignored
+CACHE_FORMAT = 1
+
+
+def connection_fingerprint(connection_params) -> str:
+    """Stable hash of where and how a server is reached (command/URL, args, headers)."""
+    if isinstance(connection_params, StdioServerParameters):
+        connection_params = StdioConnectionParams(server_params=connection_params)
+    if isinstance(connection_params, StdioConnectionParams):
+        server = connection_params.server_params
+        spec = {"command": server.command, "args": server.args, "env": server.env, "cwd": str(server.cwd or "")}
+    else:
+        spec = {"url": connection_params.url, "headers": getattr(connection_params, "headers", None)}
+    spec["type"] = type(connection_params).__name__
+    text = json.dumps(spec, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:24]
+
+
+# ============================================================================
+# SESSION POOL
+# ============================================================================
+
+class PooledSessionManager(MCPSessionManager):
+    """
+    MCPSessionManager shared through an MCPSessionPool.
+
+    Counts new and reused sessions, keeps open sessions alive with pings, and
+    starts over cleanly when used from a new event loop (asyncio.run() called
+    again), since sessions cannot move between loops.
+    """
+
+    def __init__(self, connection_params, pool: "MCPSessionPool", errlog=sys.stderr):
+        super().__init__(connection_params=connection_params, errlog=errlog)
+        self._pool = pool
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._known_sessions: set[int] = set()
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._dropped: list = []
+        self._openers: dict[int, Optional[asyncio.Task]] = {}
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._sessions = {}
+            self._session_lock = asyncio.Lock()
+            self._keepalive_task = None
+            self._dropped = []
+
+    async def create_session(self, headers: Optional[dict[str, str]] = None):
+        self._bind_loop()
+        started = time.perf_counter()
+        session = await super().create_session(headers=headers)
+        if id(session) in self._known_sessions:
+            self._pool.sessions_reused += 1
+        else:
+            self._known_sessions.add(id(session))
+            self._openers[id(session)] = asyncio.current_task()
+            self._pool.sessions_created += 1
+            self._pool.connect_seconds += time.perf_counter() - started
+        if self._pool.keepalive and self._keepalive_task is None:
+            self._keepalive_task = asyncio.create_task(self._keepalive())
+        return session
+
+    def opened_by_current_task(self, session) -> bool:
+        """Whether `session` was opened by the running task (not reused from another)."""
+        return self._openers.get(id(session)) is asyncio.current_task()
+
+    async def _keepalive(self) -> None:
+        while True:
+            await asyncio.sleep(self._pool.keepalive)
+            for key, (session, exit_stack) in list(self._sessions.items()):
+                try:
+                    await asyncio.wait_for(session.send_ping(), timeout=self._pool.ping_timeout)
+                    self._pool.pings += 1
+                except Exception as e:
+                    # Forget it so the next create_session() connects again. Its
+                    # cancel scopes belong to the task that opened it, so it is
+                    # closed later by close(), not from this task.
+                    self._pool.ping_failures += 1
+                    logger.info("MCP session %s failed keepalive (%r); dropping it", key, e)
+                    async with self._session_lock:
+                        if self._sessions.get(key, (None,))[0] is session:
+                            del self._sessions[key]
+                            self._dropped.append(exit_stack)
+
+    async def close(self):
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        await super().close()
+        self._openers.clear()
+        while self._dropped:
+            try:
+                await self._dropped.pop().aclose()
+            except Exception:
+                pass
+
+
+class MCPSessionPool:
+    """
+    Process-wide MCP session managers, one per server fingerprint.
+
+    Args:
+        keepalive (float): Seconds between pings of open sessions (0 = no pings).
+        ping_timeout (float): Seconds a ping may take before the session is dropped.
+    """
+
+    def __init__(self, keepalive: float = 30.0, ping_timeout: float = 10.0):
+        self.keepalive = keepalive
+        self.ping_timeout = ping_timeout
+        self._managers: dict[str, PooledSessionManager] = {}
+        self.sessions_created = 0
+        self.sessions_reused = 0
+        self.connect_seconds = 0.0
+        self.pings = 0
+        self.ping_failures = 0
+
+    def manager(self, connection_params, errlog=sys.stderr) -> PooledSessionManager:
+        """The shared session manager for this server (created on first use, never connects)."""
+        key = connection_fingerprint(connection_params)
+        if key not in self._managers:
+            self._managers[key] = PooledSessionManager(connection_params, self, errlog=errlog)
+        return self._managers[key]
+
+    async def warm(self, *connection_params) -> None:
+        """Open sessions ahead of the first request."""
+        await asyncio.gather(*(self.manager(params).create_session() for params in connection_params))
+
+    async def close(self) -> None:
+        """Close every pooled session (call once, at process shutdown)."""
+        # Newest first: stdio sessions opened in one task must close in reverse order
+        for manager in reversed(list(self._managers.values())):
+            await manager.close()
+
+    def stats(self) -> dict:
+        return {
+            "servers": len(self._managers),
+            "sessions_created": self.sessions_created,
+            "sessions_reused": self.sessions_reused,
+            "connect_s": round(self.connect_seconds, 3),
+            "pings": self.pings,
+            "ping_failures": self.ping_failures,
+        }
+
+
+_default_pool: Optional[MCPSessionPool] = None
+
+
+def default_pool() -> MCPSessionPool:
+    """The process-wide pool (MCP_KEEPALIVE seconds between pings, default 30; 0 = off)."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = MCPSessionPool(keepalive=float(os.getenv("MCP_KEEPALIVE", "30")))
+    return _default_pool
+
+
+# ============================================================================
+# DISCOVERY CACHE
+# ============================================================================
+
+class ToolSchemaCache:
+    """
+    Discovered MCP tool schemas on disk, one JSON file per server.
+
+    Each file records the cache format, a hash of the schemas and a version
+    that increases whenever the server's tools change. Files are replaced
+    atomically, so concurrent workers never read a partial file.
+
+    Args:
+        directory (str): Where the files live (created if missing).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _path(self, fingerprint: str) -> Path:
+        return self.directory / f"{fingerprint}.json"
+
+    def load(self, fingerprint: str) -> Optional[dict]:
+        """{"tools": [mcp Tool], "fetched_at", "version", "schema_hash"}, or None."""
+        try:
+            data = json.loads(self._path(fingerprint).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if data.get("format") != CACHE_FORMAT:
+            return None
+        try:
+            data["tools"] = [McpToolSchema.model_validate(tool) for tool in data["tools"]]
+        except Exception:
+            return None
+        return data
+
+    def save(self, fingerprint: str, tools: list) -> dict:
+        """Write `tools`; returns the entry, with `changed` telling whether the schemas differ."""
+        dumped = [tool.model_dump(mode="json", by_alias=True, exclude_none=True) for tool in tools]
+        schema_hash = hashlib.sha256(json.dumps(dumped, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        previous = self.load(fingerprint)
+        changed = previous is None or previous["schema_hash"] != schema_hash
+        version = (previous["version"] if previous else 0) + (1 if changed else 0)
+        entry = {
+            "format": CACHE_FORMAT,
+            "version": version,
+            "schema_hash": schema_hash,
+            "fetched_at": time.time(),
+            "tools": dumped,
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, self._path(fingerprint))
+        return {**entry, "tools": tools, "changed": changed}
+
+
+def schema_cache_from_env() -> Optional[ToolSchemaCache]:
+    """ToolSchemaCache in MCP_TOOL_CACHE_DIR (default .mcp_cache; empty = no disk cache)."""
+    directory = os.getenv("MCP_TOOL_CACHE_DIR", ".mcp_cache")
+    return ToolSchemaCache(directory) if directory else None
+
+
+# ============================================================================
+# TOOLSET
+# ============================================================================
+
+class PooledMCPToolset(McpToolset):
+    """
+    McpToolset backed by the shared session pool and the discovery cache.
+
+    Args:
+        connection_params: Same as McpToolset.
+        pool (MCPSessionPool): Defaults to the process-wide pool.
+        schema_cache (ToolSchemaCache): Defaults to schema_cache_from_env().
+        refresh_after (float): Age in seconds after which cached schemas are
+            refreshed from the server in the background.
+        **kwargs: Passed to McpToolset (tool_filter, tool_name_prefix, ...).
+
+    close() leaves the pooled sessions open, so closing a Runner doesn't cost
+    the next Runner a reconnect; MCPSessionPool.close() shuts them down.
+    """
+
+    def __init__(
+        self,
+        *,
+        connection_params,
+        pool: Optional[MCPSessionPool] = None,
+        schema_cache: Optional[ToolSchemaCache] = None,
+        refresh_after: float = 3600.0,
+        **kwargs,
+    ):
+        super().__init__(connection_params=connection_params, **kwargs)
+        self._pool = pool or default_pool()
+        self._mcp_session_manager = self._pool.manager(connection_params, errlog=self._errlog)
+        self._fingerprint = connection_fingerprint(connection_params)
+        self._schema_cache = schema_cache if schema_cache is not None else schema_cache_from_env()
+        self._refresh_after = refresh_after
+        self._schemas: Optional[list] = None
+        self._adk_tools: list[McpTool] = []
+        self._fetched_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.discovery = {"source": None, "seconds": 0.0, "version": None, "refreshes": 0}
+
+    def _use(self, schemas: list, fetched_at: float, version: Optional[int]) -> None:
+        self._schemas = schemas
+        self._fetched_at = fetched_at
+        self.discovery["version"] = version
+        self._adk_tools = [
+            McpTool(
+                mcp_tool=schema,
+                mcp_session_manager=self._mcp_session_manager,
+                auth_scheme=self._auth_scheme,
+                auth_credential=self._auth_credential,
+                require_confirmation=self._require_confirmation,
+                header_provider=self._header_provider,
+            )
+            for schema in schemas
+        ]
+
+    async def _discover(self) -> None:
+        session = await self._mcp_session_manager.create_session()
+        schemas = (await session.list_tools()).tools
+        version = None
+        if self._schema_cache is not None:
+            entry = self._schema_cache.save(self._fingerprint, schemas)
+            version = entry["version"]
+            if entry["changed"] and self._schemas is not None:
+                logger.info("MCP tools changed on %s (schema version %s)", self._fingerprint, version)
+        self._use(schemas, time.time(), version)
+
+    async def _refresh(self) -> None:
+        try:
+            await self._discover()
+            self.discovery["refreshes"] += 1
+        except Exception as e:
+            logger.warning("Background MCP tool refresh failed; keeping cached tools: %s", e)
+
+    async def get_tools(self, readonly_context=None) -> list:
+        if self._header_provider and readonly_context:
+            # Headers vary per request, and so may the tools; no shared cache
+            return await super().get_tools(readonly_context)
+        if self._schemas is None:
+            started = time.perf_counter()
+            cached = self._schema_cache.load(self._fingerprint) if self._schema_cache else None
+            if cached is not None:
+                self._use(cached["tools"], cached["fetched_at"], cached["version"])
+                self.discovery["source"] = "disk"
+            else:
+                await self._discover()
+                self.discovery["source"] = "server"
+            self.discovery["seconds"] = round(time.perf_counter() - started, 4)
+        stale = time.time() - self._fetched_at > self._refresh_after
+        if stale and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._refresh())
+        return [tool for tool in self._adk_tools if self._is_tool_selected(tool, readonly_context)]
+
+    async def close(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def stub_server_params(
+    name: str = "stub",
+    tools: int = 40,
+    startup_delay: float = 0.0,
+    list_delay: float = 0.0,
+    call_delay: float = 0.0,
+    fail: bool = False,
+    timeout: float = 30.0,
+) -> StdioConnectionParams:
+    """Connection params that launch common/mcp_stub_server.py over stdio."""
+    args = [
+        "-m", "common.mcp_stub_server", "--name", name, "--tools", str(tools),
+        "--startup-delay", str(startup_delay), "--list-delay", str(list_delay),
+        "--call-delay", str(call_delay),
+    ]
+    if fail:
+        args.append("--fail")
+    return StdioConnectionParams(
+        server_params=StdioServerParameters(
+            command=sys.executable, args=args, cwd=str(Path(__file__).resolve().parents[1])
+        ),
+        timeout=timeout,
+    )
+
+
+async def _timed(coro) -> tuple[Any, float]:
+    started = time.perf_counter()
+    result = await coro
+    return result, time.perf_counter() - started
+
+
+async def _bench(tools: int, startup_delay: float, list_delay: float, workers: int) -> dict:
+    params = stub_server_params(tools=tools, startup_delay=startup_delay, list_delay=list_delay)
+    report: dict[str, Any] = {"tools": tools, "startup_delay_s": startup_delay, "list_delay_s": list_delay}
+
+    # Unpooled: every toolset (one per agent/Runner) connects and discovers
+    unpooled = [McpToolset(connection_params=params) for _ in range(workers)]
+    started = time.perf_counter()
+    for toolset in unpooled:
+        await toolset.get_tools()
+    report["unpooled_get_tools_s"] = round(time.perf_counter() - started, 3)
+    # anyio cancel scopes must exit in reverse order of entry
+    for toolset in reversed(unpooled):
+        await toolset.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Cold worker: shared pool, empty disk cache
+        pool = MCPSessionPool(keepalive=0)
+        toolsets = [
+            PooledMCPToolset(connection_params=params, pool=pool, schema_cache=ToolSchemaCache(directory))
+            for _ in range(workers)
+        ]
+        started = time.perf_counter()
+        for toolset in toolsets:
+            await toolset.get_tools()
+        report["pooled_cold_get_tools_s"] = round(time.perf_counter() - started, 3)
+        echo = next(tool for tool in await toolsets[-1].get_tools() if tool.name == "echo")
+        _, call = await _timed(echo.run_async(args={"text": "hi"}, tool_context=None))
+        report["pooled_tool_call_s"] = round(call, 4)
+        report["pool"] = pool.stats()
+        await pool.close()
+
+        # Warm worker (new process after a scale-up): schemas come from disk
+        pool = MCPSessionPool(keepalive=0)
+        toolset = PooledMCPToolset(connection_params=params, pool=pool, schema_cache=ToolSchemaCache(directory))
+        _, warm = await _timed(toolset.get_tools())
+        report["disk_cache_get_tools_s"] = round(warm, 4)
+        report["disk_cache_source"] = toolset.discovery["source"]
+        report["disk_cache_connected"] = pool.stats()["sessions_created"] > 0
+        await pool.close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP session pool and discovery cache utilities.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    bench = commands.add_parser("bench", help="Unpooled vs pooled vs disk-cached discovery against the stub server")
+    bench.add_argument("--tools", type=int, default=40)
+    bench.add_argument("--startup-delay", type=float, default=0.3)
+    bench.add_argument("--list-delay", type=float, default=0.5)
+    bench.add_argument("--workers", type=int, default=3, help="Toolsets (agents/Runners) in the process")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    print(json.dumps(asyncio.run(_bench(args.tools, args.startup_delay, args.list_delay, args.workers)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
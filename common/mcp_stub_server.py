@@ -0,0 +1,130 @@
+"""
+MCP Stub Server - A local MCP server with injectable delays and failures
+
+Stands in for GitHub, Firecrawl or any other MCP server when measuring
+connection, discovery and tool-call costs offline. It speaks real MCP (the
+`mcp` package's FastMCP), over stdio by default:
+
+    StdioConnectionParams(
+        server_params=StdioServerParameters(
+            command=sys.executable,
+            args=["-m", "common.mcp_stub_server", "--name", "github", "--tools", "40",
+                  "--startup-delay", "0.3", "--list-delay", "0.5"],
+            cwd=REPO_ROOT,
+        ),
+    )
+
+Tools: `echo(text)`, `add(a, b)`, `server_info()` and `--tools N` synthetic
+GitHub-style tools (`search_repositories`, `list_issues`, ...).
+
+Delays:
+    --startup-delay  seconds before the server starts reading (process spin-up, npx install)
+    --list-delay     seconds added to every tools/list (discovery)
+    --call-delay     seconds added to every tool call
+    --fail           exit with an error before serving (a dead server)
+
+Run over HTTP instead with `--transport streamable-http --port 8765`.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from mcp.server.fastmcp import FastMCP
+
+_VERBS = ("search", "list", "get", "create", "update")
+_NOUNS = (
+    "repositories", "issues", "pull_requests", "commits", "branches", "releases",
+    "workflows", "notifications", "code", "users", "tags", "discussions",
+)
+
+
+def synthetic_tool_names(count: int) -> list[str]:
+    """`count` distinct GitHub-style tool names."""
+    names = [f"{verb}_{noun}" for noun in _NOUNS for verb in _VERBS]
+    names += [f"stub_tool_{i}" for i in range(max(0, count - len(names)))]
+    return names[:count]
+
+
+class StubServer(FastMCP):
+    """FastMCP with a configurable delay on tools/list."""
+
+    def __init__(self, name: str, list_delay: float = 0.0, **kwargs):
+        super().__init__(name, **kwargs)
+        self.list_delay = list_delay
+
+    async def list_tools(self):
+        if self.list_delay:
+            await asyncio.sleep(self.list_delay)
+        return await super().list_tools()
+
+
+def build_server(name: str, tools: int = 0, list_delay: float = 0.0, call_delay: float = 0.0, **kwargs) -> StubServer:
+    server = StubServer(name, list_delay=list_delay, **kwargs)
+    started = time.time()
+
+    async def pause():
+        if call_delay:
+            await asyncio.sleep(call_delay)
+
+    @server.tool()
+    async def echo(text: str) -> str:
+        """Return the text unchanged."""
+        await pause()
+        return text
+
+    @server.tool()
+    async def add(a: float, b: float) -> float:
+        """Add two numbers."""
+        await pause()
+        return a + b
+
+    @server.tool()
+    async def server_info() -> dict:
+        """Name, process id and uptime of this stub server."""
+        await pause()
+        return {"name": name, "pid": os.getpid(), "uptime_s": round(time.time() - started, 3)}
+
+    def synthetic_tool(tool_name: str):
+        async def synthetic(owner: str = "", repo: str = "", query: str = "") -> dict:
+            await pause()
+            return {"tool": tool_name, "owner": owner, "repo": repo, "query": query, "items": []}
+        return synthetic
+
+    for tool_name in synthetic_tool_names(tools):
+        verb, _, noun = tool_name.partition("_")
+        server.add_tool(
+            synthetic_tool(tool_name),
+            name=tool_name,
+            description=f"{verb.capitalize()} {noun.replace('_', ' ')} for a GitHub repository (stub).",
+        )
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local MCP stub server.")
+    parser.add_argument("--name", default="stub")
+    parser.add_argument("--tools", type=int, default=0, help="Synthetic GitHub-style tools to expose")
+    parser.add_argument("--startup-delay", type=float, default=0.0)
+    parser.add_argument("--list-delay", type=float, default=0.0)
+    parser.add_argument("--call-delay", type=float, default=0.0)
+    parser.add_argument("--fail", action="store_true", help="Exit with an error instead of serving")
+    parser.add_argument("--transport", choices=["stdio", "streamable-http"], default="stdio")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.startup_delay:
+        time.sleep(args.startup_delay)
+    if args.fail:
+        print(f"{args.name}: failing on purpose (--fail)", file=sys.stderr)
+        sys.exit(1)
+    server = build_server(
+        args.name, args.tools, args.list_delay, args.call_delay, port=args.port, log_level="WARNING"
+    )
+    server.run(transport=args.transport)
+
+
+if __name__ == "__main__":
+    main()
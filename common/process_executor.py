@@ -0,0 +1,380 @@
+"""
+Warm Process Pool Executor - Local code execution without interpreter start-up
+
+`BuiltInCodeExecutor` runs code inside Gemini, so it needs the network and a
+Gemini model. Running code locally by spawning a fresh interpreter costs
+hundreds of milliseconds per snippet once numpy and pandas are imported.
+This module keeps a pool of worker processes that have already imported them:
+
+- One worker per core by default; each runs one snippet at a time
+- Per-execution wall-clock timeout, CPU-seconds limit and memory limit
+- stdout and stderr captured per run (tracebacks go to stderr)
+- Workers are recycled after `max_runs` snippets or when a snippet leaves a
+  thread running, and replaced after a timeout or a crash (including one
+  found dead while idle), so leaked state never outlives a few runs
+
+Workers are separate processes in a scratch directory with rlimits applied;
+this isolates crashes and runaway code, but it is not a security sandbox.
+CPU and memory limits use the `resource` module and are skipped where it is
+not available (Windows).
+
+ADK calls a code executor's execute_code synchronously on the event loop,
+so WarmProcessCodeExecutor runs one snippet at a time and blocks other
+sessions while it does. run_python_tool() exposes the same pool as an async
+function tool instead: each call waits for a worker in a thread, so snippets
+from concurrent sessions run on separate workers (and cores).
+
+Usage:
+    pool = WarmWorkerPool(size=4)
+    agent = Agent(..., tools=[run_python_tool(pool)])
+    agent = Agent(..., code_executor=WarmProcessCodeExecutor(pool=pool))
+
+    result = pool.run("import numpy as np; print(np.arange(5).sum())")
+"""
+
+import asyncio
+import atexit
+import json
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.code_executors import BaseCodeExecutor
+from google.adk.code_executors.code_execution_utils import CodeExecutionInput, CodeExecutionResult
+from pydantic import ConfigDict, Field
+
+# Runs inside each worker: preload, then execute one JSON request per stdin line
+WORKER_SCRIPT = r'''
+import contextlib, io, json, math, os, sys, threading, traceback
+
+# Keep the protocol on a private fd; stray writes to fd 1 go to /dev/null
+proto = os.fdopen(os.dup(1), "w")
+os.dup2(os.open(os.devnull, os.O_WRONLY), 1)
+
+preloaded = {}
+for name, alias in json.loads(sys.argv[1]):
+    try:
+        preloaded[alias] = __import__(name)
+    except ImportError:
+        pass
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+if resource is not None and int(sys.argv[2]) and os.path.exists("/proc/self/statm"):
+    # Address-space cap on top of what the preloaded libraries already map
+    with open("/proc/self/statm") as f:
+        current = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    limit = current + int(sys.argv[2]) * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+proto.write(json.dumps({"ready": sorted(preloaded)}) + "\n")
+proto.flush()
+
+for line in sys.stdin:
+    request = json.loads(line)
+    if resource is not None and request["cpu_seconds"]:
+        used = resource.getrusage(resource.RUSAGE_SELF)
+        soft = math.ceil(used.ru_utime + used.ru_stime) + request["cpu_seconds"]
+        hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    stdout, stderr = io.StringIO(), io.StringIO()
+    namespace = {"__name__": "__main__", **preloaded}
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            exec(compile(request["code"], "<snippet>", "exec"), namespace)
+        except MemoryError:
+            print("MemoryError: memory limit exceeded", file=sys.stderr)
+        except BaseException:
+            traceback.print_exc()
+    if resource is not None and request["cpu_seconds"]:
+        # Lift the limit while idle; the pool recycles a worker left with threads
+        hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+    reply = {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "threads": threading.active_count()}
+    proto.write(json.dumps(reply) + "\n")
+    proto.flush()
+'''
+
+DEFAULT_PRELOAD = (("numpy", "np"), ("pandas", "pd"), ("math", "math"), ("json", "json"))
+
+
+@dataclass
+class RunResult:
+    stdout: str = ""
+    stderr: str = ""
+    duration: float = 0.0
+    timed_out: bool = False
+    worker_restarted: bool = False
+
+
+class _Worker:
+    """One warm interpreter plus a reader thread for its protocol pipe."""
+
+    def __init__(self, preload, memory_mb: int, workdir: str):
+        env = dict(os.environ)
+        # One BLAS thread per worker; the pool provides the parallelism
+        env.update(OMP_NUM_THREADS="1", OPENBLAS_NUM_THREADS="1", MKL_NUM_THREADS="1")
+        self.proc = subprocess.Popen(
+            [sys.executable, "-c", WORKER_SCRIPT, json.dumps(list(preload)), str(memory_mb)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            cwd=workdir,
+            env=env,
+        )
+        self.lines: queue.Queue = queue.Queue()
+        self.runs = 0
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.proc.stdout:
+            self.lines.put(line)
+        self.lines.put(None)  # EOF: the worker died
+
+    def wait_ready(self, timeout: float) -> bool:
+        try:
+            return self.lines.get(timeout=timeout) is not None
+        except queue.Empty:
+            return False
+
+    def kill(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.wait()
+
+
+class WarmWorkerPool:
+    """
+    Pool of pre-warmed Python worker processes.
+
+    Args:
+        size (int): Number of workers (default: CPU count).
+        preload (tuple): (module, alias) pairs imported in every worker and
+            available to snippets without an import.
+        max_runs (int): Recycle a worker after this many snippets.
+        timeout (float): Wall-clock seconds per snippet.
+        wait_timeout (float): Seconds to wait for an idle worker (and for a
+            new worker to finish starting) before giving up.
+        cpu_seconds (int): CPU-time limit per snippet (0 = none).
+        memory_mb (int): Extra address space a worker may map (0 = none).
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        preload=DEFAULT_PRELOAD,
+        max_runs: int = 50,
+        timeout: float = 10.0,
+        cpu_seconds: int = 10,
+        memory_mb: int = 1024,
+        wait_timeout: float = 30.0,
+    ):
+        self.size = size or os.cpu_count() or 1
+        self.preload = tuple(preload)
+        self.max_runs = max_runs
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.wait_timeout = wait_timeout
+        self._workdir = tempfile.mkdtemp(prefix="adk-code-")
+        self._idle: queue.Queue = queue.Queue()
+        self._closed = False
+        self.stats = {"runs": 0, "timeouts": 0, "crashes": 0, "recycled": 0, "busy": 0}
+        self._stats_lock = threading.Lock()
+        # Warm all workers in parallel; the first run only waits for one
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+        atexit.register(self.close)
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self.preload, self.memory_mb, self._workdir)
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _replace(self, worker: _Worker) -> None:
+        worker.kill()
+        if not self._closed:
+            self._idle.put(self._spawn())
+
+    def _checkout(self) -> Optional[_Worker]:
+        """An idle worker that is still alive, or None after wait_timeout."""
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            try:
+                worker = self._idle.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                return None
+            if worker.proc.poll() is None:
+                return worker
+            # Died while idle (killed from outside, or by a thread a snippet left behind)
+            self._count("crashes")
+            self._replace(worker)
+
+    def run(self, code: str, timeout: Optional[float] = None) -> RunResult:
+        """
+        Execute `code` in an idle worker and return its captured output.
+
+        Blocks the calling thread; call it through asyncio.to_thread (as
+        run_python_tool does) from async code.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        request = json.dumps({"code": code, "cpu_seconds": self.cpu_seconds}) + "\n"
+        # A worker can die between the liveness check and the write: retry once
+        for attempt in range(2):
+            worker = self._checkout()
+            if worker is None:
+                self._count("busy")
+                return RunResult(stderr=f"No idle worker within {self.wait_timeout:g}s (all {self.size} busy)")
+            if worker.runs == 0 and not worker.wait_ready(timeout=self.wait_timeout):
+                self._count("crashes")
+                self._replace(worker)
+                return RunResult(stderr="Worker failed to start", worker_restarted=True)
+            try:
+                worker.proc.stdin.write(request)
+                worker.proc.stdin.flush()
+                break
+            except (BrokenPipeError, OSError):
+                self._count("crashes")
+                self._replace(worker)
+        else:
+            return RunResult(stderr="Worker exited before the snippet could be sent", worker_restarted=True)
+
+        started = time.perf_counter()
+        worker.runs += 1
+        self._count("runs")
+        try:
+            line = worker.lines.get(timeout=timeout)
+        except queue.Empty:
+            self._count("timeouts")
+            self._replace(worker)
+            return RunResult(
+                stderr=f"TimeoutError: execution exceeded {timeout:g}s",
+                duration=time.perf_counter() - started,
+                timed_out=True,
+                worker_restarted=True,
+            )
+        duration = time.perf_counter() - started
+
+        if line is None:
+            # Killed by the CPU limit (SIGXCPU), the OOM killer or a hard crash
+            self._count("crashes")
+            exit_code = worker.proc.wait()
+            self._replace(worker)
+            return RunResult(
+                stderr=f"Worker exited with code {exit_code} (CPU/memory limit or crash)",
+                duration=duration,
+                worker_restarted=True,
+            )
+
+        reply = json.loads(line)
+        # A thread the snippet started would keep running into the next snippet
+        if worker.runs >= self.max_runs or reply.get("threads", 1) > 1:
+            self._count("recycled")
+            threading.Thread(target=self._replace, args=(worker,), daemon=True).start()
+        else:
+            self._idle.put(worker)
+        return RunResult(stdout=reply["stdout"], stderr=reply["stderr"], duration=duration)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().kill()
+            except queue.Empty:
+                break
+
+
+class WarmProcessCodeExecutor(BaseCodeExecutor):
+    """
+    ADK code executor backed by a WarmWorkerPool.
+
+    Works offline and with any model: code blocks in the model's reply are run
+    locally and the output is sent back, like the other non-built-in executors.
+    Each snippet runs in a fresh namespace (not stateful).
+
+    ADK calls execute_code synchronously on the event loop, so this runs one
+    snippet at a time in the process. Use run_python_tool() when several
+    sessions share the pool.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    pool: Optional[WarmWorkerPool] = Field(default=None, exclude=True)
+
+    def model_post_init(self, __context) -> None:
+        if self.pool is None:
+            self.pool = WarmWorkerPool()
+
+    def execute_code(
+        self,
+        invocation_context: InvocationContext,
+        code_execution_input: CodeExecutionInput,
+    ) -> CodeExecutionResult:
+        result = self.pool.run(code_execution_input.code)
+        return CodeExecutionResult(stdout=result.stdout, stderr=result.stderr, output_files=[])
+
+
+def run_python_tool(pool: WarmWorkerPool) -> Callable:
+    """
+    Async function tool that runs Python in `pool`.
+
+    Each call waits for a worker in a thread, so the event loop stays free and
+    concurrent calls run on separate workers.
+    """
+
+    async def run_python(code: str) -> dict:
+        """
+        Runs a Python snippet and returns what it printed.
+
+        numpy (np), pandas (pd), math and json are already imported. Use print()
+        to show results; each call starts with a fresh namespace.
+
+        Args:
+            code (str): The Python code to run.
+
+        Returns:
+            dict: stdout, stderr, duration in seconds and whether it timed out.
+        """
+        result = await asyncio.to_thread(pool.run, code)
+        return {
+            "status": "error" if result.timed_out or result.worker_restarted else "success",
+            "stdout": result.stdout,
+            "stderr": result.stderr,
+            "duration_s": round(result.duration, 3),
+            "timed_out": result.timed_out,
+        }
+
+    return run_python
+
+
+def code_execution_from_env(default: BaseCodeExecutor) -> dict:
+    """
+    Agent keyword arguments for running code: `code_executor=default`, unless
+    CODE_EXECUTOR=local, in which case `tools=[run_python]` on a warm pool.
+
+    Pool settings: CODE_POOL_SIZE (default CPU count), CODE_TIMEOUT (10 s),
+    CODE_CPU_SECONDS (10), CODE_MEMORY_MB (1024), CODE_MAX_RUNS (50).
+    """
+    if os.getenv("CODE_EXECUTOR") != "local":
+        return {"code_executor": default}
+    pool = WarmWorkerPool(
+        size=int(os.getenv("CODE_POOL_SIZE", "0")) or None,
+        timeout=float(os.getenv("CODE_TIMEOUT", "10")),
+        cpu_seconds=int(os.getenv("CODE_CPU_SECONDS", "10")),
+        memory_mb=int(os.getenv("CODE_MEMORY_MB", "1024")),
+        max_runs=int(os.getenv("CODE_MAX_RUNS", "50")),
+    )
+    return {"tools": [run_python_tool(pool)]}
@@ -0,0 +1,194 @@
+"""
+Retrieval Cache - Two-level cache for RAG tool calls
+
+FAQ-style traffic asks the same questions over and over, and each
+`retrieve_documents` call embeds the query and searches the index again.
+CachedRetriever puts two LRU levels in front of a local index:
+
+1. Query embeddings, keyed by the normalized query text
+2. Retrieved chunks, keyed by (query embedding, top_k, threshold, corpus version)
+
+The corpus version is the identity of the index on disk. When the index is
+rebuilt (e.g. by common.ingest), LocalVectorIndex reopens it and the next
+call clears both levels, so stale chunks are never served. Both levels also expire after a TTL.
+
+Usage:
+    retriever = CachedRetriever("rag_index", hybrid=True)
+    tool = HybridRagRetrieval(name=..., description=..., retriever=retriever)
+    # or: LocalRagRetrieval(name=..., description=..., index=CachedRetriever("rag_index"))
+
+    retriever.search("How do I reset my password?", top_k=4)
+    print(retriever.cache.stats())
+"""
+
+import hashlib
+import os
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from .search_cache import SearchCache
+from .vector_index import LocalVectorIndex
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation; identifiers stay intact."""
+    return " ".join(query.lower().split()).rstrip("?!. ")
+
+
+class RetrievalCache:
+    """
+    Query-embedding and retrieval-result LRU caches with shared invalidation.
+
+    Args:
+        max_queries (int): Max cached query embeddings.
+        max_results (int): Max cached result lists.
+        ttl (float): Seconds an entry stays fresh in either level.
+    """
+
+    def __init__(self, max_queries: int = 10_000, max_results: int = 10_000, ttl: float = 3600.0):
+        self.embeddings = SearchCache(ttl=ttl, max_entries=max_queries, max_bytes=0)
+        self.results = SearchCache(ttl=ttl, max_entries=max_results, max_bytes=0)
+        self.version: Optional[str] = None
+        self.invalidations = 0
+        self.time_saved = 0.0
+        self._lock = threading.Lock()
+
+    def sync_version(self, version: str) -> bool:
+        """Record the corpus version; clears both levels (and returns True) if it changed."""
+        with self._lock:
+            if version == self.version:
+                return False
+            if self.version is not None:
+                self.embeddings.clear()
+                self.results.clear()
+                self.invalidations += 1
+            self.version = version
+            return True
+
+    def _lookup(self, level: SearchCache, key: str):
+        with self._lock:
+            value = level.get(key)
+            if value is None:
+                level.misses += 1
+            else:
+                level.hits += 1
+            return value
+
+    def _store(self, level: SearchCache, key: str, value) -> None:
+        with self._lock:
+            level.put(key, value)
+
+    def embedding(self, text: str, embed) -> np.ndarray:
+        """Cached embedding of `text`; `embed(text)` computes it on a miss."""
+        key = normalize_query(text)
+        vector = self._lookup(self.embeddings, key)
+        if vector is None:
+            started = time.perf_counter()
+            vector = np.asarray(embed(text), dtype=np.float32)
+            vector.setflags(write=False)
+            self._store(self.embeddings, key, (vector, time.perf_counter() - started))
+            return vector
+        vector, cost = vector
+        self.time_saved += cost
+        return vector
+
+    def results_for(self, vector: np.ndarray, params: tuple, search) -> list[dict]:
+        """Cached result list for (vector, params, version); `search()` fills a miss."""
+        digest = hashlib.sha256(vector.tobytes()).hexdigest()[:32]
+        key = f"{self.version}|{digest}|{params!r}"
+        cached = self._lookup(self.results, key)
+        if cached is None:
+            started = time.perf_counter()
+            hits = search()
+            self._store(self.results, key, (hits, time.perf_counter() - started))
+        else:
+            hits, cost = cached
+            self.time_saved += cost
+        # Copies, so callers can't edit the cached entry
+        return [dict(hit) for hit in hits]
+
+    def stats(self) -> dict:
+        embeddings = self.embeddings.stats()
+        results = self.results.stats()
+        return {
+            "query_embeddings": {k: embeddings[k] for k in ("entries", "hits", "misses", "evictions", "expired", "hit_rate")},
+            "results": {k: results[k] for k in ("entries", "hits", "misses", "evictions", "expired", "hit_rate")},
+            "invalidations": self.invalidations,
+            "time_saved_s": round(self.time_saved, 3),
+        }
+
+
+class CachedRetriever:
+    """
+    A LocalVectorIndex (or HybridRetriever over one) behind a RetrievalCache.
+
+    Has the same `search(text, top_k, max_distance, nprobe)` signature, so it
+    can be passed as `index=` to LocalRagRetrieval or as `retriever=` to
+    HybridRagRetrieval.
+
+    Args:
+        index_path (str): Index directory.
+        hybrid (bool): Wrap a HybridRetriever instead of plain vector search.
+        cache (RetrievalCache): Cache to use (a new one by default).
+        check_interval (float): Seconds between checks for a rebuilt index.
+    """
+
+    def __init__(
+        self,
+        index_path: str,
+        hybrid: bool = False,
+        cache: Optional[RetrievalCache] = None,
+        check_interval: float = 1.0,
+    ):
+        self.index_path = index_path
+        self.hybrid = hybrid
+        self.cache = cache or RetrievalCache()
+        # The index reopens itself when a new version is published
+        self.index = LocalVectorIndex(index_path, check_interval=check_interval)
+        if hybrid:
+            from .hybrid_retrieval import HybridRetriever
+            self.backend = HybridRetriever(self.index)
+        else:
+            self.backend = self.index
+        self.cache.sync_version(self.index.version)
+
+    def _refresh(self) -> None:
+        """Clear the cache if the index picked up a new version since the last call."""
+        self.cache.sync_version(self.index.snapshot().version)
+
+    def search(
+        self,
+        text: str,
+        top_k: int = 10,
+        max_distance: Optional[float] = None,
+        nprobe: int = 8,
+    ) -> list[dict]:
+        self._refresh()
+        backend, embedder = self.backend, self.index.embedder
+        vector = self.cache.embedding(text, lambda t: embedder.embed([t])[0])
+        # Keyword ranking depends on the words, not only on the embedding
+        keywords = normalize_query(text) if self.hybrid else None
+        return self.cache.results_for(
+            vector,
+            (keywords, top_k, max_distance, nprobe),
+            lambda: backend.search(text, top_k, max_distance, nprobe, query_vector=vector),
+        )
+
+
+def retrieval_cache_from_env() -> Optional[RetrievalCache]:
+    """
+    RetrievalCache configured from environment variables, or None if disabled.
+
+    RAG_CACHE ("0" disables, default on), RAG_CACHE_MAX_QUERIES (10000),
+    RAG_CACHE_MAX_RESULTS (10000), RAG_CACHE_TTL (seconds, 3600).
+    """
+    if os.getenv("RAG_CACHE", "1") == "0":
+        return None
+    return RetrievalCache(
+        max_queries=int(os.getenv("RAG_CACHE_MAX_QUERIES", "10000")),
+        max_results=int(os.getenv("RAG_CACHE_MAX_RESULTS", "10000")),
+        ttl=float(os.getenv("RAG_CACHE_TTL", "3600")),
+    )
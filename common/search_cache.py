@@ -0,0 +1,299 @@
+"""
+Search Cache - TTL cache with request coalescing for google_search agents
+
+`google_search` is a Gemini built-in tool: the search runs inside the model
+call, so there is no client-side search request to cache. This module caches
+one level up instead, on the search agent's grounded model call, keyed by the
+normalized question:
+
+- SearchCache: TTL + LRU cache bounded by entry count and approximate bytes,
+  with hit/miss/coalesced counters. Concurrent lookups for the same key share
+  one in-flight fetch.
+- CachedSearchModel: a BaseLlm wrapper for agents that use google_search.
+  Standalone questions ("latest news on X") are served from the cache; any
+  other request passes straight through to the wrapped model.
+- LocalSearchBackend: offline stand-in for the grounded Gemini call, answering
+  from a small in-memory corpus with configurable latency (for tests and load
+  runs without network access).
+
+Usage:
+    cache = SearchCache(ttl=300, max_entries=1000)
+    agent = Agent(
+        model=CachedSearchModel(model="gemini-2.5-flash", cache=cache),
+        tools=[google_search],
+        ...
+    )
+
+    # Offline
+    model = CachedSearchModel(inner=LocalSearchBackend(latency=0.2), cache=cache)
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, AsyncGenerator, Awaitable, Callable, Optional
+
+from google.adk.models import BaseLlm, Gemini, LlmRequest, LlmResponse
+from google.genai import types
+from pydantic import Field
+
+_NON_WORD = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return _SPACES.sub(" ", _NON_WORD.sub(" ", query.lower())).strip()
+
+
+class SearchCache:
+    """
+    In-memory TTL cache with LRU eviction and in-flight coalescing.
+
+    Args:
+        ttl (float): Seconds an entry stays fresh.
+        max_entries (int): Max entries kept (least recently used go first).
+        max_bytes (int): Approximate memory bound across all entries (0 = none).
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1000, max_bytes: int = 20_000_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[float, Any, int]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expired = 0
+
+    def get(self, key: str):
+        """Fresh value for `key`, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value, _ = entry
+        if expires < time.monotonic():
+            self._remove(key)
+            self.expired += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value, size: int = 0) -> None:
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl, value, size)
+        self._bytes += size
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        size: Callable[[Any], int] = lambda value: 0,
+    ):
+        """
+        Return the cached value, join an identical in-flight fetch, or fetch.
+
+        If the fetch raises, every waiter gets the exception and nothing is cached.
+        """
+        while True:
+            value = self.get(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            if key not in self._inflight:
+                break
+            self.coalesced += 1
+            future = self._inflight[key]
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The fetching caller was cancelled, not us: try again
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an exception nobody waited for isn't logged
+            future.exception()
+            raise
+        else:
+            self.put(key, value, size(value))
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+        }
+
+
+def _standalone_question(llm_request: LlmRequest) -> Optional[str]:
+    """The user's question if the request is a fresh text-only question, else None."""
+    if not llm_request.contents:
+        return None
+    last = llm_request.contents[-1]
+    if last.role != "user" or not last.parts or any(not p.text for p in last.parts):
+        return None
+    return " ".join(p.text for p in last.parts)
+
+
+class CachedSearchModel(BaseLlm):
+    """
+    Wraps the model behind a google_search agent with a SearchCache.
+
+    The cache key is the agent's system instruction (hashed), a hash of the
+    earlier conversation turns in the request, and the normalized question.
+    Two agents with different instructions never share answers, and a
+    follow-up such as "what about tomorrow?" is only served to a conversation
+    with the same history. Requests that continue a tool exchange bypass the
+    cache.
+
+    Attributes:
+        model: Model name reported to tools; must be a Gemini name for google_search.
+        inner: Model that does the real work (default: Gemini with `model`).
+        cache: Shared SearchCache.
+    """
+
+    model: str = "gemini-2.5-flash"
+    inner: Optional[BaseLlm] = None
+    cache: SearchCache = Field(default_factory=SearchCache, exclude=True)
+
+    def model_post_init(self, __context) -> None:
+        if self.inner is None:
+            self.inner = Gemini(model=self.model)
+
+    def _key(self, llm_request: LlmRequest, question: str) -> str:
+        instruction = ""
+        if llm_request.config is not None and llm_request.config.system_instruction:
+            instruction = str(llm_request.config.system_instruction)
+        digest = hashlib.sha256(instruction.encode("utf-8")).hexdigest()[:16]
+        key = f"{digest}:{normalize_query(question)}"
+        history = llm_request.contents[:-1]
+        if history:
+            # Earlier turns change what the question means
+            serialized = "\n".join(content.model_dump_json(exclude_none=True) for content in history)
+            key = f"{hashlib.sha256(serialized.encode('utf-8')).hexdigest()[:16]}:{key}"
+        return key
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        question = _standalone_question(llm_request)
+        if question is None:
+            async for response in self.inner.generate_content_async(llm_request, stream):
+                yield response
+            return
+
+        async def fetch() -> list[LlmResponse]:
+            return [
+                response
+                async for response in self.inner.generate_content_async(llm_request, stream)
+                if not response.partial
+            ]
+
+        responses = await self.cache.get_or_fetch(
+            self._key(llm_request, question),
+            fetch,
+            size=lambda value: sum(len(r.model_dump_json(exclude_none=True)) for r in value),
+        )
+        for response in responses:
+            # Copies, so downstream edits never change the cached entry
+            yield response.model_copy(deep=True)
+
+
+class LocalSearchBackend(BaseLlm):
+    """
+    Offline stand-in for a search-grounded Gemini call.
+
+    Answers with the corpus entries whose key words appear in the question,
+    after `latency` seconds. `call_count` counts real (uncached) calls.
+
+    Attributes:
+        corpus: Topic -> snippet.
+        latency: Simulated seconds per call.
+    """
+
+    model: str = "local-search"
+    corpus: dict[str, str] = Field(default_factory=lambda: {
+        "weather": "Weather: mild with light winds; check a local forecast for details.",
+        "ai": "AI: new model releases and agent frameworks dominate this week's news.",
+        "stock": "Stocks: major indexes closed slightly higher in light trading.",
+        "election": "Elections: results are still being counted in several regions.",
+    })
+    latency: float = 0.0
+    call_count: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.call_count += 1
+        question = _standalone_question(llm_request) or ""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        words = set(normalize_query(question).split())
+        snippets = [text for topic, text in self.corpus.items() if set(topic.split()) <= words]
+        text = "\n".join(snippets) or f"No local results for: {question}"
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            turn_complete=True,
+        )
+
+
+_shared_cache: Optional[SearchCache] = None
+
+
+def search_model_from_env(model: str = "gemini-2.5-flash") -> CachedSearchModel:
+    """
+    CachedSearchModel configured from environment variables.
+
+    SEARCH_CACHE_TTL (seconds, default 300), SEARCH_CACHE_MAX_ENTRIES
+    (default 1000) and SEARCH_BACKEND ("gemini" or "local" for the offline
+    stand-in). Every agent in the process shares one cache.
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = SearchCache(
+            ttl=float(os.getenv("SEARCH_CACHE_TTL", "300")),
+            max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1000")),
+        )
+    inner = LocalSearchBackend() if os.getenv("SEARCH_BACKEND") == "local" else None
+    return CachedSearchModel(model=model, inner=inner, cache=_shared_cache)
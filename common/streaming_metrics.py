@@ -0,0 +1,218 @@
+"""
+Streaming Metrics - Time-to-First-Token and Inter-Token Latency
+
+Wraps Runner.run_async and times every turn without changing the events
+the caller sees:
+
+- time_to_first_event: request sent -> first event of any kind
+- time_to_first_text:  request sent -> first event carrying text (TTFT)
+- inter_chunk_gap:     gap between consecutive partial text events
+- handler_time:        time the caller spent processing events between yields
+- total_time:          request sent -> last event
+
+Usage:
+    metrics = StreamingMetrics()
+    async for event in metrics.run_async(runner, user_id=..., session_id=..., new_message=...):
+        ...
+    print(metrics.format_summary())
+"""
+
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, Optional
+
+from google.adk.events import Event
+from google.adk.runners import Runner
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+DEFAULT_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(math.ceil(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Histogram:
+    """
+    Latency samples (in seconds) with bucket counts and percentile summary.
+
+    Count, mean, min, max and buckets are exact. Percentiles come from a
+    uniform reservoir of at most `max_samples` values, so memory stays flat
+    however long a batch or load test runs.
+    """
+
+    def __init__(self, buckets_ms: tuple = DEFAULT_BUCKETS_MS, max_samples: int = 10000):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.max_samples = max_samples
+        self.samples = []
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._random = random.Random(0)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        # Reservoir sampling: every observation is kept with equal probability
+        if len(self.samples) < self.max_samples:
+            self.samples.append(seconds)
+        else:
+            slot = self._random.randrange(self.count)
+            if slot < self.max_samples:
+                self.samples[slot] = seconds
+        ms = seconds * 1000
+        for i, bound in enumerate(self.buckets_ms):
+            if ms <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def summary(self) -> dict:
+        if not self.count:
+            return {"count": 0}
+        values = sorted(self.samples)
+        labels = [f"<={b}ms" for b in self.buckets_ms] + [f">{self.buckets_ms[-1]}ms"]
+        return {
+            "count": self.count,
+            "min_ms": round(self.min * 1000, 2),
+            "mean_ms": round(self.total / self.count * 1000, 2),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2),
+            "buckets": {label: n for label, n in zip(labels, self.counts) if n},
+        }
+
+
+@dataclass
+class TurnMetrics:
+    """Timings for one Runner.run_async invocation (all values in seconds)."""
+
+    invocation_id: Optional[str] = None
+    time_to_first_event: Optional[float] = None
+    time_to_first_text: Optional[float] = None
+    inter_chunk_gaps: list = field(default_factory=list)
+    handler_time: float = 0.0
+    total_time: float = 0.0
+    event_count: int = 0
+    partial_count: int = 0
+    error: Optional[str] = None
+
+
+class StreamingMetrics:
+    """Collects per-turn streaming timings and aggregates them into histograms."""
+
+    METRICS = (
+        "time_to_first_event",
+        "time_to_first_text",
+        "inter_chunk_gap",
+        "handler_time",
+        "total_time",
+    )
+
+    def __init__(self, buckets_ms: tuple = DEFAULT_BUCKETS_MS, keep_turns: int = 1000):
+        self.histograms = {name: Histogram(buckets_ms) for name in self.METRICS}
+        self.turns = []
+        self.keep_turns = keep_turns
+        self.turn_count = 0
+        self.error_count = 0
+
+    async def run_async(self, runner: Runner, **run_kwargs) -> AsyncGenerator[Event, None]:
+        """
+        Drop-in replacement for `runner.run_async(**run_kwargs)` that records timings.
+
+        Args:
+            runner (Runner): The runner to drive.
+            **run_kwargs: Passed through to Runner.run_async (user_id, session_id,
+                new_message, run_config, ...).
+
+        Yields:
+            Event: The runner's events, unchanged.
+        """
+        turn = TurnMetrics()
+        started = time.perf_counter()
+        last_chunk_at = None
+        try:
+            async for event in runner.run_async(**run_kwargs):
+                now = time.perf_counter()
+                turn.event_count += 1
+                if turn.time_to_first_event is None:
+                    turn.time_to_first_event = now - started
+                    turn.invocation_id = event.invocation_id
+
+                has_text = bool(event.content and event.content.parts) and any(
+                    part.text for part in event.content.parts
+                )
+                if has_text and turn.time_to_first_text is None:
+                    turn.time_to_first_text = now - started
+                if has_text and event.partial:
+                    turn.partial_count += 1
+                    if last_chunk_at is not None:
+                        turn.inter_chunk_gaps.append(now - last_chunk_at)
+                    last_chunk_at = now
+
+                yield event
+                turn.handler_time += time.perf_counter() - now
+        except Exception as e:
+            turn.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            turn.total_time = time.perf_counter() - started
+            self.record(turn)
+
+    def record(self, turn: TurnMetrics) -> None:
+        """Add a finished turn to the histograms."""
+        self.turn_count += 1
+        if turn.error:
+            self.error_count += 1
+        if turn.time_to_first_event is not None:
+            self.histograms["time_to_first_event"].observe(turn.time_to_first_event)
+        if turn.time_to_first_text is not None:
+            self.histograms["time_to_first_text"].observe(turn.time_to_first_text)
+        for gap in turn.inter_chunk_gaps:
+            self.histograms["inter_chunk_gap"].observe(gap)
+        self.histograms["handler_time"].observe(turn.handler_time)
+        self.histograms["total_time"].observe(turn.total_time)
+
+        self.turns.append(turn)
+        if len(self.turns) > self.keep_turns:
+            del self.turns[0]
+
+    def summary(self) -> dict:
+        """Histogram summary for every metric, ready to dump as JSON."""
+        return {
+            "turns": self.turn_count,
+            "errors": self.error_count,
+            **{name: hist.summary() for name, hist in self.histograms.items()},
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.summary(), **kwargs)
+
+    def format_summary(self) -> str:
+        """Human-readable table of the summary."""
+        lines = [
+            f"Turns: {self.turn_count} | Errors: {self.error_count}",
+            f"{'metric':<22}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+        ]
+        for name, hist in self.histograms.items():
+            s = hist.summary()
+            if not s["count"]:
+                lines.append(f"{name:<22}{0:>7}")
+                continue
+            lines.append(
+                f"{name:<22}{s['count']:>7}{s['p50_ms']:>10}{s['p95_ms']:>10}"
+                f"{s['p99_ms']:>10}{s['max_ms']:>10}"
+            )
+        return "\n".join(lines)
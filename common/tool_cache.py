@@ -0,0 +1,160 @@
+"""
+Tool Cache - Declarative memoization for function tools
+
+ADK calls a function tool every time the model asks for it, even when the
+same call with the same arguments ran a second ago. Decorate a tool to make
+it cacheable:
+
+    @cached_tool(ttl=60)
+    def get_weather(city: str) -> dict:
+        ...
+
+- The key is the tool name plus its arguments, bound to the signature (so
+  defaults and keyword order don't matter) and serialized canonically;
+  `tool_context` is never part of the key
+- Per-tool TTL, LRU bound on entries and approximate bytes
+- `scope="user"` or `scope="session"` keeps entries per user or per session
+  (the wrapper asks ADK for `tool_context` if the tool doesn't already)
+- Error results (`{"status": "error"}` or an "error" key) are not cached
+- Concurrent identical calls of an async tool share one execution
+- Signature, name and docstring are preserved, so ADK builds the same
+  function declaration as for the undecorated tool
+
+Metrics: `tool.cache.stats()` per tool, `tool_cache_stats()` for all of them.
+"""
+
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import threading
+from typing import Any, Callable, Optional
+
+from .search_cache import SearchCache
+
+SCOPES = ("global", "app", "user", "session")
+
+# Every decorated tool's cache, by tool name
+_registry: dict[str, SearchCache] = {}
+
+
+def _cacheable(result: Any) -> bool:
+    """Default filter: don't cache error results."""
+    if isinstance(result, dict):
+        return result.get("status") != "error" and "error" not in result
+    return result is not None
+
+
+def _scope_prefix(scope: str, tool_context) -> str:
+    if scope == "global" or tool_context is None:
+        return "global"
+    session = tool_context.session
+    if scope == "app":
+        return f"app:{session.app_name}"
+    if scope == "user":
+        return f"user:{session.app_name}:{session.user_id}"
+    return f"session:{session.id}"
+
+
+def canonical_args(signature: inspect.Signature, args: tuple, kwargs: dict) -> str:
+    """Stable text form of a call's arguments, with defaults applied and tool_context dropped."""
+    bound = signature.bind_partial(*args, **kwargs)
+    bound.apply_defaults()
+    values = {k: v for k, v in bound.arguments.items() if k != "tool_context"}
+    return json.dumps(values, sort_keys=True, separators=(",", ":"), default=repr)
+
+
+def cached_tool(
+    ttl: float = 300.0,
+    max_entries: int = 1024,
+    max_bytes: int = 10_000_000,
+    scope: str = "global",
+    cache_if: Callable[[Any], bool] = _cacheable,
+):
+    """
+    Decorator that memoizes a (sync or async) tool function.
+
+    Args:
+        ttl (float): Seconds a result stays fresh.
+        max_entries (int): Max cached results for this tool (LRU).
+        max_bytes (int): Approximate memory bound for this tool (0 = none).
+        scope (str): "global", "app", "user" (per app + user) or "session".
+        cache_if (callable): Result -> bool; only results where it is True
+            are stored (default: skip error results).
+    """
+    if scope not in SCOPES:
+        raise ValueError(f"scope must be one of {SCOPES}, got {scope!r}")
+
+    def decorate(func):
+        signature = inspect.signature(func)
+        wants_context = "tool_context" in signature.parameters
+        cache = SearchCache(ttl=ttl, max_entries=max_entries, max_bytes=max_bytes)
+        _registry[func.__name__] = cache
+
+        def key_for(args, kwargs) -> tuple[str, Optional[Any]]:
+            tool_context = kwargs.get("tool_context")
+            call_kwargs = kwargs if wants_context else {k: v for k, v in kwargs.items() if k != "tool_context"}
+            text = canonical_args(signature, args, call_kwargs)
+            digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+            return f"{_scope_prefix(scope, tool_context)}|{func.__name__}|{digest}", call_kwargs
+
+        def size_of(result) -> int:
+            return len(json.dumps(result, default=repr)) if max_bytes else 0
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                key, call_kwargs = key_for(args, kwargs)
+                uncacheable = []
+
+                async def fetch():
+                    result = await func(*args, **call_kwargs)
+                    if not cache_if(result):
+                        # Hand the result back without storing it
+                        uncacheable.append(result)
+                        raise _Uncacheable()
+                    return result
+
+                try:
+                    result = await cache.get_or_fetch(key, fetch, size=size_of)
+                except _Uncacheable:
+                    return uncacheable[0] if uncacheable else await func(*args, **call_kwargs)
+                return copy.deepcopy(result)
+        else:
+            # Sync tools may run in worker threads (see concurrent_tools.py)
+            lock = threading.Lock()
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key, call_kwargs = key_for(args, kwargs)
+                with lock:
+                    result = cache.get(key)
+                    if result is not None:
+                        cache.hits += 1
+                        return copy.deepcopy(result)
+                    cache.misses += 1
+                result = func(*args, **call_kwargs)
+                if cache_if(result):
+                    with lock:
+                        cache.put(key, copy.deepcopy(result), size_of(result))
+                return result
+
+        if scope != "global" and not wants_context:
+            # Ask ADK to pass tool_context; it is left out of the declaration
+            context = inspect.Parameter("tool_context", inspect.Parameter.KEYWORD_ONLY, default=None)
+            wrapper.__signature__ = signature.replace(parameters=[*signature.parameters.values(), context])
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorate
+
+
+class _Uncacheable(Exception):
+    """Raised inside a fetch whose result must not be stored."""
+
+
+def tool_cache_stats() -> dict[str, dict]:
+    """Stats of every @cached_tool cache, by tool name."""
+    return {name: cache.stats() for name, cache in _registry.items()}
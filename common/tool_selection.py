@@ -0,0 +1,252 @@
+"""
+Tool Selection - Send the model only the tools relevant to the current message
+
+Every model call carries the declaration of every tool the agent has. With
+an MCP toolset such as GitHub's `X-MCP-Toolsets: all` that is dozens of tools
+and thousands of prompt tokens per call, most of them irrelevant to the
+question. A ToolSelector runs as a `before_model_callback`:
+
+1. Scores the request's function declarations (name, description,
+   parameter names and descriptions) against the latest user message with
+   BM25, optionally fused with an embedding ranking
+2. Keeps the top-k, plus pinned tools and any tool already called in the
+   conversation (so follow-up turns can keep using it). The top-k first takes
+   the best tool for each distinctive query term, so one repeated term (e.g.
+   "pull requests") can't crowd out the rest of a compound question
+3. Rewrites `llm_request.config.tools` in place; built-in tools such as
+   google_search are never touched, and every tool stays executable
+4. Records declarations and estimated tokens sent versus available
+
+If no tool matches the message at all, the full set is sent: a lexical miss
+says nothing about which tools are needed.
+
+Usage:
+    selector = ToolSelector(top_k=8, pinned=["get_me"])
+    root_agent = Agent(..., tools=[github_toolset], before_model_callback=selector)
+    print(selector.stats())
+"""
+
+import json
+import os
+import re
+import threading
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .hybrid_retrieval import BM25Index, reciprocal_rank_fusion
+
+_WORD = re.compile(r"[A-Za-z0-9]+")
+_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+# Words that never decide which tool is meant, however rare in descriptions
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do for from how i in is it me my of on or our "
+    "please show the their them this to us what when where which who with you your".split()
+)
+
+
+def _stem(word: str) -> str:
+    """Crude suffix stripping so "repositories" matches "repository"."""
+    for suffix, replacement in (("ies", "y"), ("sses", "ss"), ("ing", ""), ("ed", ""), ("es", ""), ("s", "")):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: -len(suffix)] + replacement
+    return word
+
+
+def normalize_text(text: str) -> str:
+    """Split snake_case and camelCase, lowercase and stem, for BM25."""
+    words = _WORD.findall(_CAMEL.sub(" ", text.replace("_", " ")))
+    return " ".join(_stem(word.lower()) for word in words)
+
+
+def query_terms(text: str) -> set[str]:
+    """Distinct normalized words of `text`, without stopwords."""
+    words = _WORD.findall(_CAMEL.sub(" ", text.replace("_", " ")))
+    return {_stem(word.lower()) for word in words if word.lower() not in _STOPWORDS}
+
+
+def declaration_text(declaration) -> str:
+    """Searchable text of a FunctionDeclaration."""
+    parts = [declaration.name or "", declaration.description or ""]
+    schema = declaration.parameters
+    if schema is not None and schema.properties:
+        for name, prop in schema.properties.items():
+            parts.append(name)
+            if prop.description:
+                parts.append(prop.description)
+    elif declaration.parameters_json_schema:
+        parts.append(json.dumps(declaration.parameters_json_schema))
+    return " ".join(parts)
+
+
+def declaration_tokens(declaration) -> int:
+    """Rough prompt size of one declaration (4 characters per token)."""
+    return len(json.dumps(declaration.model_dump(exclude_none=True, mode="json"))) // 4
+
+
+def _latest_user_text(contents) -> str:
+    """Text of the last user message with text."""
+    for content in reversed(contents):
+        if content.role != "user":
+            continue
+        text = " ".join(part.text for part in content.parts or [] if part.text)
+        if text.strip():
+            return text
+    return ""
+
+
+class ToolSelector:
+    """
+    before_model_callback that trims function declarations to the top-k tools.
+
+    Args:
+        top_k (int): Tools picked by relevance per model call.
+        pinned (iterable of str): Tool names that are always sent.
+        embedder: Optional object with `embed(texts) -> ndarray` (see
+            vector_index.py); its ranking is fused with BM25 by RRF.
+        min_score (float): BM25 score below which a tool doesn't count as a match.
+    """
+
+    def __init__(
+        self,
+        top_k: int = 8,
+        pinned: Iterable[str] = (),
+        embedder=None,
+        min_score: float = 0.0,
+    ):
+        self.top_k = top_k
+        self.pinned = set(pinned)
+        self.embedder = embedder
+        self.min_score = min_score
+        self._lock = threading.Lock()
+        # Declaration sets seen so far (one per agent/toolset state), by fingerprint
+        self._indexes: dict[tuple, tuple[BM25Index, Optional[np.ndarray], list[int]]] = {}
+        self.model_calls = 0
+        self.filtered_calls = 0
+        self.declarations_available = 0
+        self.declarations_sent = 0
+        self.tokens_available = 0
+        self.tokens_sent = 0
+
+    def _index_for(self, declarations: list) -> tuple[BM25Index, Optional[np.ndarray], list[int]]:
+        key = tuple((d.name, d.description) for d in declarations)
+        with self._lock:
+            cached = self._indexes.get(key)
+        if cached is not None:
+            return cached
+        texts = [declaration_text(d) for d in declarations]
+        bm25 = BM25Index().fit(normalize_text(text) for text in texts)
+        vectors = None
+        if self.embedder is not None:
+            vectors = np.asarray(self.embedder.embed(texts), dtype=np.float32)
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        built = (bm25, vectors, [declaration_tokens(d) for d in declarations])
+        with self._lock:
+            self._indexes[key] = built
+        return built
+
+    def rank(self, query: str, declarations: list) -> list[int]:
+        """Positions of the declarations matching `query`, best first."""
+        bm25, vectors, _ = self._index_for(declarations)
+        lexical = [row for row, score in bm25.search(" ".join(query_terms(query)), top_k=len(declarations))
+                   if score > self.min_score]
+        if vectors is None or not lexical:
+            return lexical
+        query_vector = np.asarray(self.embedder.embed([query])[0], dtype=np.float32)
+        semantic = list(np.argsort(-(vectors @ query_vector)))
+        fused = reciprocal_rank_fusion([lexical, [int(row) for row in semantic]])
+        return sorted(fused, key=fused.get, reverse=True)
+
+    def _term_leaders(self, query: str, declarations: list, ranked: list[int]) -> list[int]:
+        """
+        For each distinctive query term, the highest-ranked tool containing it,
+        in ranking order. Terms found in more than half of the tools say
+        little about which one is meant and are skipped.
+        """
+        bm25 = self._index_for(declarations)[0]
+        position = {row: i for i, row in enumerate(ranked)}
+        leaders = set()
+        for term in query_terms(query):
+            rows = bm25.rows_with(term)
+            if not len(rows) or len(rows) > len(declarations) // 2:
+                continue
+            matching = [int(row) for row in rows if int(row) in position]
+            if matching:
+                leaders.add(min(matching, key=position.get))
+        return sorted(leaders, key=position.get)
+
+    def select(self, query: str, declarations: list, called: set[str] = frozenset()) -> list:
+        """The declarations to send for `query`, in their original order."""
+        if len(declarations) <= self.top_k:
+            return declarations
+        ranked = self.rank(query, declarations) if query else []
+        if not ranked:
+            return declarations
+        # Every distinctive term gets a slot first, then the best of the rest
+        diversified = list(dict.fromkeys([*self._term_leaders(query, declarations, ranked), *ranked]))
+        keep = set(diversified[: self.top_k])
+        keep.update(i for i, d in enumerate(declarations) if d.name in self.pinned or d.name in called)
+        return [d for i, d in enumerate(declarations) if i in keep]
+
+    def __call__(self, callback_context, llm_request):
+        """The before_model_callback: trims the request in place, never answers."""
+        tools = llm_request.config.tools if llm_request.config else None
+        if not tools:
+            return None
+        query = _latest_user_text(llm_request.contents or [])
+        # Tools used anywhere in the conversation: a follow-up ("and the closed
+        # ones?") often needs them without naming them again
+        called = {
+            part.function_call.name
+            for content in llm_request.contents or []
+            for part in content.parts or []
+            if part.function_call
+        }
+        available = sent = available_tokens = sent_tokens = 0
+        filtered = False
+        for tool in tools:
+            declarations = tool.function_declarations
+            if not declarations:
+                continue
+            kept = self.select(query, declarations, called)
+            tokens = self._index_for(declarations)[2]
+            kept_names = {d.name for d in kept}
+            available += len(declarations)
+            sent += len(kept)
+            available_tokens += sum(tokens)
+            sent_tokens += sum(t for d, t in zip(declarations, tokens) if d.name in kept_names)
+            if len(kept) < len(declarations):
+                tool.function_declarations = kept
+                filtered = True
+        with self._lock:
+            self.model_calls += 1
+            self.filtered_calls += filtered
+            self.declarations_available += available
+            self.declarations_sent += sent
+            self.tokens_available += available_tokens
+            self.tokens_sent += sent_tokens
+        return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "model_calls": self.model_calls,
+                "filtered_calls": self.filtered_calls,
+                "declarations_available": self.declarations_available,
+                "declarations_sent": self.declarations_sent,
+                "declaration_tokens_available": self.tokens_available,
+                "declaration_tokens_sent": self.tokens_sent,
+                "declaration_tokens_saved": self.tokens_available - self.tokens_sent,
+            }
+
+
+def tool_selector_from_env(default_top_k: int = 8, pinned: Iterable[str] = ()) -> Optional[ToolSelector]:
+    """
+    ToolSelector configured by TOOL_TOP_K (0 = send every tool, returns None)
+    and TOOL_PINNED (comma-separated tool names, added to `pinned`).
+    """
+    top_k = int(os.getenv("TOOL_TOP_K", str(default_top_k)))
+    if top_k <= 0:
+        return None
+    extra = [name.strip() for name in os.getenv("TOOL_PINNED", "").split(",") if name.strip()]
+    return ToolSelector(top_k=top_k, pinned=[*pinned, *extra])
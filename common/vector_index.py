@@ -0,0 +1,675 @@
+"""
+Local Vector Index - Memory-mapped retrieval for RAG agents
+
+A drop-in local alternative to `VertexAiRagRetrieval`:
+
+- Embeddings live in a memory-mapped float32 matrix (`vectors.f32`), with a
+  JSONL metadata sidecar (`chunks.jsonl`) and a byte-offset table so only the
+  returned chunks are ever read from disk
+- Exact top-k search is a NumPy matrix-vector product scanned in blocks
+- Optional IVF mode for very large corpora: vectors are clustered with
+  k-means and stored grouped by cluster, and a query only scans the `nprobe`
+  closest clusters
+- `LocalRagRetrieval` keeps the Vertex tool's `similarity_top_k` and
+  `vector_distance_threshold` semantics (cosine distance, lower is closer)
+  and returns the same shape: a list of chunk texts, or a "No matching
+  result" message
+
+Embedders: `HashingEmbedder` (offline, deterministic, for tests and demos) and
+`GeminiEmbedder` (text-embedding models through google-genai). The embedder
+used to build an index is recorded in it and reused for queries.
+
+Usage (from the repository root):
+    python -m common.vector_index build ./docs ./my_index --ivf-lists 0
+    python -m common.vector_index search ./my_index "What is our refund policy?" --top-k 5
+    python -m common.vector_index bench --rows 1000000 --dim 256 --ivf-lists 1024
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+import numpy as np
+from google.adk.tools.retrieval.base_retrieval_tool import BaseRetrievalTool
+from google.adk.tools.tool_context import ToolContext
+
+INDEX_FILE = "index.json"
+VECTORS_FILE = "vectors.f32"
+CHUNKS_FILE = "chunks.jsonl"
+OFFSETS_FILE = "chunks.idx"
+CENTROIDS_FILE = "centroids.f32"
+# Optional pointer to the live version subdirectory (written by common/ingest.py)
+CURRENT_FILE = "CURRENT"
+
+# Rows per block in exact search: bounds temporary memory on huge matrices
+SCAN_BLOCK_ROWS = 262_144
+
+_TOKEN = re.compile(r"\w+")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+# ============================================================================
+# EMBEDDERS
+# ============================================================================
+
+class HashingEmbedder:
+    """
+    Feature-hashing embedder: words and word pairs hashed into `dim` buckets.
+
+    No model and no network, so results are deterministic. Good for tests
+    and demos, not a substitute for a real embedding model.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    @property
+    def spec(self) -> dict:
+        return {"type": "hashing", "dim": self.dim}
+
+    def _bucket(self, feature: str) -> tuple[int, float]:
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        return h % self.dim, 1.0 if (h >> 63) else -1.0
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = _TOKEN.findall(text.lower())
+            for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                bucket, sign = self._bucket(feature)
+                out[row, bucket] += sign
+        return _normalize(out)
+
+
+class GeminiEmbedder:
+    """Embeddings from a Gemini text-embedding model (needs API access)."""
+
+    def __init__(self, model: str = "text-embedding-004", batch_size: int = 100):
+        self.model = model
+        self.batch_size = batch_size
+        self._client = None
+
+    @property
+    def spec(self) -> dict:
+        return {"type": "gemini", "model": self.model}
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        if self._client is None:
+            from google import genai
+            self._client = genai.Client()
+        rows = []
+        for start in range(0, len(texts), self.batch_size):
+            response = self._client.models.embed_content(
+                model=self.model, contents=texts[start:start + self.batch_size]
+            )
+            rows.extend(e.values for e in response.embeddings)
+        return _normalize(np.asarray(rows, dtype=np.float32))
+
+
+def embedder_from_spec(spec: dict):
+    if spec["type"] == "hashing":
+        return HashingEmbedder(dim=spec["dim"])
+    if spec["type"] == "gemini":
+        return GeminiEmbedder(model=spec["model"])
+    raise ValueError(f"Unknown embedder: {spec}")
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+# ============================================================================
+# CHUNKING
+# ============================================================================
+
+def split_paragraphs(text: str) -> list[str]:
+    """Split on blank lines (lines with only whitespace count as blank)."""
+    return _PARAGRAPH_BREAK.split(text)
+
+
+def chunk_paragraphs(paragraphs: Iterable[str], size: int = 800, overlap: int = 100) -> Iterator[str]:
+    """Pack paragraphs into chunks of at most `size` characters, lazily."""
+    current = ""
+    for paragraph in (p.strip() for p in paragraphs):
+        if not paragraph:
+            continue
+        if current and len(current) + len(paragraph) + 2 > size:
+            yield current
+            current = current[-overlap:] if overlap else ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+        while len(current) > size:
+            yield current[:size]
+            current = current[size - overlap:]
+    if current:
+        yield current
+
+
+def chunk_text(text: str, size: int = 800, overlap: int = 100) -> list[str]:
+    """Split on paragraphs, then into windows of at most `size` characters."""
+    return list(chunk_paragraphs(split_paragraphs(text), size, overlap))
+
+
+# ============================================================================
+# BUILD
+# ============================================================================
+
+def _kmeans(vectors: np.ndarray, k: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Spherical k-means on (a sample of) unit vectors; returns unit centroids."""
+    rng = np.random.default_rng(seed)
+    rows = np.sort(rng.choice(len(vectors), size=min(len(vectors), k * 64), replace=False))
+    sample = _normalize(np.asarray(vectors[rows], dtype=np.float32))
+    centroids = sample[rng.choice(len(sample), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(sample @ centroids.T, axis=1)
+        # Per-cluster sums via one sort + reduceat (much faster than np.add.at)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=k)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        sums = np.zeros_like(centroids)
+        present = counts > 0
+        sums[present] = np.add.reduceat(sample[order], starts[present], axis=0)
+        empty = ~present
+        # Re-seed empty clusters with random sample points
+        sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    out = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), SCAN_BLOCK_ROWS):
+        block = np.asarray(vectors[start:start + SCAN_BLOCK_ROWS])
+        out[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+def build_index(
+    path: str,
+    vectors: np.ndarray,
+    chunks,
+    embedder_spec: dict,
+    ivf_lists: int = 0,
+) -> "LocalVectorIndex":
+    """
+    Write an index directory from precomputed vectors and chunk metadata.
+
+    Vectors are normalized and written block by block, so `vectors` can be a
+    memory-mapped array larger than RAM.
+
+    Args:
+        path (str): Output directory (created if missing, files overwritten).
+        vectors (np.ndarray): (n, dim) float32, one row per chunk.
+        chunks: Metadata per row (list, or anything indexable by row); must
+            include "text".
+        embedder_spec (dict): Spec of the embedder that produced `vectors`.
+        ivf_lists (int): Number of IVF clusters (0 = exact search only).
+    """
+    out = Path(path)
+    out.mkdir(parents=True, exist_ok=True)
+    count = len(vectors)
+    header = {
+        "version": 1,
+        "dim": int(vectors.shape[1]) if count else int(embedder_spec.get("dim", 0)),
+        "count": count,
+        "embedder": embedder_spec,
+        "ivf": None,
+    }
+
+    order = None
+    if ivf_lists and count >= ivf_lists:
+        centroids = _kmeans(vectors, ivf_lists)
+        assign = _assign(vectors, centroids)
+        # Store rows grouped by cluster so each list is one contiguous slice
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=ivf_lists)
+        header["ivf"] = {"lists": ivf_lists, "offsets": np.concatenate([[0], np.cumsum(counts)]).tolist()}
+        centroids.tofile(out / CENTROIDS_FILE)
+
+    with open(out / VECTORS_FILE, "wb") as f:
+        for start in range(0, count, SCAN_BLOCK_ROWS):
+            end = min(count, start + SCAN_BLOCK_ROWS)
+            block = vectors[start:end] if order is None else vectors[np.sort(order[start:end])]
+            block = _normalize(np.asarray(block, dtype=np.float32))
+            if order is not None:
+                # Rows were read in disk order; put them back in cluster order
+                block = block[np.argsort(np.argsort(order[start:end]))]
+            f.write(block.tobytes())
+    offsets = np.zeros(count, dtype=np.uint64)
+    with open(out / CHUNKS_FILE, "wb") as f:
+        for row in range(count):
+            offsets[row] = f.tell()
+            source_row = row if order is None else int(order[row])
+            f.write(json.dumps(chunks[source_row], ensure_ascii=False).encode("utf-8") + b"\n")
+    offsets.tofile(out / OFFSETS_FILE)
+    (out / INDEX_FILE).write_text(json.dumps(header))
+    # A flat index written here replaces any published version the pointer names
+    (out / CURRENT_FILE).unlink(missing_ok=True)
+    return LocalVectorIndex(path)
+
+
+def build_from_directory(
+    docs_dir: str,
+    index_dir: str,
+    embedder=None,
+    ivf_lists: int = 0,
+    chunk_size: int = 800,
+    overlap: int = 100,
+) -> "LocalVectorIndex":
+    """Chunk every .txt/.md file under `docs_dir`, embed, and build an index."""
+    embedder = embedder or HashingEmbedder()
+    chunks = []
+    for file in sorted(Path(docs_dir).rglob("*")):
+        if file.suffix.lower() not in (".txt", ".md") or not file.is_file():
+            continue
+        text = file.read_text(encoding="utf-8", errors="replace")
+        for i, chunk in enumerate(chunk_text(text, chunk_size, overlap)):
+            chunks.append({"id": f"{file.name}#{i}", "source": str(file), "text": chunk})
+    vectors = embedder.embed([c["text"] for c in chunks]) if chunks else np.zeros((0, 0), np.float32)
+    return build_index(index_dir, vectors, chunks, embedder.spec, ivf_lists)
+
+
+class JsonlRows:
+    """
+    Row-indexable view of a JSONL file at known line offsets, safe to read
+    from several threads at once.
+
+    Reads use os.pread on the shared descriptor, so concurrent lookups never
+    move a shared file position; platforms without pread fall back to a lock
+    around seek + readline.
+
+    Args:
+        path: The JSONL file.
+        offsets: Byte offset of every row's line.
+    """
+
+    def __init__(self, path: Path, offsets: np.ndarray):
+        self._file = open(path, "rb")
+        self._fd = self._file.fileno()
+        self._offsets = offsets
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, row: int) -> dict:
+        offset = int(self._offsets[row])
+        if not hasattr(os, "pread"):
+            with self._lock:
+                self._file.seek(offset)
+                return json.loads(self._file.readline())
+        data = b""
+        while True:
+            block = os.pread(self._fd, 1 << 14, offset + len(data))
+            end = block.find(b"\n")
+            if end >= 0 or not block:
+                data += block if end < 0 else block[:end]
+                return json.loads(data)
+            data += block
+
+    def close(self) -> None:
+        self._file.close()
+
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+def resolve_index_dir(path) -> Path:
+    """
+    Directory holding the live index files: `path` itself, or the version
+    subdirectory its CURRENT pointer names.
+    """
+    root = Path(path)
+    try:
+        return root / (root / CURRENT_FILE).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return root
+
+
+def _directory_version(path: Path) -> str:
+    stat = (path / INDEX_FILE).stat()
+    return f"{path.resolve()}:{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+class IndexSnapshot:
+    """
+    One version of an index, opened read-only; vectors stay memory-mapped.
+
+    A snapshot never changes, so a search that runs several steps against it
+    (vector ranking, then vectors, then chunks) sees one consistent version.
+
+    Args:
+        path (Path): Directory holding the index files (CURRENT already resolved).
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.version = _directory_version(self.path)
+        self.header = json.loads((self.path / INDEX_FILE).read_text())
+        self.dim = self.header["dim"]
+        self.count = self.header["count"]
+        self.embedder = embedder_from_spec(self.header["embedder"])
+        if self.count:
+            self.vectors = np.memmap(self.path / VECTORS_FILE, dtype=np.float32, mode="r",
+                                     shape=(self.count, self.dim))
+            self._offsets = np.memmap(self.path / OFFSETS_FILE, dtype=np.uint64, mode="r")
+        else:
+            self.vectors = np.zeros((0, self.dim), dtype=np.float32)
+            self._offsets = np.zeros(0, dtype=np.uint64)
+        ivf = self.header.get("ivf")
+        self.centroids = None
+        if ivf:
+            self.centroids = np.fromfile(self.path / CENTROIDS_FILE, dtype=np.float32).reshape(
+                ivf["lists"], self.dim
+            )
+            self.list_offsets = ivf["offsets"]
+        self._chunks = JsonlRows(self.path / CHUNKS_FILE, self._offsets)
+
+    def chunk(self, row: int) -> dict:
+        """Metadata for one row, read from the sidecar on demand (thread-safe)."""
+        return self._chunks[row]
+
+    def _scan(self, query: np.ndarray, start: int, end: int, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Top-k (rows, similarities) within rows [start, end)."""
+        best_rows, best_sims = [], []
+        for block_start in range(start, end, SCAN_BLOCK_ROWS):
+            block_end = min(end, block_start + SCAN_BLOCK_ROWS)
+            sims = self.vectors[block_start:block_end] @ query
+            if len(sims) > k:
+                top = np.argpartition(-sims, k)[:k]
+            else:
+                top = np.arange(len(sims))
+            best_rows.append(top + block_start)
+            best_sims.append(sims[top])
+        if not best_rows:
+            return np.zeros(0, np.int64), np.zeros(0, np.float32)
+        return np.concatenate(best_rows), np.concatenate(best_sims)
+
+    def search_vector(
+        self,
+        query: np.ndarray,
+        top_k: int = 10,
+        max_distance: Optional[float] = None,
+        nprobe: int = 8,
+    ) -> list[tuple[int, float]]:
+        """
+        Nearest rows to a unit query vector.
+
+        Returns:
+            list: (row, cosine distance) pairs, closest first, at most `top_k`,
+            all within `max_distance` when it is set.
+        """
+        if not self.count:
+            return []
+        query = _normalize(np.asarray(query, dtype=np.float32).reshape(-1))
+        if self.centroids is None:
+            rows, sims = self._scan(query, 0, self.count, top_k)
+        else:
+            probe = np.argsort(-(self.centroids @ query))[:nprobe]
+            parts = [
+                self._scan(query, self.list_offsets[c], self.list_offsets[c + 1], top_k)
+                for c in probe
+            ]
+            rows = np.concatenate([p[0] for p in parts])
+            sims = np.concatenate([p[1] for p in parts])
+        order = np.argsort(-sims)[:top_k]
+        results = [(int(rows[i]), max(0.0, float(1.0 - sims[i]))) for i in order]
+        if max_distance is not None:
+            results = [(row, dist) for row, dist in results if dist <= max_distance]
+        return results
+
+    def search(
+        self,
+        text: str,
+        top_k: int = 10,
+        max_distance: Optional[float] = None,
+        nprobe: int = 8,
+        query_vector: Optional[np.ndarray] = None,
+    ) -> list[dict]:
+        """Embed `text` (unless `query_vector` is given) and return the matching chunks with a "distance" field."""
+        query = self.embedder.embed([text])[0] if query_vector is None else query_vector
+        return [
+            {**self.chunk(row), "distance": round(dist, 4)}
+            for row, dist in self.search_vector(query, top_k, max_distance, nprobe)
+        ]
+
+
+
+class LocalVectorIndex:
+    """
+    Read-only view of an index directory that follows rebuilds and publishes.
+
+    Every search first checks (at most once per `check_interval` seconds, one
+    small read of CURRENT and a stat) whether a new version is on disk, and
+    if so opens it and swaps it in. Searches already running finish on the
+    snapshot they started with.
+
+    Args:
+        path (str): Index directory written by build_index(), or one managed
+            by the Ingestor (a CURRENT pointer to a version subdirectory).
+        check_interval (float): Seconds between checks for a new version.
+    """
+
+    def __init__(self, path: str, check_interval: float = 1.0):
+        self.root = Path(path)
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._reload_lock = threading.Lock()
+        self._checked = time.monotonic()
+        self._current = IndexSnapshot(resolve_index_dir(self.root))
+
+    def disk_version(self) -> str:
+        """Identity of the index currently on disk; changes whenever it is rebuilt."""
+        return _directory_version(resolve_index_dir(self.root))
+
+    def snapshot(self) -> IndexSnapshot:
+        """The newest version on disk (checked at most every `check_interval` seconds)."""
+        now = time.monotonic()
+        if now - self._checked >= self.check_interval:
+            with self._reload_lock:
+                if now - self._checked >= self.check_interval:
+                    self._checked = now
+                    try:
+                        path = resolve_index_dir(self.root)
+                        if _directory_version(path) != self._current.version:
+                            self._current = IndexSnapshot(path)
+                            self.reloads += 1
+                    except (OSError, ValueError):
+                        # Mid-rebuild (build_index() writing in place); keep
+                        # serving the open version and look again next interval
+                        pass
+        return self._current
+
+    @property
+    def path(self) -> Path:
+        return self._current.path
+
+    @property
+    def version(self) -> str:
+        return self._current.version
+
+    @property
+    def header(self) -> dict:
+        return self._current.header
+
+    @property
+    def dim(self) -> int:
+        return self._current.dim
+
+    @property
+    def count(self) -> int:
+        return self._current.count
+
+    @property
+    def embedder(self):
+        return self._current.embedder
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._current.vectors
+
+    def chunk(self, row: int) -> dict:
+        """Metadata for one row of the current snapshot (see IndexSnapshot.chunk)."""
+        return self._current.chunk(row)
+
+    def search_vector(
+        self,
+        query: np.ndarray,
+        top_k: int = 10,
+        max_distance: Optional[float] = None,
+        nprobe: int = 8,
+    ) -> list[tuple[int, float]]:
+        """See IndexSnapshot.search_vector (on the newest version)."""
+        return self.snapshot().search_vector(query, top_k, max_distance, nprobe)
+
+    def search(
+        self,
+        text: str,
+        top_k: int = 10,
+        max_distance: Optional[float] = None,
+        nprobe: int = 8,
+        query_vector: Optional[np.ndarray] = None,
+    ) -> list[dict]:
+        """See IndexSnapshot.search (on the newest version)."""
+        return self.snapshot().search(text, top_k, max_distance, nprobe, query_vector)
+
+
+# ============================================================================
+# TOOL
+# ============================================================================
+
+class LocalRagRetrieval(BaseRetrievalTool):
+    """
+    Local stand-in for VertexAiRagRetrieval.
+
+    Args:
+        name (str): Tool name shown to the model.
+        description (str): Tool description shown to the model.
+        index_path (str): Index directory (or pass `index`).
+        index (LocalVectorIndex): An already open index.
+        similarity_top_k (int): Max chunks returned (default 10).
+        vector_distance_threshold (float): Only return chunks with cosine
+            distance at or below this value (None = no threshold).
+        nprobe (int): IVF clusters scanned per query (IVF indexes only).
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        description: str,
+        index_path: Optional[str] = None,
+        index: Optional[LocalVectorIndex] = None,
+        similarity_top_k: Optional[int] = None,
+        vector_distance_threshold: Optional[float] = None,
+        nprobe: int = 8,
+    ):
+        super().__init__(name=name, description=description)
+        self.index = index or LocalVectorIndex(index_path)
+        self.similarity_top_k = similarity_top_k or 10
+        self.vector_distance_threshold = vector_distance_threshold
+        self.nprobe = nprobe
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        # Embedding may be a network call (GeminiEmbedder), so keep it off the loop
+        results = await asyncio.to_thread(
+            self.index.search,
+            args["query"],
+            self.similarity_top_k,
+            self.vector_distance_threshold,
+            self.nprobe,
+        )
+        if not results:
+            return (
+                "No matching result found with the config: "
+                f"similarity_top_k={self.similarity_top_k} "
+                f"vector_distance_threshold={self.vector_distance_threshold}"
+            )
+        return [r["text"] for r in results]
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def _bench(rows: int, dim: int, ivf_lists: int, queries: int, top_k: int, nprobe: int) -> dict:
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        vectors = _normalize(rng.standard_normal((rows, dim), dtype=np.float32))
+        chunks = ({"text": f"chunk {i}"} for i in range(rows))
+        started = time.perf_counter()
+        index = build_index(tmp, vectors, list(chunks), {"type": "hashing", "dim": dim}, ivf_lists)
+        build_s = time.perf_counter() - started
+        probes = vectors[rng.choice(rows, size=queries)]
+        timings = []
+        for query in probes:
+            started = time.perf_counter()
+            index.search_vector(query, top_k, nprobe=nprobe)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        return {
+            "rows": rows,
+            "dim": dim,
+            "ivf_lists": ivf_lists,
+            "nprobe": nprobe if ivf_lists else None,
+            "build_s": round(build_s, 2),
+            "query_ms_p50": round(timings[len(timings) // 2] * 1000, 3),
+            "query_ms_p95": round(timings[int(len(timings) * 0.95)] * 1000, 3),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local memory-mapped vector index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Index every .txt/.md file in a directory")
+    build.add_argument("docs_dir")
+    build.add_argument("index_dir")
+    build.add_argument("--embedder", choices=["hashing", "gemini"], default="hashing")
+    build.add_argument("--dim", type=int, default=384, help="Hashing embedder dimensions")
+    build.add_argument("--ivf-lists", type=int, default=0)
+    build.add_argument("--chunk-size", type=int, default=800)
+    build.add_argument("--overlap", type=int, default=100)
+
+    search = commands.add_parser("search", help="Query an index")
+    search.add_argument("index_dir")
+    search.add_argument("query")
+    search.add_argument("--top-k", type=int, default=10)
+    search.add_argument("--threshold", type=float, help="Max cosine distance")
+    search.add_argument("--nprobe", type=int, default=8)
+
+    bench = commands.add_parser("bench", help="Query latency on random vectors")
+    bench.add_argument("--rows", type=int, default=100_000)
+    bench.add_argument("--dim", type=int, default=256)
+    bench.add_argument("--ivf-lists", type=int, default=0)
+    bench.add_argument("--nprobe", type=int, default=8)
+    bench.add_argument("--queries", type=int, default=200)
+    bench.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        embedder = GeminiEmbedder() if args.embedder == "gemini" else HashingEmbedder(args.dim)
+        index = build_from_directory(
+            args.docs_dir, args.index_dir, embedder, args.ivf_lists, args.chunk_size, args.overlap
+        )
+        print(f"Indexed {index.count} chunks into {args.index_dir}")
+    elif args.command == "search":
+        index = LocalVectorIndex(args.index_dir)
+        for hit in index.search(args.query, args.top_k, args.threshold, args.nprobe):
+            print(f"[{hit['distance']:.4f}] {hit.get('id', '')}: {hit['text'][:120]!r}")
+    else:
+        print(json.dumps(_bench(args.rows, args.dim, args.ivf_lists, args.queries, args.top_k, args.nprobe), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+MCP pool and multi-server startup, against the local stdio stub server.
+
+Each test starts real stub servers (common/mcp_stub_server.py) in
+subprocesses, so the suite needs the `mcp` and `google-adk` packages but no
+network. Run from the repository root:
+    python -m pytest -q tests
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Make the repo-level `common` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.mcp_multi import MultiServerMCP, ServerSpec
+from common.mcp_pool import MCPSessionPool, PooledMCPToolset, ToolSchemaCache, stub_server_params
+
+# Per-server startup timeout; generous because stub interpreters start slowly on small CI machines
+TIMEOUT = 10.0
+
+
+def test_pool_reuses_sessions(tmp_path):
+    async def run():
+        pool = MCPSessionPool(keepalive=0)
+        params = stub_server_params(name="reuse", tools=5)
+        first = PooledMCPToolset(connection_params=params, pool=pool, schema_cache=ToolSchemaCache(tmp_path))
+        second = PooledMCPToolset(connection_params=params, pool=pool, schema_cache=ToolSchemaCache(tmp_path))
+        try:
+            await first.get_tools()
+            session = await first._mcp_session_manager.create_session()
+            assert await second._mcp_session_manager.create_session() is session
+            return pool.stats()
+        finally:
+            await pool.close()
+
+    stats = asyncio.run(run())
+    assert stats["servers"] == 1
+    assert stats["sessions_created"] == 1
+    assert stats["sessions_reused"] >= 2
+
+
+def test_warm_start_is_served_from_disk(tmp_path):
+    params = stub_server_params(name="warm", tools=5)
+
+    async def discover(pool):
+        toolset = PooledMCPToolset(connection_params=params, pool=pool, schema_cache=ToolSchemaCache(tmp_path))
+        try:
+            tools = await toolset.get_tools()
+            return sorted(tool.name for tool in tools), toolset.discovery["source"], pool.stats()
+        finally:
+            await toolset.close()
+            await pool.close()
+
+    cold_names, cold_source, _ = asyncio.run(discover(MCPSessionPool(keepalive=0)))
+    # A new pool stands in for a new worker process sharing the cache directory
+    warm_names, warm_source, warm_stats = asyncio.run(discover(MCPSessionPool(keepalive=0)))
+
+    assert cold_source == "server"
+    assert warm_source == "disk"
+    assert warm_names == cold_names
+    assert warm_stats["sessions_created"] == 0
+
+
+def test_multi_server_leaves_out_dead_and_hung_servers(tmp_path):
+    specs = [
+        ServerSpec("healthy", stub_server_params(name="healthy", tools=3), timeout=TIMEOUT),
+        ServerSpec("dead", stub_server_params(name="dead", fail=True), timeout=TIMEOUT),
+        # Accepts the connection, then never finishes starting
+        ServerSpec(
+            "hung",
+            stub_server_params(name="hung", startup_delay=TIMEOUT * 3, timeout=TIMEOUT + 1),
+            timeout=TIMEOUT,
+        ),
+    ]
+
+    async def run():
+        manager = MultiServerMCP(specs, pool=MCPSessionPool(keepalive=0), schema_cache=ToolSchemaCache(tmp_path))
+        started = time.perf_counter()
+        try:
+            metrics = await manager.start()
+            elapsed = time.perf_counter() - started
+            return metrics, elapsed, len(manager.toolsets())
+        finally:
+            await manager.close(grace=1.0)
+
+    metrics, elapsed, toolsets = asyncio.run(run())
+    assert elapsed < TIMEOUT + 2
+    assert toolsets == 1
+    assert metrics["servers_ok"] == 1
+    assert metrics["servers_failed"] == 2
+    assert metrics["servers"]["healthy"]["status"] == "ok"
+    assert metrics["servers"]["healthy"]["tools"] > 0
+    assert metrics["servers"]["dead"]["status"] == "error"
+    assert metrics["servers"]["hung"]["status"] == "timeout"
+
+
+def test_multi_server_keeps_shared_sessions_open(tmp_path):
+    params = stub_server_params(name="shared", tools=3)
+
+    async def run():
+        pool = MCPSessionPool(keepalive=0)
+        other = PooledMCPToolset(connection_params=params, pool=pool, schema_cache=ToolSchemaCache(tmp_path))
+        try:
+            session = await other._mcp_session_manager.create_session()
+            manager = MultiServerMCP(
+                [ServerSpec("shared", params, timeout=TIMEOUT)], pool=pool, schema_cache=ToolSchemaCache(tmp_path)
+            )
+            metrics = await manager.start()
+            await manager.close()
+            # The session this task opened is still the pooled one, and still answers
+            still_open = await other._mcp_session_manager.create_session()
+            tools = (await still_open.list_tools()).tools
+            return metrics, still_open is session, tools, pool.stats()
+        finally:
+            await pool.close()
+
+    metrics, same_session, tools, stats = asyncio.run(run())
+    assert metrics["servers"]["shared"]["status"] == "ok"
+    assert same_session
+    assert tools
+    assert stats["sessions_created"] == 1